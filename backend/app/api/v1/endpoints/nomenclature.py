@@ -3,12 +3,14 @@
 from decimal import Decimal
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi import status as http_status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
-from app.modules.auth.models.user import User
+from app.core.conditional import check_not_modified
+from app.core.responses import FastJSONResponse
+from app.modules.auth.services.principal_cache import Principal
 from app.modules.pricing_kb_ai.enums import (
     LifecycleStatus,
     NodeStatus,
@@ -81,12 +83,15 @@ def serialize_schema_version(schema: NomenclatureClassSchema) -> ClassSchemaVers
 
 @router.get("/nodes", response_model=list[NomenclatureNodeResponse])
 async def list_nodes(
+    request: Request,
+    response: Response,
     parent_id: Optional[int] = None,
     depth: Optional[int] = None,
     status: Optional[NodeStatus] = None,
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
+    await check_not_modified(request, response, db, "nomenclature_nodes")
     nodes = await NomenclatureNodeService.list_nodes(
         db,
         parent_id=parent_id,
@@ -104,7 +109,7 @@ async def list_nodes(
 async def create_node(
     payload: NomenclatureNodeCreate,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     node = await NomenclatureNodeService.create(db, payload)
     return node
@@ -115,7 +120,7 @@ async def update_node(
     node_id: int,
     payload: NomenclatureNodeUpdate,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     node = await NomenclatureNodeService.update(db, node_id, payload)
     if not node:
@@ -129,7 +134,7 @@ async def update_node(
 async def archive_node(
     node_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     node = await NomenclatureNodeService.archive(db, node_id)
     if not node:
@@ -144,9 +149,19 @@ async def archive_node(
 )
 async def list_node_schemas(
     node_id: int,
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
+    await check_not_modified(
+        request,
+        response,
+        db,
+        "nomenclature_class_schema",
+        "class_schema_presets",
+        "nomenclature_attribute_presets",
+    )
     schemas = await NomenclatureSchemaService.list_versions(db, node_id)
     return [serialize_schema_version(schema) for schema in schemas]
 
@@ -160,7 +175,7 @@ async def create_schema_version(
     node_id: int,
     payload: ClassSchemaDraft,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ):
     schema = await NomenclatureSchemaService.create_version(
         db, node_id, payload, current_user.id
@@ -181,7 +196,7 @@ async def publish_schema_version(
     node_id: int,
     version: int,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     schema = await NomenclatureSchemaService.publish_version(db, node_id, version)
     if not schema:
@@ -199,8 +214,8 @@ async def publish_schema_version(
 async def get_schema_diff(
     node_id: int,
     version: int,
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     revision = await NomenclatureSchemaService.get_schema_diff(db, node_id, version)
     if not revision:
@@ -217,10 +232,13 @@ async def get_schema_diff(
 
 @router.get("/presets", response_model=list[AttributePresetResponse])
 async def list_attribute_presets(
+    request: Request,
+    response: Response,
     status: Optional[SchemaStatus] = None,
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
+    await check_not_modified(request, response, db, "nomenclature_attribute_presets")
     presets = await NomenclaturePresetService.list_presets(db, status=status)
     return presets
 
@@ -233,7 +251,7 @@ async def list_attribute_presets(
 async def create_attribute_preset(
     payload: AttributePresetCreate,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     try:
         preset = await NomenclaturePresetService.create(db, payload)
@@ -247,9 +265,12 @@ async def create_attribute_preset(
 @router.get("/presets/{preset_id}", response_model=AttributePresetResponse)
 async def get_attribute_preset(
     preset_id: int,
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
+    await check_not_modified(request, response, db, "nomenclature_attribute_presets")
     preset = await NomenclaturePresetService.get(db, preset_id)
     if not preset:
         raise HTTPException(
@@ -263,7 +284,7 @@ async def update_attribute_preset(
     preset_id: int,
     payload: AttributePresetUpdate,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     preset = await NomenclaturePresetService.update(db, preset_id, payload)
     if not preset:
@@ -280,7 +301,7 @@ async def update_attribute_preset(
 async def archive_attribute_preset(
     preset_id: int,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     success = await NomenclaturePresetService.archive(db, preset_id)
     if not success:
@@ -306,8 +327,8 @@ async def list_cards(
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     try:
         items, meta = await NomenclatureCardService.list_cards(
@@ -330,8 +351,14 @@ async def list_cards(
         raise HTTPException(
             status_code=http_status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
-    serialized = [NomenclatureCardService.serialize(card) for card in items]
-    return PaginatedCards(items=serialized, meta=meta)
+    # Built once as plain data and encoded directly: no model per card and
+    # no second validation against PaginatedCards.
+    return FastJSONResponse(
+        {
+            "items": [NomenclatureCardService.to_payload(card) for card in items],
+            "meta": meta.model_dump(),
+        }
+    )
 
 
 @router.post(
@@ -340,7 +367,7 @@ async def list_cards(
 async def create_card(
     payload: NomenclatureCardCreate,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ):
     try:
         card = await NomenclatureCardService.create(db, payload, current_user.id)
@@ -354,8 +381,8 @@ async def create_card(
 @router.get("/cards/{card_id}", response_model=NomenclatureCard)
 async def get_card(
     card_id: int,
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     card = await NomenclatureCardService.get(db, card_id)
     if not card:
@@ -370,7 +397,7 @@ async def update_card(
     card_id: int,
     payload: NomenclatureCardUpdate,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ):
     try:
         card = await NomenclatureCardService.update(
@@ -392,7 +419,7 @@ async def change_card_lifecycle(
     card_id: int,
     payload: CardLifecycleChange,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ):
     try:
         card = await NomenclatureCardService.change_lifecycle(
@@ -412,8 +439,8 @@ async def change_card_lifecycle(
 @router.get("/cards/{card_id}/versions", response_model=list[CardVersion])
 async def list_card_versions(
     card_id: int,
-    db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_read_db),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     versions = await NomenclatureCardService.list_versions(db, card_id)
     return versions
@@ -423,7 +450,7 @@ async def list_card_versions(
 async def bulk_change_card_lifecycle(
     request: BulkLifecycleRequest,
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ):
     return await NomenclatureCardService.bulk_change_lifecycle(
         db, request=request, actor_id=current_user.id
@@ -434,6 +461,6 @@ async def bulk_change_card_lifecycle(
 async def bulk_update_card_methodologies(
     request: BulkMethodologyRequest,
     db: AsyncSession = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_active_user),
+    _: Principal = Depends(deps.get_current_active_user),
 ):
     return await NomenclatureCardService.bulk_update_methodologies(db, request=request)
@@ -20,7 +20,7 @@
 
 @router.get("/", response_model=List[NomenclatureResponse])
 async def read_nomenclatures(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
@@ -45,7 +45,7 @@ async def create_nomenclature(
 @router.get("/{id}", response_model=NomenclatureResponse)
 async def read_nomenclature(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
 ) -> Any:
     """
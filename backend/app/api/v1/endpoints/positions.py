@@ -17,7 +17,7 @@
 @router.get("/{id}", response_model=PositionResponse)
 async def read_position(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
 ) -> Any:
     """
@@ -1,37 +1,74 @@
-from typing import Any, List
+import mimetypes
+from datetime import datetime
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.core.conditional import check_not_modified
+from app.core.executor import ExecutorSaturatedError
+from app.core.responses import FastJSONResponse
+from app.core.storage import storage
+from app.core.streaming import content_disposition, parse_byte_range
+from app.modules.auth.services.principal_cache import Principal
+from app.modules.tender_management.enums import StageCode, TenderSource
 from app.modules.tender_management.schemas.stage import StageResponse
 from app.modules.tender_management.schemas.tender import (
+    BulkStageChangeRequest,
+    BulkStageChangeResult,
+    PaginatedAuditLogs,
+    PaginatedTenders,
     TenderCreate,
+    TenderFileAttach,
     TenderFileResponse,
+    TenderFileUrl,
+    TenderImportRequest,
+    TenderImportResult,
     TenderResponse,
     TenderUpdate,
 )
+from app.modules.tender_management.services.audit_service import AuditService
 from app.modules.tender_management.services.file_service import FileService
 from app.modules.tender_management.services.stage_service import StageService
 from app.modules.tender_management.services.tender_service import TenderService
 
 router = APIRouter()
 
+_TENDER_LIST = TypeAdapter(List[TenderResponse])
+
 
 @router.get("/stages", response_model=List[StageResponse])
 async def read_stages(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
 ) -> Any:
     """
     Retrieve all possible stages.
     """
+    await check_not_modified(request, response, db, "stages")
     stages = await StageService.get_all(db)
     return stages
 
 
 @router.get("/", response_model=List[TenderResponse])
 async def read_tenders(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
@@ -39,7 +76,56 @@ async def read_tenders(
     Retrieve tenders.
     """
     tenders = await TenderService.get_all(db, skip=skip, limit=limit)
-    return tenders
+    # Validated once from the ORM rows and encoded by pydantic-core
+    return FastJSONResponse(
+        _TENDER_LIST.dump_json(
+            _TENDER_LIST.validate_python(tenders, from_attributes=True)
+        )
+    )
+
+
+@router.get("/search", response_model=PaginatedTenders)
+async def search_tenders(
+    db: AsyncSession = Depends(deps.get_read_db),
+    stage: Optional[List[StageCode]] = Query(None),
+    customer: Optional[str] = None,
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    responsible_id: Optional[int] = None,
+    engineer_id: Optional[int] = None,
+    source: Optional[TenderSource] = None,
+    is_archived: Optional[bool] = False,
+    search: Optional[str] = None,
+    sort_by: str = Query(
+        "created_at", pattern="^(created_at|updated_at|deadline_at|number)$"
+    ),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+) -> Any:
+    """
+    Search tenders with filters and cursor pagination.
+    """
+    try:
+        items, next_cursor = await TenderService.search(
+            db,
+            stage_codes=stage,
+            customer=customer,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+            responsible_id=responsible_id,
+            engineer_id=engineer_id,
+            source=source,
+            is_archived=is_archived,
+            search=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return FastJSONResponse(PaginatedTenders(items=items, next_cursor=next_cursor))
 
 
 @router.post("/", response_model=TenderResponse)
@@ -60,7 +146,7 @@ async def create_tender(
 @router.get("/{id}", response_model=TenderResponse)
 async def read_tender(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
 ) -> Any:
     """
@@ -69,7 +155,30 @@ async def read_tender(
     tender = await TenderService.get(db=db, id=id)
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
-    return tender
+    return FastJSONResponse(TenderResponse.model_validate(tender))
+
+
+@router.get("/{id}/audit", response_model=PaginatedAuditLogs)
+async def read_tender_audit(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id: int,
+    action: Optional[List[str]] = Query(None),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+) -> Any:
+    """
+    Get tender audit history, newest first.
+    """
+    if not await TenderService.exists(db=db, id=id):
+        raise HTTPException(status_code=404, detail="Tender not found")
+    try:
+        items, next_cursor = await AuditService.list_for_tender(
+            db, tender_id=id, actions=action, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return PaginatedAuditLogs(items=items, next_cursor=next_cursor)
 
 
 @router.put("/{id}", response_model=TenderResponse)
@@ -82,15 +191,51 @@ async def update_tender(
     """
     Update tender.
     """
-    tender = await TenderService.get(db=db, id=id)
+    try:
+        tender = await TenderService.update(db=db, id=id, schema=tender_in)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
+    return tender
+
 
+@router.post("/import", response_model=TenderImportResult)
+async def import_tenders(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    request: TenderImportRequest,
+) -> Any:
+    """
+    Create or refresh tenders from a marketplace, matched by number.
+    """
     try:
-        tender = await TenderService.update(db=db, id=id, schema=tender_in)
+        return await TenderService.import_many(
+            db=db, source=request.source, tenders=request.tenders
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/bulk/change-stage", response_model=List[BulkStageChangeResult])
+async def bulk_change_tender_stage(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    request: BulkStageChangeRequest,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Change stage of many tenders in one transaction.
+    """
+    try:
+        return await TenderService.bulk_change_stage(
+            db=db,
+            tender_ids=request.tender_ids,
+            target_stage_code=request.target_stage_code.value,
+            user_id=current_user.id,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return tender
 
 
 @router.post("/{id}/change-stage", response_model=TenderResponse)
@@ -99,15 +244,17 @@ async def change_tender_stage(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     target_stage_code: str = Query(..., description="Target stage code"),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Change tender stage.
     """
     try:
-        # TODO: Get current user ID from token
-        user_id = 1
         tender = await TenderService.change_stage(
-            db=db, id=id, target_stage_code=target_stage_code, user_id=user_id
+            db=db,
+            id=id,
+            target_stage_code=target_stage_code,
+            user_id=current_user.id,
         )
         return tender
     except ValueError as e:
@@ -121,33 +268,179 @@ async def upload_tender_file(
     id: int,
     file: UploadFile = File(...),
     category: str = Form(...),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Upload a file to the tender.
     """
-    tender = await TenderService.get(db=db, id=id)
-    if not tender:
+    if not await TenderService.exists(db=db, id=id):
         raise HTTPException(status_code=404, detail="Tender not found")
 
-    # TODO: Get real user
-    user_id = 1
-
     try:
         db_file = await FileService.upload(
-            db=db, tender_id=id, file=file, category=category, user_id=user_id
+            db=db,
+            tender_id=id,
+            file=file,
+            category=category,
+            user_id=current_user.id,
         )
         return db_file
+    except ExecutorSaturatedError:
+        raise
     except Exception as e:
         # In real app, log exception
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+@router.get("/{id}/files/urls", response_model=List[TenderFileUrl])
+async def get_tender_file_urls(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id: int,
+    file_id: Optional[List[int]] = Query(None, max_length=500),
+) -> Any:
+    """
+    Get presigned download URLs for many files at once (all active files
+    of the tender when no file_id is given).
+    """
+    urls = await FileService.get_urls(db=db, tender_id=id, file_ids=file_id)
+    return [TenderFileUrl(id=file_id, url=url) for file_id, url in urls]
+
+
+@router.get("/{id}/files/archive")
+async def download_tender_files_archive(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id: int,
+) -> Any:
+    """
+    Download all active files of the tender as a ZIP archive built on the fly.
+    """
+    number = await TenderService.get_number(db=db, id=id)
+    if number is None:
+        raise HTTPException(status_code=404, detail="Tender not found")
+
+    files = await FileService.list_active(db=db, tender_id=id)
+    return StreamingResponse(
+        FileService.stream_archive(files),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": content_disposition(f"{number}.zip"),
+        },
+    )
+
+
+@router.get("/{id}/files/{file_id}/download")
+async def download_tender_file(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id: int,
+    file_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+) -> Any:
+    """
+    Stream the file content through the API, honouring single byte ranges.
+    """
+    file_record = await FileService.get_for_tender(db=db, tender_id=id, file_id=file_id)
+    if not file_record:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    size = file_record.size
+    if size is None:
+        size = await storage.object_size(file_record.file_path)
+    try:
+        byte_range = parse_byte_range(range_header, size)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=416,
+            detail=str(exc),
+            headers={"Content-Range": f"bytes */{size}"},
+        ) from exc
+
+    start, end = byte_range or (0, size - 1)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": content_disposition(file_record.filename),
+        "Content-Length": str(end - start + 1),
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    media_type, _ = mimetypes.guess_type(file_record.filename)
+    # Opened here so that a saturated storage executor answers 503 before
+    # any header is sent
+    body = await storage.open_object(
+        file_record.file_path, offset=start, length=end - start + 1
+    )
+    return StreamingResponse(
+        body,
+        status_code=206 if byte_range else 200,
+        media_type=media_type or "application/octet-stream",
+        headers=headers,
+    )
+
+
+@router.head("/{id}/files/blobs/{sha256}")
+async def check_tender_file_blob(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    id: int,
+    sha256: str = Path(..., pattern="^[0-9a-f]{64}$"),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Response:
+    """
+    Check whether content with this SHA-256 is already stored, so the client
+    can attach it by hash instead of uploading the bytes. Only content the
+    user uploaded or the tender already holds is reported.
+    """
+    if not await TenderService.exists(db=db, id=id):
+        raise HTTPException(status_code=404, detail="Tender not found")
+    if not await FileService.blob_exists(
+        db=db,
+        sha256=sha256,
+        tender_id=id,
+        user_id=current_user.id,
+        restrict_to_user=not current_user.is_superuser,
+    ):
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return Response(status_code=200)
+
+
+@router.post("/{id}/files/blobs/{sha256}", response_model=TenderFileResponse)
+async def attach_tender_file_blob(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    id: int,
+    sha256: str = Path(..., pattern="^[0-9a-f]{64}$"),
+    file_in: TenderFileAttach,
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Attach already stored content to the tender by its SHA-256.
+    """
+    if not await TenderService.exists(db=db, id=id):
+        raise HTTPException(status_code=404, detail="Tender not found")
+
+    db_file = await FileService.attach_blob(
+        db=db,
+        tender_id=id,
+        sha256=sha256,
+        filename=file_in.filename,
+        category=file_in.category,
+        user_id=current_user.id,
+        restrict_to_user=not current_user.is_superuser,
+    )
+    if not db_file:
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return db_file
+
+
 @router.delete("/{id}/files/{file_id}")
 async def delete_tender_file(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     file_id: int,
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Delete a file from the tender.
@@ -157,7 +450,7 @@ async def delete_tender_file(
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
 
-    success = await FileService.delete(db=db, file_id=file_id)
+    success = await FileService.delete(db=db, file_id=file_id, user_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="File not found")
 
@@ -167,7 +460,7 @@ async def delete_tender_file(
 @router.get("/{id}/files/{file_id}/url")
 async def get_tender_file_url(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     id: int,
     file_id: int,
 ) -> Any:
@@ -7,14 +7,14 @@
 
 from app.api import deps
 from app.core.config import settings
-from app.core.security import verify_password
-from app.modules.auth.models.user import User
+from app.core.security import verify_password_async
 from app.modules.auth.schemas.user import (
     UserCreate,
     UserResponse,
     UserUpdate,
     UserUpdatePassword,
 )
+from app.modules.auth.services.principal_cache import Principal
 from app.modules.auth.services.user_service import UserService
 
 router = APIRouter()
@@ -22,7 +22,7 @@
 
 @router.get("/me", response_model=UserResponse)
 def read_user_me(
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get current user.
@@ -35,12 +35,15 @@ async def update_user_password(
     *,
     db: AsyncSession = Depends(deps.get_db),
     password_in: UserUpdatePassword,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update current user password.
     """
-    if not verify_password(password_in.current_password, current_user.hashed_password):
+    user = await UserService.get(db, id=current_user.id)
+    if not await verify_password_async(
+        password_in.current_password, user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect current password")
 
     if password_in.current_password == password_in.new_password:
@@ -49,7 +52,7 @@ async def update_user_password(
         )
 
     user = await UserService.update(
-        db, db_obj=current_user, obj_in={"password": password_in.new_password}
+        db, db_obj=user, obj_in={"password": password_in.new_password}
     )
     return user
 
@@ -59,7 +62,7 @@ async def create_user(
     *,
     db: AsyncSession = Depends(deps.get_db),
     user_in: UserCreate,
-    # current_user: User = Depends(deps.get_current_active_superuser), # Open registration for MVP setup
+    # current_user: Principal = Depends(deps.get_current_active_superuser), # Open registration for MVP setup
 ) -> Any:
     """
     Create new user.
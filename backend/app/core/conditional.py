@@ -0,0 +1,99 @@
+"""
+Conditional GET for read-mostly resources.
+
+Validators come from table_versions, which database triggers bump on every
+write to the tracked tables, so deciding on 304 costs one primary key lookup
+and never loads or serializes the rows themselves.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi import status as http_status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.table_versions import TableVersion
+
+# Clients may keep the copy, but must revalidate it before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+async def load_versions(
+    db: AsyncSession, tables: Sequence[str]
+) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    result = await db.execute(
+        select(
+            TableVersion.table_name, TableVersion.version, TableVersion.updated_at
+        ).where(TableVersion.table_name.in_(tables))
+    )
+    return {name: (version, updated_at) for name, version, updated_at in result}
+
+
+def build_etag(request: Request, versions: Dict[str, Tuple[int, object]]) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(request.url.path.encode())
+    digest.update(b"?" + request.url.query.encode())
+    for name in sorted(versions):
+        digest.update(f"|{name}:{versions[name][0]}".encode())
+    # Weak: the representation is equivalent, not guaranteed byte-identical
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have whole-second precision
+    return last_modified.replace(microsecond=0) <= since
+
+
+async def check_not_modified(
+    request: Request, response: Response, db: AsyncSession, *tables: str
+) -> None:
+    """
+    Answers 304 (by raising) when the client copy is still current,
+    otherwise sets ETag, Last-Modified and Cache-Control on the response.
+    Call it before loading anything: the validators only depend on the
+    versions of `tables`, which must list every table the body reads.
+    """
+    versions = await load_versions(db, tables)
+    headers = {"ETag": build_etag(request, versions), "Cache-Control": CACHE_CONTROL}
+    timestamps = [updated_at for _, updated_at in versions.values() if updated_at]
+    last_modified = max(timestamps) if timestamps else None
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = etag_matches(if_none_match, headers["ETag"])
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = bool(
+            if_modified_since
+            and last_modified is not None
+            and not_modified_since(if_modified_since, last_modified)
+        )
+    if fresh:
+        raise HTTPException(
+            status_code=http_status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    response.headers.update(headers)
@@ -16,6 +16,20 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # bcrypt runs on its own pool, which also bounds concurrent logins
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE: int = 32
+    PASSWORD_HASH_ACQUIRE_TIMEOUT_SECONDS: float = 5.0
+    # Authenticated principal cache: short per-process TTL (bounds staleness
+    # after deactivation on other workers) in front of a longer Redis TTL,
+    # which only applies if an invalidation never reaches Redis
+    AUTH_PRINCIPAL_LOCAL_TTL_SECONDS: float = 10.0
+    AUTH_PRINCIPAL_REDIS_TTL_SECONDS: int = 300
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10_000
+    # Merged class schemas, cached per process in front of Redis; also what
+    # keeps validation fast while Redis is unavailable
+    SCHEMA_REGISTRY_LOCAL_TTL_SECONDS: float = 10.0
+    SCHEMA_REGISTRY_CACHE_SIZE: int = 1000
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -35,6 +49,26 @@ def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str
     DATABASE_URL: Optional[str] = None
+    # Optional streaming replica used by read-only GET endpoints
+    DATABASE_READ_REPLICA_URL: Optional[str] = None
+    # Engine / pool. Per worker and engine: up to pool size + overflow
+    # connections; workers * that must stay below Postgres max_connections.
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+    DB_JIT: bool = False
+    DB_APPLICATION_NAME: str = "seny-backend"
+    # Warm-up on worker start, run concurrently before the first request:
+    # connections opened per engine (capped at DB_POOL_SIZE) and how many
+    # of the most used class schemas get loaded and compiled. 0 disables.
+    STARTUP_DB_POOL_PREFILL: int = 4
+    STARTUP_SCHEMA_WARM_LIMIT: int = 200
+    STARTUP_WARMUP_TIMEOUT_SECONDS: float = 10.0
 
     @field_validator("DATABASE_URL", mode="before")
     def assemble_db_connection(cls, v: Optional[str], values) -> str:
@@ -53,6 +87,18 @@ def assemble_db_connection(cls, v: Optional[str], values) -> str:
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
     REDIS_URL: Optional[str] = None
+    # Per worker. Commands wait up to the socket timeout for a free
+    # connection; short timeouts keep a hung Redis from stalling requests.
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 0.5
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    # Circuit breaker: after this many consecutive connection failures Redis
+    # is skipped (callers fall back to in-process caches) for the backoff,
+    # which doubles after every failed probe up to the maximum.
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 3
+    REDIS_BREAKER_BACKOFF_SECONDS: float = 1.0
+    REDIS_BREAKER_MAX_BACKOFF_SECONDS: float = 60.0
 
     # MinIO
     MINIO_ENDPOINT: str = "localhost"
@@ -61,6 +107,60 @@ def assemble_db_connection(cls, v: Optional[str], values) -> str:
     MINIO_SECRET_KEY: str
     MINIO_BUCKET: str = "seny-files"
     MINIO_USE_SSL: bool = False
+    # A fixed region lets presigned URLs be signed locally, without a
+    # bucket location lookup.
+    MINIO_REGION: str = "us-east-1"
+    MINIO_PRESIGN_CACHE_SIZE: int = 10_000
+    # Shared urllib3 pool: keep max connections >= worker threads that may
+    # talk to MinIO at once, or connections get discarded and reopened.
+    MINIO_MAX_CONNECTIONS: int = 32
+    MINIO_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    MINIO_READ_TIMEOUT_SECONDS: float = 300.0
+    MINIO_STARTUP_TIMEOUT_SECONDS: float = 5.0
+    # Dedicated threads for blocking storage calls; callers beyond
+    # workers + queue wait up to the timeout, then get 503.
+    STORAGE_EXECUTOR_WORKERS: int = 16
+    STORAGE_EXECUTOR_QUEUE: int = 64
+    STORAGE_EXECUTOR_ACQUIRE_TIMEOUT_SECONDS: float = 2.0
+    # Multipart upload tuning: peak memory per upload is roughly
+    # part size * (parallel uploads + 1), independent of file size.
+    MINIO_UPLOAD_PART_SIZE: int = 16 * 1024 * 1024
+    MINIO_UPLOAD_PARALLELISM: int = 3
+    # Downloads: chunk size of streamed reads and how many files the ZIP
+    # export reads ahead of the one being written.
+    MINIO_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MINIO_ARCHIVE_PREFETCH: int = 2
+
+    # Audit
+    # When enabled, audit entries are queued after the request transaction
+    # commits and written in batches by a background task.
+    AUDIT_BUFFERED_WRITES: bool = False
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_MAX_PENDING: int = 50_000
+
+    # Monitoring
+    # Serves /metrics. Under several workers also export
+    # PROMETHEUS_MULTIPROC_DIR (process environment, not .env).
+    PROMETHEUS_ENABLED: bool = True
+    # SQL profiler: share of requests whose statements are all captured
+    # (1.0 in development, small in production). Statement shapes repeated
+    # this often in one request are logged as N+1 suspects; slow statements
+    # are logged with parameter types and, optionally, a generic plan.
+    SQL_PROFILER_SAMPLE_RATE: float = 0.0
+    SQL_PROFILER_REPEAT_THRESHOLD: int = 10
+    SQL_PROFILER_SLOW_STATEMENT_MS: float = 200.0
+    SQL_PROFILER_EXPLAIN: bool = False
+    # Tracing: share of requests traced through the service layer.
+    # Exporter "memory" keeps the last traces in the process (see
+    # /debug/traces), "file" appends them to TRACING_FILE as JSON lines
+    # from a background thread, dropping traces once
+    # TRACING_FILE_MAX_PENDING are waiting to be written.
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_EXPORTER: str = "memory"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_FILE_MAX_PENDING: int = 10000
+    TRACING_MEMORY_TRACES: int = 1000
 
     # AI/ML
     OPENAI_API_KEY: Optional[str] = None
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a bounded executor cannot accept more work in time."""
+
+
+class BoundedExecutor:
+    """
+    Dedicated thread pool for one kind of blocking work, so that a slow
+    dependency cannot take over the default executor.
+
+    At most `max_workers + max_queue` calls are admitted at once; further
+    callers wait up to `acquire_timeout` seconds for a slot and then get
+    ExecutorSaturatedError. A slot is held until the thread finishes, even
+    if the awaiting coroutine is cancelled. Multi-step work (streams) is
+    admitted once and continues through run_continuation().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        acquire_timeout: float,
+    ) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.acquire_timeout = acquire_timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._run_seconds_total = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name
+            )
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        self._ensure_started()
+        await self._acquire(self._slots, self.acquire_timeout)
+        return await self._run_admitted(func, *args, **kwargs)
+
+    async def run_queued(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Like run(), but waits for a slot as long as it takes instead of
+        failing: for work that starts after a response is already being
+        sent, where a rejection could only truncate the body.
+        """
+        self._ensure_started()
+        await self._acquire(self._slots, None)
+        return await self._run_admitted(func, *args, **kwargs)
+
+    async def run_continuation(
+        self, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """
+        Runs a follow-up step of work admitted earlier, such as the next
+        chunk of an opened stream, without taking another slot. Callers keep
+        at most one such call per admitted operation in flight.
+        """
+        self._ensure_started()
+        return await asyncio.wrap_future(
+            self._pool.submit(self._call(func, args, kwargs))
+        )
+
+    async def _run_admitted(
+        self, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        slots = self._slots
+        loop = asyncio.get_running_loop()
+        with self._stats_lock:
+            self._in_flight += 1
+        try:
+            future = self._pool.submit(self._call(func, args, kwargs))
+        except BaseException:
+            self._finish(slots)
+            raise
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._finish, slots)
+        )
+        return await asyncio.wrap_future(future)
+
+    def _call(self, func: Callable[..., T], args: Any, kwargs: Any) -> Callable[[], T]:
+        return functools.partial(
+            contextvars.copy_context().run,
+            self._timed,
+            time.perf_counter(),
+            functools.partial(func, *args, **kwargs),
+        )
+
+    async def _acquire(
+        self, slots: asyncio.Semaphore, timeout: Optional[float]
+    ) -> None:
+        if not slots.locked():
+            # Free slot: acquire() returns without suspending
+            await slots.acquire()
+            return
+        if timeout is None:
+            await slots.acquire()
+            return
+        if timeout <= 0:
+            self._reject()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self._reject()
+
+    def _reject(self) -> None:
+        with self._stats_lock:
+            self._rejected += 1
+        raise ExecutorSaturatedError(f"{self.name} executor is saturated, retry later")
+
+    def _timed(self, queued_at: float, func: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            finished = time.perf_counter()
+            wait = started - queued_at
+            with self._stats_lock:
+                self._completed += 1
+                self._wait_seconds_total += wait
+                self._run_seconds_total += finished - started
+                self._max_wait_seconds = max(self._max_wait_seconds, wait)
+
+    def _finish(self, slots: asyncio.Semaphore) -> None:
+        with self._stats_lock:
+            self._in_flight -= 1
+        slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queued": max(self._in_flight - self.max_workers, 0),
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": (
+                    self._wait_seconds_total / completed if completed else 0.0
+                ),
+                "max_wait_seconds": self._max_wait_seconds,
+                "avg_run_seconds": (
+                    self._run_seconds_total / completed if completed else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._slots = None
@@ -0,0 +1,247 @@
+"""
+Prometheus metrics.
+
+Under several uvicorn workers each process keeps its own counters. Set
+PROMETHEUS_MULTIPROC_DIR (an empty directory, wiped on every restart) in
+the environment before the app starts: values are then written to files
+there and /metrics aggregates all workers, whichever one serves it.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed while serving one request.",
+    ["method", "route"],
+    buckets=STATEMENT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL while serving one request.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Database pool connections by engine and state.",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency.",
+    ["command"],
+    buckets=LATENCY_BUCKETS,
+)
+REDIS_CIRCUIT_OPEN = Gauge(
+    "redis_circuit_open",
+    "1 while the Redis circuit breaker skips Redis (open or half-open).",
+    multiprocess_mode="max",
+)
+REDIS_CIRCUIT_TRANSITIONS = Counter(
+    "redis_circuit_transitions_total",
+    "Redis circuit breaker state changes by new state.",
+    ["state"],
+)
+REDIS_POOL_EXHAUSTED = Counter(
+    "redis_pool_exhausted_total",
+    "Redis commands that found every pooled connection busy for the whole "
+    "wait timeout. Not counted as Redis failures by the circuit breaker.",
+)
+STORAGE_OPERATION_DURATION = Histogram(
+    "storage_operation_duration_seconds",
+    "MinIO call latency.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+EMBEDDING_REQUEST_DURATION = Histogram(
+    "embedding_request_duration_seconds",
+    "Embedding provider latency.",
+    ["model", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@dataclass
+class DbUsage:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+_db_usage: ContextVar[Optional[DbUsage]] = ContextVar("db_usage", default=None)
+
+
+@contextmanager
+def track_db_usage() -> Iterator[DbUsage]:
+    """
+    Counts SQL statements executed in the current context (one request) on
+    instrumented engines.
+    """
+    usage = DbUsage()
+    token = _db_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _db_usage.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_started_at", []).append((context, time.perf_counter()))
+
+
+def _record(started: float) -> None:
+    usage = _db_usage.get()
+    if usage is not None:
+        usage.statements += 1
+        usage.seconds += time.perf_counter() - started
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    _, started = conn.info["query_started_at"].pop()
+    _record(started)
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start
+    # time here so it is not paired with the connection's next statement.
+    # Errors raised before the cursor ran pushed nothing and match nothing.
+    conn = exception_context.connection
+    context = exception_context.execution_context
+    if conn is None or context is None:
+        return
+    stack = conn.info.get("query_started_at")
+    if stack and stack[-1][0] is context:
+        _, started = stack.pop()
+        _record(started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def update_pool_gauges(stats: dict) -> None:
+    for engine_name, pool in stats.items():
+        for state in ("checked_out", "checked_in", "overflow"):
+            DB_POOL_CONNECTIONS.labels(engine=engine_name, state=state).set(pool[state])
+
+
+def render() -> tuple[bytes, str]:
+    """Returns the exposition payload and its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drops this worker's live gauges from the multiprocess aggregate."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def route_label(scope) -> str:
+    """Path template of the matched route, or "unmatched"."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records latency and SQL usage per request. Routes are labelled by
+    their path template, so ids in URLs do not create new series.
+    """
+
+    def __init__(self, app, pool_stats=None) -> None:
+        self.app = app
+        self.pool_stats = pool_stats
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        with track_db_usage() as usage:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - started
+                route_name = route_label(scope)
+                method = scope["method"]
+                HTTP_REQUEST_DURATION.labels(
+                    method=method, route=route_name, status=str(status)
+                ).observe(elapsed)
+                DB_STATEMENTS_PER_REQUEST.labels(
+                    method=method, route=route_name
+                ).observe(usage.statements)
+                DB_TIME_PER_REQUEST.labels(method=method, route=route_name).observe(
+                    usage.seconds
+                )
+                if self.pool_stats is not None:
+                    update_pool_gauges(self.pool_stats())
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Packs keyset values (e.g. sort column + id of the last row) into an
+    opaque URL-safe token.
+    """
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+        default=str,
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Reverses `encode_cursor`. Raises ValueError for malformed tokens so that
+    endpoints can answer 400 the same way as for other bad input.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Некорректный курсор пагинации") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Некорректный курсор пагинации")
+    return values
+
+
+def is_row_id(value: Any) -> bool:
+    """
+    Whether a decoded cursor value can stand for an integer primary key.
+    JSON booleans decode to bool, a subclass of int, so they are excluded.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -1,15 +1,151 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional
+import time
+from typing import Any, Callable, Dict, Optional
 
 from loguru import logger
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from app.core.config import settings
+from app.core.metrics import (
+    REDIS_CIRCUIT_OPEN,
+    REDIS_CIRCUIT_TRANSITIONS,
+    REDIS_COMMAND_DURATION,
+    REDIS_POOL_EXHAUSTED,
+    timed,
+)
 
 _redis: Optional[Redis] = None
-_redis_lock = asyncio.Lock()
+
+
+class CircuitBreaker:
+    """
+    Closed: everything goes through. After `failure_threshold` consecutive
+    failures it opens and rejects calls for the backoff. The first call
+    after that is let through as a probe (half-open): success closes the
+    circuit, failure reopens it with the backoff doubled, up to
+    `max_backoff`. A probe that never reports back is replaced after
+    another backoff, so a cancelled request cannot wedge the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        backoff: float,
+        max_backoff: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.backoff = backoff
+        self.retry_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = self._clock()
+        if now < self.retry_at:
+            return False
+        # This caller is the probe; others keep being rejected meanwhile
+        self.retry_at = now + self.backoff
+        self._transition(self.HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self.backoff = self.base_backoff
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+        elif self.failures < self.failure_threshold:
+            return
+        if self.state != self.OPEN:
+            self._transition(self.OPEN)
+        self.retry_at = self._clock() + self.backoff
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "backoff_seconds": self.backoff,
+        }
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        REDIS_CIRCUIT_OPEN.set(0 if state == self.CLOSED else 1)
+        REDIS_CIRCUIT_TRANSITIONS.labels(state=state).inc()
+        if state == self.OPEN:
+            logger.warning(
+                "Redis circuit open after {} failures, retry in {:.1f}s",
+                self.failures,
+                self.backoff,
+            )
+        elif state == self.CLOSED:
+            logger.info("Redis circuit closed, Redis is available again")
+
+
+breaker = CircuitBreaker(
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    backoff=settings.REDIS_BREAKER_BACKOFF_SECONDS,
+    max_backoff=settings.REDIS_BREAKER_MAX_BACKOFF_SECONDS,
+)
+
+
+class RedisPoolExhaustedError(RedisConnectionError):
+    """Every pooled connection stayed busy for the whole wait timeout."""
+
+
+class BoundedConnectionPool(BlockingConnectionPool):
+    """
+    Blocking pool that tells waiting for a free connection apart from
+    failing to talk to Redis; redis-py raises ConnectionError for both.
+    """
+
+    async def get_connection(self, *args, **kwargs):
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except RedisConnectionError as exc:
+            if isinstance(exc.__cause__, asyncio.TimeoutError):
+                raise RedisPoolExhaustedError(str(exc)) from exc
+            raise
+
+
+class InstrumentedRedis(Redis):
+    """
+    Redis client that records per-command latency and reports connection
+    failures and successes to the circuit breaker. A burst that exhausts
+    the local pool says nothing about Redis itself and does not count.
+    """
+
+    async def execute_command(self, *args, **options):
+        try:
+            with timed(REDIS_COMMAND_DURATION, command=str(args[0]).upper()):
+                result = await super().execute_command(*args, **options)
+        except RedisPoolExhaustedError:
+            REDIS_POOL_EXHAUSTED.inc()
+            raise
+        except (RedisConnectionError, RedisTimeoutError, OSError):
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
 
 
 def _build_redis_url() -> str:
@@ -23,31 +159,46 @@ def _build_redis_url() -> str:
     )
 
 
+def _create_client() -> Redis:
+    pool = BoundedConnectionPool.from_url(
+        _build_redis_url(),
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        # Wait for a free connection no longer than for a reply
+        timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+        encoding="utf-8",
+        decode_responses=False,
+    )
+    return InstrumentedRedis(connection_pool=pool)
+
+
 async def get_redis() -> Optional[Redis]:
     """
-    Returns a lazily initialized Redis client.
-    If Redis is unavailable, returns None and logs the error.
+    Returns the shared Redis client, or None while the circuit breaker
+    considers Redis unavailable; callers then skip Redis. Never blocks:
+    only the half-open probe pays a round trip, bounded by the timeouts.
     """
     global _redis
-    if _redis is not None:
-        return _redis
-
-    async with _redis_lock:
-        if _redis is not None:
-            return _redis
-        url = _build_redis_url()
+    if not breaker.allow():
+        return None
+    if _redis is None:
+        # Connects lazily, on the first command
+        _redis = _create_client()
+    if breaker.state == CircuitBreaker.HALF_OPEN:
         try:
-            client = Redis.from_url(url, encoding="utf-8", decode_responses=False)
-            await client.ping()
+            await _redis.ping()
         except Exception as exc:  # noqa: BLE001
-            logger.warning("Redis is unavailable at {}: {}", url, exc)
+            if breaker.state == CircuitBreaker.HALF_OPEN:
+                breaker.record_failure()
+            logger.warning("Redis probe failed: {}", exc)
             return None
-        _redis = client
-        return _redis
+    return _redis
 
 
 async def close_redis() -> None:
     global _redis
     if _redis is not None:
-        await _redis.close()
+        await _redis.aclose(close_connection_pool=True)
         _redis = None
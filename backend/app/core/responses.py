@@ -0,0 +1,34 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+def _default(value: Any) -> Any:
+    # Same wire format as pydantic: Decimal as a string
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for large payloads that are built once by the handler.
+
+    Returning a Response makes FastAPI skip response_model validation, so
+    the content must already match the declared schema. Accepts plain data
+    (encoded with orjson, same output as pydantic for datetime/Decimal/enum),
+    a pydantic model (encoded by pydantic-core) or pre-encoded bytes.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return to_json(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
@@ -5,9 +5,20 @@
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.executor import BoundedExecutor
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow (~250 ms) and releases the GIL, so it runs on
+# its own small pool. The pool size and queue also cap concurrent logins:
+# a burst beyond them gets 503 instead of piling up behind the CPU.
+password_executor = BoundedExecutor(
+    "password",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE,
+    acquire_timeout=settings.PASSWORD_HASH_ACQUIRE_TIMEOUT_SECONDS,
+)
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -32,3 +43,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_executor.run(get_password_hash, password)
@@ -0,0 +1,296 @@
+"""
+SQL profiler for sampled requests.
+
+Every statement of a sampled request is captured and grouped by shape
+(the SQL text with placeholders and IN/VALUES lists collapsed). Shapes
+repeated at least SQL_PROFILER_REPEAT_THRESHOLD times are reported as N+1
+suspects, statements slower than SQL_PROFILER_SLOW_STATEMENT_MS are logged
+with the shape of their parameters (never the values) and, optionally, a
+generic EXPLAIN plan. A per-endpoint summary is kept in memory.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import route_label
+
+Explainer = Callable[[str], Awaitable[str]]
+
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_TUPLES_RE = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE_RE = re.compile(r"\s+")
+_MAX_PARAMS_IN_SHAPE = 8
+_MAX_EXPLAINED_SHAPES = 1000
+
+
+def statement_shape(statement: str) -> str:
+    shape = _PLACEHOLDER_RE.sub("?", statement)
+    shape = _LIST_RE.sub("(?)", shape)
+    shape = _TUPLES_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+def parameters_shape(parameters: Any) -> str:
+    if isinstance(parameters, dict):
+        items = list(parameters.items())
+        shown = ", ".join(
+            f"{key}: {type(value).__name__}"
+            for key, value in items[:_MAX_PARAMS_IN_SHAPE]
+        )
+        more = ", ..." if len(items) > _MAX_PARAMS_IN_SHAPE else ""
+        return f"{{{shown}{more}}}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany
+            return f"{len(parameters)} x {parameters_shape(parameters[0])}"
+        shown = ", ".join(
+            type(value).__name__ for value in parameters[:_MAX_PARAMS_IN_SHAPE]
+        )
+        more = ", ..." if len(parameters) > _MAX_PARAMS_IN_SHAPE else ""
+        return f"({shown}{more})"
+    return type(parameters).__name__
+
+
+@dataclass
+class StatementStats:
+    shape: str
+    count: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass
+class SlowStatement:
+    statement: str
+    parameters: str
+    seconds: float
+
+
+@dataclass
+class QueryProfile:
+    slow_threshold_seconds: float
+    shapes: Dict[str, StatementStats] = field(default_factory=dict)
+    slow: List[SlowStatement] = field(default_factory=list)
+    statements: int = 0
+    seconds: float = 0.0
+
+    def record(self, statement: str, parameters: Any, seconds: float) -> None:
+        shape = statement_shape(statement)
+        stats = self.shapes.get(shape)
+        if stats is None:
+            stats = self.shapes[shape] = StatementStats(shape)
+        stats.count += 1
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        self.statements += 1
+        self.seconds += seconds
+        if seconds >= self.slow_threshold_seconds:
+            self.slow.append(
+                SlowStatement(statement, parameters_shape(parameters), seconds)
+            )
+
+    def repeated(self, threshold: int) -> List[StatementStats]:
+        return sorted(
+            (stats for stats in self.shapes.values() if stats.count >= threshold),
+            key=lambda stats: stats.count,
+            reverse=True,
+        )
+
+
+_profile: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if _profile.get() is not None:
+        conn.info.setdefault("profiler_started_at", []).append(
+            (context, time.perf_counter())
+        )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    profile = _profile.get()
+    if profile is not None:
+        _, started = conn.info["profiler_started_at"].pop()
+        profile.record(statement, parameters, time.perf_counter() - started)
+
+
+def _handle_error(exception_context) -> None:
+    # Same bookkeeping as metrics._handle_error: a failed statement's start
+    # time must not be left for the connection's next statement.
+    profile = _profile.get()
+    conn = exception_context.connection
+    context = exception_context.execution_context
+    if profile is None or conn is None or context is None:
+        return
+    stack = conn.info.get("profiler_started_at")
+    if stack and stack[-1][0] is context:
+        _, started = stack.pop()
+        profile.record(
+            exception_context.statement,
+            exception_context.parameters,
+            time.perf_counter() - started,
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def make_explainer(engine: AsyncEngine) -> Explainer:
+    """
+    EXPLAIN (GENERIC_PLAN) plans a statement with its placeholders left
+    unbound (PostgreSQL 16+), so no parameter values have to be kept.
+    """
+
+    async def explain(statement: str) -> str:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(f"EXPLAIN (GENERIC_PLAN) {statement}")
+            return "\n".join(row[0] for row in result)
+
+    return explain
+
+
+@dataclass
+class EndpointReport:
+    requests: int = 0
+    statements: int = 0
+    max_statements: int = 0
+    seconds: float = 0.0
+    max_repeats: int = 0
+    worst_shape: Optional[str] = None
+
+
+class SqlProfilerMiddleware:
+    """
+    Captures SQL for a sample of requests and logs N+1 suspects, slow
+    statements and a per-request summary. Explain plans are fetched after
+    the response has been sent, once per statement shape and process.
+    """
+
+    _report: Dict[str, EndpointReport] = {}
+    _explained: set = set()
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float,
+        repeat_threshold: int,
+        slow_statement_ms: float,
+        explain: Optional[Explainer] = None,
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.repeat_threshold = repeat_threshold
+        self.slow_threshold_seconds = slow_statement_ms / 1000
+        self.explain = explain
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(self.slow_threshold_seconds)
+        token = _profile.set(profile)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _profile.reset(token)
+            endpoint = f"{scope['method']} {route_label(scope)}"
+            self._log(endpoint, profile)
+            self._add_to_report(endpoint, profile)
+        if self.explain is not None:
+            await self._explain_slow(endpoint, profile)
+
+    def _log(self, endpoint: str, profile: QueryProfile) -> None:
+        for stats in profile.repeated(self.repeat_threshold):
+            logger.warning(
+                "N+1 suspect on {}: {} x {:.1f} ms total: {}",
+                endpoint,
+                stats.count,
+                stats.seconds * 1000,
+                stats.shape,
+            )
+        for slow in profile.slow:
+            logger.warning(
+                "Slow SQL on {}: {:.1f} ms, params {}: {}",
+                endpoint,
+                slow.seconds * 1000,
+                slow.parameters,
+                slow.statement,
+            )
+        logger.info(
+            "SQL on {}: {} statements ({} distinct), {:.1f} ms",
+            endpoint,
+            profile.statements,
+            len(profile.shapes),
+            profile.seconds * 1000,
+        )
+
+    async def _explain_slow(self, endpoint: str, profile: QueryProfile) -> None:
+        for slow in profile.slow:
+            shape = statement_shape(slow.statement)
+            if shape in self._explained or not shape.upper().startswith(
+                ("SELECT", "WITH")
+            ):
+                continue
+            if len(self._explained) >= _MAX_EXPLAINED_SHAPES:
+                return
+            self._explained.add(shape)
+            try:
+                plan = await self.explain(slow.statement)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("EXPLAIN failed for slow SQL on {}: {}", endpoint, exc)
+                continue
+            logger.warning("Plan for slow SQL on {}:\n{}", endpoint, plan)
+
+    @classmethod
+    def _add_to_report(cls, endpoint: str, profile: QueryProfile) -> None:
+        entry = cls._report.setdefault(endpoint, EndpointReport())
+        entry.requests += 1
+        entry.statements += profile.statements
+        entry.max_statements = max(entry.max_statements, profile.statements)
+        entry.seconds += profile.seconds
+        top = max(profile.shapes.values(), key=lambda s: s.count, default=None)
+        if top is not None and top.count > entry.max_repeats:
+            entry.max_repeats = top.count
+            entry.worst_shape = top.shape
+
+    @classmethod
+    def report(cls) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint summary of sampled requests, most statements first."""
+        rows = sorted(
+            cls._report.items(),
+            key=lambda item: item[1].statements / item[1].requests,
+            reverse=True,
+        )
+        return {
+            endpoint: {
+                "requests": entry.requests,
+                "avg_statements": round(entry.statements / entry.requests, 1),
+                "max_statements": entry.max_statements,
+                "avg_db_ms": round(entry.seconds * 1000 / entry.requests, 1),
+                "max_repeats": entry.max_repeats,
+                "worst_shape": entry.worst_shape,
+            }
+            for endpoint, entry in rows
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._report.clear()
+        cls._explained.clear()
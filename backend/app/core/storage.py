@@ -1,99 +1,319 @@
 import asyncio
-import io
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import timedelta
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, Optional, Tuple
 
 from loguru import logger
-from minio import Minio
-from minio.error import S3Error
 
 from app.core.config import settings
+from app.core.executor import BoundedExecutor
+from app.core.metrics import STORAGE_OPERATION_DURATION, timed
+from app.core.tracing import traced
+
+if TYPE_CHECKING:
+    from minio import Minio
+
+# Blocking MinIO calls get their own threads so that a slow object store
+# queues (and eventually rejects) storage work instead of starving the
+# default executor used by everything else.
+storage_executor = BoundedExecutor(
+    "storage",
+    max_workers=settings.STORAGE_EXECUTOR_WORKERS,
+    max_queue=settings.STORAGE_EXECUTOR_QUEUE,
+    acquire_timeout=settings.STORAGE_EXECUTOR_ACQUIRE_TIMEOUT_SECONDS,
+)
+
+
+@dataclass
+class StoredObject:
+    object_name: str
+    size: int
+    sha256: str
+
+
+class HashingReader:
+    """
+    File-like wrapper that hashes and counts bytes as MinIO pulls them,
+    so the digest is ready without a second pass over the data.
+    """
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self._raw = raw
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self._digest.update(chunk)
+        self.size += len(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def hash_file(stream: BinaryIO, chunk_size: int = 1024 * 1024) -> Tuple[int, str]:
+    """
+    Returns (size, sha256) of a seekable stream and rewinds it afterwards.
+    """
+    reader = HashingReader(stream)
+    while reader.read(chunk_size):
+        pass
+    stream.seek(0)
+    return reader.size, reader.hexdigest()
 
 
 class StorageClient:
+    """
+    MinIO client wrapper. Nothing touches the network until first use:
+    the underlying client is built lazily and the bucket check runs from
+    the application lifespan instead of at import time.
+    """
+
     def __init__(self):
-        self.client = Minio(
+        self.bucket_name = settings.MINIO_BUCKET
+        self._client: Optional["Minio"] = None
+        self._client_lock = threading.Lock()
+        # (object name, expiry hours) -> (url, reuse deadline)
+        self._url_cache: "OrderedDict[Tuple[str, int], Tuple[str, float]]" = (
+            OrderedDict()
+        )
+
+    @property
+    def client(self) -> "Minio":
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    @staticmethod
+    def _create_client() -> "Minio":
+        # The SDK is imported here, on first use, to keep it out of the
+        # worker's startup path.
+        import certifi
+        import urllib3
+        from minio import Minio
+
+        # One pool shared by every worker thread; sized so that concurrent
+        # to_thread calls and multipart parts do not discard connections.
+        http_client = urllib3.PoolManager(
+            maxsize=settings.MINIO_MAX_CONNECTIONS,
+            timeout=urllib3.Timeout(
+                connect=settings.MINIO_CONNECT_TIMEOUT_SECONDS,
+                read=settings.MINIO_READ_TIMEOUT_SECONDS,
+            ),
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
+        return Minio(
             endpoint=f"{settings.MINIO_ENDPOINT}:{settings.MINIO_PORT}",
             access_key=settings.MINIO_ACCESS_KEY,
             secret_key=settings.MINIO_SECRET_KEY,
             secure=settings.MINIO_USE_SSL,
+            region=settings.MINIO_REGION,
+            http_client=http_client,
         )
-        self.bucket_name = settings.MINIO_BUCKET
-        self._ensure_bucket_exists()
 
-    def _ensure_bucket_exists(self):
+    @traced()
+    async def check_health(self) -> bool:
+        """
+        Verifies MinIO is reachable and the bucket exists, creating it if
+        needed. Never raises: an unavailable MinIO must not block startup.
+        """
         try:
-            if not self.client.bucket_exists(bucket_name=self.bucket_name):
+            return await asyncio.wait_for(
+                storage_executor.run(self._ensure_bucket_exists),
+                settings.MINIO_STARTUP_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "MinIO did not answer within {}s",
+                settings.MINIO_STARTUP_TIMEOUT_SECONDS,
+            )
+            return False
+
+    def _ensure_bucket_exists(self) -> bool:
+        from minio.error import S3Error
+
+        try:
+            with timed(STORAGE_OPERATION_DURATION, operation="bucket_exists"):
+                exists = self.client.bucket_exists(bucket_name=self.bucket_name)
+            if not exists:
                 self.client.make_bucket(bucket_name=self.bucket_name)
+            return True
         except S3Error as exc:
             logger.error("MinIO bucket error: {}", exc)
         except Exception as exc:  # noqa: BLE001
-            logger.exception("MinIO connection error: {}", exc)
-
-    async def upload_file(
-        self, file_data: bytes, filename: str, content_type: str
-    ) -> str:
-        """Uploads file to MinIO in a background thread and returns object name."""
-        return await asyncio.to_thread(
-            self._upload_file_sync,
-            file_data,
-            filename,
+            logger.error("MinIO connection error: {}", exc)
+        return False
+
+    @traced()
+    async def upload_stream(
+        self,
+        stream: BinaryIO,
+        object_name: str,
+        content_type: str,
+        length: Optional[int] = None,
+    ) -> StoredObject:
+        """
+        Streams a file-like object to MinIO with multipart upload in a
+        background thread, computing its SHA-256 on the fly.
+        """
+        return await storage_executor.run(
+            self._upload_stream_sync,
+            stream,
+            object_name,
             content_type,
+            length,
         )
 
-    def _upload_file_sync(
-        self, file_data: bytes, filename: str, content_type: str
-    ) -> str:
+    def _upload_stream_sync(
+        self,
+        stream: BinaryIO,
+        object_name: str,
+        content_type: str,
+        length: Optional[int],
+    ) -> StoredObject:
+        from minio.error import S3Error
+
+        reader = HashingReader(stream)
         try:
-            file_stream = io.BytesIO(file_data)
-            self.client.put_object(
-                self.bucket_name,
-                filename,
-                file_stream,
-                length=len(file_data),
-                content_type=content_type,
-            )
-            return filename
+            with timed(STORAGE_OPERATION_DURATION, operation="put_object"):
+                self.client.put_object(
+                    self.bucket_name,
+                    object_name,
+                    reader,
+                    length=length if length is not None else -1,
+                    content_type=content_type,
+                    part_size=settings.MINIO_UPLOAD_PART_SIZE,
+                    num_parallel_uploads=settings.MINIO_UPLOAD_PARALLELISM,
+                )
         except S3Error as exc:
             logger.error("MinIO upload error: {}", exc)
             raise
+        return StoredObject(
+            object_name=object_name, size=reader.size, sha256=reader.hexdigest()
+        )
 
     async def get_file_url(self, filename: str, expires_hours: int = 1) -> str:
         """Generates a presigned URL for the file."""
-        return await asyncio.to_thread(
-            self._get_file_url_sync,
-            filename,
-            expires_hours,
-        )
+        return self.presigned_url(filename, expires_hours)
+
+    @traced()
+    def presigned_url(self, object_name: str, expires_hours: int = 1) -> str:
+        """
+        Signing is a local HMAC, so it runs inline. URLs are reused for half
+        of their lifetime: every URL handed out stays valid for at least the
+        other half.
+        """
+        key = (object_name, expires_hours)
+        now = time.monotonic()
+        cached = self._url_cache.get(key)
+        if cached is not None and cached[1] > now:
+            self._url_cache.move_to_end(key)
+            return cached[0]
 
-    def _get_file_url_sync(self, filename: str, expires_hours: int) -> str:
         try:
-            return self.client.presigned_get_object(
+            url = self.client.presigned_get_object(
                 self.bucket_name,
-                filename,
+                object_name,
                 expires=timedelta(hours=expires_hours),
             )
         except Exception as exc:  # noqa: BLE001
             logger.error("MinIO presigned URL error: {}", exc)
             return ""
 
-    async def download_file(self, filename: str):
-        """Get file content stream via background thread."""
-        return await asyncio.to_thread(self._download_file_sync, filename)
+        self._url_cache[key] = (url, now + expires_hours * 3600 / 2)
+        self._url_cache.move_to_end(key)
+        if len(self._url_cache) > settings.MINIO_PRESIGN_CACHE_SIZE:
+            self._url_cache.popitem(last=False)
+        return url
+
+    @traced()
+    async def object_size(self, object_name: str) -> int:
+        stat = await storage_executor.run(self._stat_object_sync, object_name)
+        return stat.size
+
+    def _stat_object_sync(self, object_name: str):
+        with timed(STORAGE_OPERATION_DURATION, operation="stat_object"):
+            return self.client.stat_object(self.bucket_name, object_name)
+
+    @traced()
+    async def open_object(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        wait: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Opens the object (or a byte range of it) and returns an iterator over
+        its chunks. Only opening goes through executor admission, so await
+        this before the response starts: a saturated executor then becomes a
+        503 rather than a truncated body. Chunks are read one at a time in
+        the executor's threads without competing for admission again.
+        `wait` queues for a slot instead of failing, for opens that happen
+        after the response has started.
+        """
+        run = storage_executor.run_queued if wait else storage_executor.run
+        response = await run(self._get_object_sync, object_name, offset, length or 0)
+        return self._iter_chunks(response)
+
+    async def stream_object(
+        self, object_name: str, offset: int = 0, length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Opens the object on first iteration and yields its chunks; for
+        streams started mid-response, such as the entries of a ZIP export.
+        """
+        chunks = await self.open_object(object_name, offset, length, wait=True)
+        async for chunk in chunks:
+            yield chunk
+
+    @staticmethod
+    async def _iter_chunks(response) -> AsyncIterator[bytes]:
+        try:
+            chunks = response.stream(settings.MINIO_DOWNLOAD_CHUNK_SIZE)
+            while True:
+                chunk = await storage_executor.run_continuation(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
 
-    def _download_file_sync(self, filename: str):
+    def _get_object_sync(self, object_name: str, offset: int, length: int):
         try:
-            return self.client.get_object(self.bucket_name, filename)
+            # Time to first byte; the body is read chunk by chunk afterwards
+            with timed(STORAGE_OPERATION_DURATION, operation="get_object"):
+                return self.client.get_object(
+                    self.bucket_name, object_name, offset=offset, length=length
+                )
         except Exception as exc:  # noqa: BLE001
-            logger.exception("MinIO download error for {}: {}", filename, exc)
+            logger.exception("MinIO download error for {}: {}", object_name, exc)
             raise
 
+    @traced()
     async def delete_file(self, filename: str):
         """Delete file from MinIO asynchronously."""
-        await asyncio.to_thread(self._delete_file_sync, filename)
+        await storage_executor.run(self._delete_file_sync, filename)
 
     def _delete_file_sync(self, filename: str):
         try:
-            self.client.remove_object(self.bucket_name, filename)
+            with timed(STORAGE_OPERATION_DURATION, operation="remove_object"):
+                self.client.remove_object(self.bucket_name, filename)
         except Exception as exc:  # noqa: BLE001
             logger.exception("MinIO delete error for {}: {}", filename, exc)
             raise
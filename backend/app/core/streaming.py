@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import zipfile
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, Deque, Iterable, Optional, Tuple, Union
+from urllib.parse import quote
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single `Range: bytes=...` header into an inclusive (start, end)
+    pair. Returns None when the whole object should be served (no header,
+    unsupported unit, multiple ranges or malformed syntax, which RFC 9110
+    allows ignoring). Raises ValueError for unsatisfiable ranges.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, sep, end_text = header[len("bytes=") :].strip().partition("-")
+    if not sep or not (start_text or end_text):
+        return None
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # Suffix range: the last `end` bytes
+        if end == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - end, 0), size - 1
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def content_disposition(filename: str) -> str:
+    ascii_name = filename.encode("ascii", "replace").decode("ascii").replace('"', "")
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+@dataclass
+class ZipEntry:
+    name: str
+    open: Callable[[], AsyncIterator[bytes]]
+    size: Optional[int] = None
+    modified_at: Optional[datetime] = None
+
+
+class _ZipSink:
+    """Write-only buffer that zipfile treats as an unseekable stream."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer.extend(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class _Prefetch:
+    """Reads a chunk source into a bounded queue in a background task."""
+
+    def __init__(self, source: AsyncIterator[bytes], depth: int) -> None:
+        self._queue: asyncio.Queue[Union[bytes, BaseException, None]] = asyncio.Queue(
+            maxsize=depth
+        )
+        self._task = asyncio.create_task(self._fill(source))
+
+    async def _fill(self, source: AsyncIterator[bytes]) -> None:
+        try:
+            async for chunk in source:
+                await self._queue.put(chunk)
+        except Exception as exc:  # noqa: BLE001
+            await self._queue.put(exc)
+            return
+        await self._queue.put(None)
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def cancel(self) -> None:
+        self._task.cancel()
+
+
+def unique_names(names: Iterable[str]) -> Iterable[str]:
+    """Yields names with " (2)", " (3)"... suffixes for repeats."""
+    seen = {}
+    for name in names:
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        if count == 1:
+            yield name
+            continue
+        stem, dot, ext = name.rpartition(".")
+        yield f"{stem} ({count}).{ext}" if dot and stem else f"{name} ({count})"
+
+
+async def stream_zip(
+    entries: Iterable[ZipEntry], prefetch: int = 2, depth: int = 4
+) -> AsyncIterator[bytes]:
+    """
+    Produces a ZIP archive chunk by chunk. While one entry is written, up to
+    `prefetch` following entries are already being read, each buffering at
+    most `depth` chunks. Entries are stored uncompressed: tender documents
+    are mostly PDFs and images that do not shrink.
+    """
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    source = iter(entries)
+    pending: Deque[Tuple[ZipEntry, _Prefetch]] = deque()
+    current: Optional[_Prefetch] = None
+
+    def schedule(ahead: int) -> None:
+        while len(pending) < ahead:
+            entry = next(source, None)
+            if entry is None:
+                return
+            pending.append((entry, _Prefetch(entry.open(), depth)))
+
+    try:
+        schedule(prefetch + 1)
+        while pending:
+            entry, current = pending.popleft()
+            schedule(prefetch)
+            info = zipfile.ZipInfo(
+                entry.name,
+                date_time=(entry.modified_at or datetime.now()).timetuple()[:6],
+            )
+            if entry.size is not None:
+                info.file_size = entry.size
+            with archive.open(info, mode="w", force_zip64=entry.size is None) as dest:
+                async for chunk in current.chunks():
+                    dest.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Client went away or a read failed: stop background reads
+        if current is not None:
+            current.cancel()
+        for _, reader in pending:
+            reader.cancel()
@@ -0,0 +1,332 @@
+"""
+Lightweight tracing spans.
+
+A trace starts at a root span (normally one per request, from
+TracingMiddleware) and collects the spans opened below it with `span()` or
+`@traced()`. Finished traces go to a pluggable exporter; the built-in ones
+keep traces in memory or append them to a JSON lines file, so tracing works
+offline. Span, trace and parent ids follow the OpenTelemetry format, so an
+exporter can forward them to a collector unchanged.
+
+With sampling off, opening a span costs one context variable lookup.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import route_label
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    _started: float = field(default=0.0, repr=False)
+    _trace: List["Span"] = field(default_factory=list, repr=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanExporter:
+    """Receives each finished trace, root span last."""
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """Delivers whatever is still buffered; called once at app shutdown."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self, max_traces: int = 1000) -> None:
+        self._traces: Deque[List[Dict[str, Any]]] = deque(maxlen=max_traces)
+
+    def export(self, spans: List[Span]) -> None:
+        self._traces.append([span.to_dict() for span in spans])
+
+    def traces(self) -> List[List[Dict[str, Any]]]:
+        return list(self._traces)
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """
+    Appends one JSON line per trace. export() only queues the trace; a
+    background thread serializes and writes, so the event loop never waits
+    on the file. When the queue is full new traces are dropped.
+    """
+
+    def __init__(
+        self, path: str, max_pending: int = settings.TRACING_FILE_MAX_PENDING
+    ) -> None:
+        self.path = path
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(
+            max_pending
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait([span.to_dict() for span in spans])
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(
+                    "Trace writer backlog is full, {} traces dropped", self.dropped
+                )
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        self._thread = None
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-file-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [trace for trace in batch if trace is not None]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[List[Dict[str, Any]]]) -> None:
+        lines = "".join(json.dumps(trace, default=str) + "\n" for trace in batch)
+        try:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(lines)
+        except OSError as exc:
+            logger.warning(
+                "Failed to write {} traces to {}: {}", len(batch), self.path, exc
+            )
+
+
+class Tracer:
+    def __init__(self, sample_rate: float, exporter: SpanExporter) -> None:
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+
+def _build_exporter() -> SpanExporter:
+    if settings.TRACING_EXPORTER == "file":
+        return JsonFileSpanExporter(settings.TRACING_FILE)
+    return InMemorySpanExporter(settings.TRACING_MEMORY_TRACES)
+
+
+tracer = Tracer(settings.TRACING_SAMPLE_RATE, _build_exporter())
+
+# Marks the inside of a root that was not sampled, so that nested spans do
+# not start traces of their own.
+_UNSAMPLED = Span("unsampled", "", "", None, 0.0)
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _start(name: str, parent: Optional[Span], attributes: Dict[str, Any]) -> Span:
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        start_time=time.time(),
+        attributes=attributes,
+        _started=time.perf_counter(),
+    )
+    span._trace = parent._trace if parent else []
+    return span
+
+
+def _finish(span: Span, error: Optional[BaseException] = None) -> None:
+    span.duration_ms = (time.perf_counter() - span._started) * 1000
+    if error is not None:
+        span.error = type(error).__name__
+    span._trace.append(span)
+    if span.parent_id is None:
+        try:
+            tracer.exporter.export(span._trace)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to export trace {}: {}", span.trace_id, exc)
+
+
+def _may_record() -> bool:
+    parent = _current.get()
+    if parent is None:
+        return tracer.sample_rate > 0
+    return parent is not _UNSAMPLED
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Opens a span below the current one. Without a current span this starts
+    a new trace, subject to sampling. Yields None when not recording.
+    """
+    parent = _current.get()
+    if parent is _UNSAMPLED or (parent is None and tracer.sample_rate <= 0):
+        yield None
+        return
+    if parent is None and random.random() >= tracer.sample_rate:
+        token = _current.set(_UNSAMPLED)
+        try:
+            yield None
+        finally:
+            _current.reset(token)
+        return
+
+    current = _start(name, parent, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        _current.reset(token)
+        _finish(current, exc)
+        raise
+    _current.reset(token)
+    _finish(current)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorator: runs the function inside a span named after its qualified
+    name. Async generators get a span covering the whole iteration; it is
+    not made current, since the generator body runs in its caller's context.
+    """
+
+    def decorate(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def gen_wrapper(*args, **kwargs):
+                parent = _current.get()
+                current = None
+                if parent is not None and parent is not _UNSAMPLED:
+                    current = _start(span_name, parent, {})
+                inner = func(*args, **kwargs)
+                try:
+                    async for item in inner:
+                        yield item
+                except BaseException as exc:
+                    if current is not None:
+                        _finish(current, exc)
+                        current = None
+                    raise
+                finally:
+                    # Closing the wrapper early must close (and clean up)
+                    # the wrapped generator right away, not at collection.
+                    await inner.aclose()
+                    if current is not None:
+                        _finish(current)
+
+            return gen_wrapper  # type: ignore[return-value]
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _may_record():
+                    return await func(*args, **kwargs)
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            if not _may_record():
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return sync_wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class TracingMiddleware:
+    """Opens the root span of each request, named after its route."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with span("http.request", **{"http.method": scope["method"]}) as root:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if root is not None:
+                    route = route_label(scope)
+                    root.name = f"{scope['method']} {route}"
+                    root.set_attribute("http.route", route)
+                    root.set_attribute("http.status_code", status)
@@ -1,4 +1,5 @@
 from app.db.session import Base  # noqa
+from app.db.table_versions import TableVersion  # noqa
 from app.modules.auth.models.user import User  # noqa
 from app.modules.pricing_kb_ai.models.nomenclature import Nomenclature  # noqa
 from app.modules.pricing_kb_ai.models.nomenclature_card_metadata import (  # noqa
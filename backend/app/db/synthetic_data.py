@@ -0,0 +1,806 @@
+"""
+Deterministic synthetic dataset at production scale.
+
+Builds a classifier tree (segments > families > classes > categories) with
+published class schemas and attribute presets, cards with attributes,
+synonyms, usage and embeddings, and tenders with positions, files and
+audit logs. The same seed and scale always produce the same rows, so
+load-test results from different runs and machines are comparable.
+
+Embeddings come from FakeEmbedder (hashed character trigrams), so similar
+names get similar vectors without calling the embeddings provider. Files
+only exist as rows: downloads of synthetic files fail in MinIO.
+
+Expects migrations applied and refuses to run twice on the same database:
+
+    python -m app.db.synthetic_data --scale small
+    python -m app.db.synthetic_data --scale full --seed 42
+
+"full" is about 4.7k nodes, 500k cards and 50k tenders; with an embedding
+on every card expect several GB of table data and a long run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+import app.db.base  # noqa: F401
+from app.db.init_db import init_stages, init_transitions, init_users
+from app.db.session import AsyncSessionLocal, engine
+from app.modules.auth.models.user import User
+from app.modules.pricing_kb_ai.enums import (
+    LifecycleStatus,
+    NodeStatus,
+    NodeType,
+    PresetMode,
+    SchemaStatus,
+)
+from app.modules.pricing_kb_ai.models.nomenclature import Nomenclature
+from app.modules.pricing_kb_ai.models.nomenclature_card_metadata import (
+    NomenclatureCardSynonym,
+    NomenclatureCardUsage,
+)
+from app.modules.pricing_kb_ai.models.nomenclature_node import NomenclatureNode
+from app.modules.pricing_kb_ai.models.nomenclature_schema import (
+    ClassSchemaPreset,
+    NomenclatureAttributePreset,
+    NomenclatureClassSchema,
+)
+from app.modules.tender_management.enums import (
+    FileCategory,
+    PositionStatus,
+    StageCode,
+    TenderSource,
+)
+from app.modules.tender_management.models.audit import AuditLog
+from app.modules.tender_management.models.position import Position
+from app.modules.tender_management.models.tender import FileBlob, Tender, TenderFile
+from app.modules.tender_management.services.file_service import FileService
+
+MARKER = "SYN"
+BATCH_SIZE = 2000
+EMBEDDING_DIMENSIONS = Nomenclature.__table__.c.ai_embedding.type.dim
+# Every timestamp is relative to this instant, not to now()
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class Scale:
+    segments: int
+    families_per_segment: int
+    classes_per_family: int
+    categories_per_class: int
+    cards: int
+    tenders: int
+    positions_per_tender: int = 8
+    files_per_tender: int = 3
+    audit_per_tender: int = 5
+    synonyms_per_card: int = 2
+    # Share of positions linked to a card (and counted in card usage)
+    matched_positions: float = 0.6
+    embedding_share: float = 1.0
+
+
+SCALES = {
+    "small": Scale(4, 3, 3, 3, cards=5_000, tenders=500),
+    "medium": Scale(8, 6, 5, 5, cards=50_000, tenders=5_000),
+    "full": Scale(12, 8, 6, 7, cards=500_000, tenders=50_000),
+}
+
+
+def _uniform(low: float, high: float, digits: int = 1):
+    return lambda rng: round(rng.uniform(low, high), digits)
+
+
+# json schema and value generator per attribute; enums without a generator
+# pick one of their values
+ATTRIBUTES: Dict[str, Tuple[Dict[str, Any], Any]] = {
+    "power_kw": ({"type": "number", "minimum": 0}, _uniform(0.25, 315)),
+    "voltage_v": ({"type": "integer", "enum": [220, 380, 660, 6000]}, None),
+    "ip_rating": ({"type": "string", "enum": ["IP54", "IP55", "IP65", "IP67"]}, None),
+    "rpm": ({"type": "integer", "enum": [750, 1000, 1500, 3000]}, None),
+    "dn": ({"type": "integer", "enum": [15, 25, 50, 80, 100, 150, 200, 300]}, None),
+    "pn": ({"type": "number", "enum": [1.6, 2.5, 4.0, 6.3, 10.0, 16.0]}, None),
+    "material": (
+        {"type": "string", "enum": ["сталь 20", "09Г2С", "12Х18Н10Т", "чугун СЧ20"]},
+        None,
+    ),
+    "ratio": ({"type": "number", "minimum": 1}, _uniform(2, 200)),
+    "torque_nm": ({"type": "number", "minimum": 0}, _uniform(50, 25_000, 0)),
+    "weight_kg": ({"type": "number", "minimum": 0}, _uniform(0.5, 4_000)),
+    "length_mm": ({"type": "integer", "minimum": 1}, lambda rng: rng.randint(50, 6000)),
+    "climate": ({"type": "string", "enum": ["У1", "УХЛ1", "Т2", "ХЛ1"]}, None),
+    "explosion_proof": ({"type": "boolean"}, lambda rng: rng.random() < 0.2),
+    "medium": ({"type": "string", "enum": ["вода", "нефть", "газ", "пар"]}, None),
+}
+
+PRESETS: Dict[str, Tuple[str, List[str]]] = {
+    "electrical": ("Электрические параметры", ["power_kw", "voltage_v", "rpm"]),
+    "protection": ("Степень защиты", ["ip_rating", "explosion_proof"]),
+    "pipeline": ("Трубопроводная арматура", ["dn", "pn", "medium"]),
+    "transmission": ("Передаточные механизмы", ["ratio", "torque_nm"]),
+    "dimensions": ("Габариты и масса", ["weight_kg", "length_mm"]),
+    "climate": ("Климатическое исполнение", ["climate"]),
+    "materials": ("Материал исполнения", ["material"]),
+}
+
+# Segment title, card noun and card kinds
+SEGMENTS = [
+    ("Редукторы", "Редуктор", ["цилиндрический", "червячный", "планетарный"]),
+    ("Электродвигатели", "Электродвигатель", ["асинхронный", "крановый", "с тормозом"]),
+    ("Задвижки", "Задвижка", ["клиновая", "шиберная", "с электроприводом"]),
+    ("Насосы", "Насос", ["центробежный", "винтовой", "погружной"]),
+    ("Клапаны", "Клапан", ["обратный", "предохранительный", "регулирующий"]),
+    ("Муфты", "Муфта", ["зубчатая", "упругая втулочно-пальцевая", "кулачковая"]),
+    ("Подшипники", "Подшипник", ["шариковый", "роликовый", "упорный"]),
+    ("Компрессоры", "Компрессор", ["поршневой", "винтовой", "мембранный"]),
+    ("Кабели", "Кабель", ["силовой", "контрольный", "бронированный"]),
+    ("Трансформаторы", "Трансформатор", ["масляный", "сухой", "измерительный"]),
+    ("Датчики", "Датчик", ["давления", "температуры", "расхода"]),
+    ("Фильтры", "Фильтр", ["сетчатый", "магнитный", "масляный"]),
+]
+MANUFACTURERS = [
+    "Уралредуктор",
+    "Элсиб",
+    "Пензтяжпромарматура",
+    "Гидромаш",
+    "ЛМЗ",
+    "Сибэлектромотор",
+    "Бирюсинск",
+    "Завод Арматуры",
+    "SEW-Eurodrive",
+    "Siemens",
+    "Danfoss",
+    "ABB",
+]
+STANDARDS = ["ГОСТ 5762-2002", "ГОСТ Р 51330.0", "ТУ 3600-001", "ГОСТ 31441.1", None]
+CUSTOMER_KINDS = ["ООО", "АО", "ПАО", "ЗАО", "МУП"]
+CUSTOMER_WORDS = [
+    "Завод Механики",
+    "Нефтегаз",
+    "Горнодобывающая компания",
+    "Энергосбыт",
+    "Водоканал",
+    "Металлургический комбинат",
+    "Теплосеть",
+    "Химпром",
+    "Северсталь-Сервис",
+    "Транснефть-Урал",
+]
+STAGE_WEIGHTS = {
+    StageCode.DISCOVERED: 20,
+    StageCode.REVIEWING: 15,
+    StageCode.IN_PROGRESS: 12,
+    StageCode.CALCULATING: 10,
+    StageCode.PREPARING_DOCS: 8,
+    StageCode.SUBMITTED: 8,
+    StageCode.AWAITING_RESULTS: 7,
+    StageCode.WON: 8,
+    StageCode.LOST: 8,
+    StageCode.CANCELLED: 4,
+}
+
+
+class FakeEmbedder:
+    """
+    Local stand-in for the embeddings provider: each character trigram of
+    the text sets one signed dimension, then the vector is normalized, so
+    names sharing words are close in cosine distance.
+    """
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS) -> None:
+        self.dimensions = dimensions
+
+    def embed(self, value: str) -> List[float]:
+        padded = f"  {value.lower()} "
+        weights: Dict[int, float] = {}
+        for i in range(len(padded) - 2):
+            digest = hashlib.blake2b(padded[i : i + 3].encode(), digest_size=8)
+            bucket = int.from_bytes(digest.digest(), "little")
+            index = bucket % self.dimensions
+            sign = 1.0 if bucket >> 63 else -1.0
+            weights[index] = weights.get(index, 0.0) + sign
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vector = [0.0] * self.dimensions
+        for index, weight in weights.items():
+            vector[index] = round(weight / norm, 6)
+        return vector
+
+
+@dataclass
+class ClassifierNode:
+    id: int
+    code: str
+    name: str
+    node_type: NodeType
+    depth: int
+    parent_id: Optional[int]
+    segment: int
+    attributes: Tuple[str, ...] = ()
+
+
+class SyntheticDataset:
+    """
+    Row generators for every table. Each section draws from its own
+    random stream, so changing the size of one section leaves the others
+    unchanged. Ids start after the given offsets.
+    """
+
+    def __init__(
+        self,
+        scale: Scale,
+        seed: int = 42,
+        offsets: Optional[Dict[str, int]] = None,
+        user_id: Optional[Any] = None,
+    ) -> None:
+        self.scale = scale
+        self.seed = seed
+        self.offsets = offsets or {}
+        self.user_id = user_id
+        self.embedder = FakeEmbedder()
+        self.nodes = self._build_tree()
+        self.categories = [n for n in self.nodes if n.node_type == NodeType.CATEGORY]
+
+    def _rng(self, section: str) -> random.Random:
+        return random.Random(f"{self.seed}:{section}")
+
+    def _id(self, table: str, index: int) -> int:
+        return self.offsets.get(table, 0) + index + 1
+
+    @staticmethod
+    def _at(rng: random.Random, days_back: int) -> datetime:
+        return EPOCH - timedelta(seconds=rng.randrange(days_back * 86400))
+
+    # Classifier
+
+    def _build_tree(self) -> List[ClassifierNode]:
+        rng = self._rng("tree")
+        scale = self.scale
+        nodes: List[ClassifierNode] = []
+
+        def add(code, name, node_type, depth, parent, segment, attributes=()):
+            node = ClassifierNode(
+                id=self._id("nomenclature_nodes", len(nodes)),
+                code=code,
+                name=name,
+                node_type=node_type,
+                depth=depth,
+                parent_id=parent.id if parent else None,
+                segment=segment,
+                attributes=attributes,
+            )
+            nodes.append(node)
+            return node
+
+        for s in range(scale.segments):
+            title = SEGMENTS[s % len(SEGMENTS)][0]
+            segment = add(f"Y{s + 1:02d}", title, NodeType.SEGMENT, 0, None, s)
+            for f in range(scale.families_per_segment):
+                family = add(
+                    f"{segment.code}.F{f + 1:02d}",
+                    f"{title}, группа {f + 1}",
+                    NodeType.FAMILY,
+                    1,
+                    segment,
+                    s,
+                )
+                for c in range(scale.classes_per_family):
+                    attributes = tuple(sorted(rng.sample(list(ATTRIBUTES), 4)))
+                    klass = add(
+                        f"{family.code}.C{c + 1:02d}",
+                        f"{family.name}, класс {c + 1}",
+                        NodeType.CLASS,
+                        2,
+                        family,
+                        s,
+                        attributes,
+                    )
+                    for k in range(scale.categories_per_class):
+                        add(
+                            f"{klass.code}.K{k + 1:02d}",
+                            f"{klass.name}, категория {k + 1}",
+                            NodeType.CATEGORY,
+                            3,
+                            klass,
+                            s,
+                            attributes,
+                        )
+        return nodes
+
+    def node_rows(self) -> Iterator[Dict[str, Any]]:
+        for node in self.nodes:
+            yield {
+                "id": node.id,
+                "parent_id": node.parent_id,
+                "code": node.code,
+                "name": node.name,
+                "node_type": node.node_type.value,
+                "depth": node.depth,
+                "version": 1,
+                "effective_from": EPOCH - timedelta(days=730),
+                "status": NodeStatus.ACTIVE.value,
+                "is_archived": False,
+                "metadata": {"source": MARKER},
+            }
+
+    def preset_rows(self) -> Iterator[Dict[str, Any]]:
+        for index, (code, (title, attributes)) in enumerate(PRESETS.items()):
+            yield {
+                "id": self._id("nomenclature_attribute_presets", index),
+                "code": f"{MARKER.lower()}-{code}",
+                "title": title,
+                "json_schema": {
+                    "type": "object",
+                    "properties": {name: ATTRIBUTES[name][0] for name in attributes},
+                },
+                "version": 1,
+                "status": SchemaStatus.PUBLISHED.value,
+                "description": f"{title} (synthetic)",
+                "created_at": EPOCH - timedelta(days=730),
+            }
+
+    def _class_presets(self, node: ClassifierNode) -> List[str]:
+        return [
+            code
+            for code, (_, attributes) in PRESETS.items()
+            if set(attributes) & set(node.attributes)
+        ]
+
+    def schema_rows(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("schemas")
+        classes = [n for n in self.nodes if n.node_type == NodeType.CLASS]
+        for index, node in enumerate(classes):
+            own = [a for a in node.attributes if not self._class_presets_cover(a, node)]
+            yield {
+                "id": self._id("nomenclature_class_schema", index),
+                "node_id": node.id,
+                "version": 1,
+                "status": SchemaStatus.PUBLISHED.value,
+                "json_schema": {
+                    "type": "object",
+                    "properties": {name: ATTRIBUTES[name][0] for name in own},
+                    "required": list(node.attributes[: rng.randint(1, 2)]),
+                },
+                "metadata": {"source": MARKER},
+                "comment": "synthetic",
+                "published_at": EPOCH - timedelta(days=700),
+                "created_by_id": self.user_id,
+                "created_at": EPOCH - timedelta(days=700),
+            }
+
+    def _class_presets_cover(self, attribute: str, node: ClassifierNode) -> bool:
+        return any(attribute in PRESETS[code][1] for code in self._class_presets(node))
+
+    def schema_preset_rows(self) -> Iterator[Dict[str, Any]]:
+        preset_ids = {
+            code: self._id("nomenclature_attribute_presets", index)
+            for index, code in enumerate(PRESETS)
+        }
+        classes = [n for n in self.nodes if n.node_type == NodeType.CLASS]
+        for index, node in enumerate(classes):
+            for code in self._class_presets(node):
+                yield {
+                    "class_schema_id": self._id("nomenclature_class_schema", index),
+                    "preset_id": preset_ids[code],
+                    "mode": PresetMode.INCLUDE.value,
+                }
+
+    # Cards
+
+    def _attribute_values(self, rng: random.Random, node: ClassifierNode) -> dict:
+        values = {}
+        for name in node.attributes:
+            schema, generate = ATTRIBUTES[name]
+            values[name] = generate(rng) if generate else rng.choice(schema["enum"])
+        return values
+
+    def card_rows(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("cards")
+        for index in range(self.scale.cards):
+            node = rng.choice(self.categories)
+            title, noun, kinds = SEGMENTS[node.segment % len(SEGMENTS)]
+            kind = rng.choice(kinds)
+            attributes = self._attribute_values(rng, node)
+            label = " ".join(
+                str(value)
+                for value in list(attributes.values())[:2]
+                if not isinstance(value, bool)
+            )
+            name = f"{noun} {kind} {label}".strip()
+            created_at = self._at(rng, 720)
+            price = Decimal(rng.randint(50_000, 250_000_000)).scaleb(-2)
+            lifecycle = rng.choices(list(LifecycleStatus), weights=[10, 5, 80, 5], k=1)[
+                0
+            ]
+            embedding = None
+            if rng.random() < self.scale.embedding_share:
+                embedding = self.embedder.embed(name)
+            segment_code, family_code, class_code, _ = node.code.split(".")
+            yield {
+                "id": self._id("nomenclatures", index),
+                "code": f"{MARKER}-{index + 1:07d}",
+                "canonical_name": name[:255],
+                "node_id": node.id,
+                "node_version": 1,
+                "segment_code": segment_code,
+                "family_code": f"{segment_code}.{family_code}",
+                "class_code": f"{segment_code}.{family_code}.{class_code}",
+                "category_code": node.code,
+                "lifecycle_status": lifecycle.value,
+                "effective_from": created_at,
+                "attributes_payload": attributes,
+                "files": [],
+                "methodology_ids": rng.sample(range(1, 40), rng.randint(0, 3)),
+                "manufacturer": rng.choice(MANUFACTURERS),
+                "standard_document": rng.choice(STANDARDS),
+                "article": f"{rng.randint(100, 999)}-{rng.randint(1000, 99999)}",
+                "type": title,
+                "category": kind,
+                "standard_parameters": {},
+                "required_parameters": {},
+                "optional_parameters": {},
+                "synonyms": {},
+                "keywords": {},
+                "tags": {"source": MARKER},
+                "base_price": price,
+                "cost_price": (price * Decimal("0.8")).quantize(Decimal("0.01")),
+                "price_currency": "RUB",
+                "price_source": rng.choice(["manual", "calculation", "supplier"]),
+                "price_valid_until": created_at + timedelta(days=180),
+                "price_confidence": Decimal(rng.randint(50, 99)) / 100,
+                "related_nomenclature_ids": [],
+                "usage_count": 0,
+                "ai_embedding": embedding,
+                "is_active": lifecycle != LifecycleStatus.ARCHIVED,
+                "version": 1,
+                "created_by_id": self.user_id,
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(days=rng.randint(0, 60)),
+            }
+
+    def synonym_rows(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("synonyms")
+        for index in range(self.scale.cards):
+            card_id = self._id("nomenclatures", index)
+            for n in range(self.scale.synonyms_per_card):
+                locale = "ru-RU" if n % 2 == 0 else "en-US"
+                yield {
+                    "card_id": card_id,
+                    "value": f"{MARKER}-{index + 1:07d} вар. {rng.randint(1, 99)}",
+                    "locale": locale,
+                }
+
+    # Tenders
+
+    def tender_rows(self, stage_ids: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("tenders")
+        stages = list(STAGE_WEIGHTS)
+        weights = list(STAGE_WEIGHTS.values())
+        sources = list(TenderSource)
+        for index in range(self.scale.tenders):
+            title, _, kinds = rng.choice(SEGMENTS)
+            customer = (
+                f"{rng.choice(CUSTOMER_KINDS)} '{rng.choice(CUSTOMER_WORDS)}"
+                f" {rng.randint(1, 300)}'"
+            )
+            created_at = self._at(rng, 730)
+            yield {
+                "id": self._id("tenders", index),
+                "number": f"{MARKER}-{created_at.year}-{index + 1:06d}",
+                "title": f"Поставка: {title.lower()}, {rng.choice(kinds)}",
+                "description": f"Синтетический тендер №{index + 1}",
+                "customer": customer,
+                "source": rng.choice(sources).value,
+                "source_url": None,
+                "deadline_at": created_at + timedelta(days=rng.randint(3, 45)),
+                "published_at": created_at,
+                "initial_max_price": Decimal(rng.randint(50_000, 90_000_000)),
+                "currency": "RUB",
+                "terms": {
+                    "payment_terms": rng.choice(
+                        ["30% аванс, 70% перед отгрузкой", "100% постоплата 30 дней"]
+                    ),
+                    "validity_days": rng.choice([14, 30, 60]),
+                },
+                "stage_id": stage_ids[rng.choices(stages, weights=weights, k=1)[0]],
+                "responsible_id": rng.randint(1, 40),
+                "engineer_id": rng.randint(1, 40),
+                "is_archived": rng.random() < 0.1,
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(days=rng.randint(0, 30)),
+            }
+
+    def position_rows(self) -> Iterator[Dict[str, Any]]:
+        """Positions, with the card usage row of each matched one."""
+        rng = self._rng("positions")
+        statuses = list(PositionStatus)
+        index = 0
+        for t in range(self.scale.tenders):
+            tender_id = self._id("tenders", t)
+            for _ in range(rng.randint(1, 2 * self.scale.positions_per_tender - 1)):
+                card_id = None
+                if rng.random() < self.scale.matched_positions:
+                    card_id = self._id("nomenclatures", rng.randrange(self.scale.cards))
+                quantity = Decimal(rng.randint(1, 50))
+                price = Decimal(rng.randint(1_000, 3_000_000))
+                yield {
+                    "id": self._id("positions", index),
+                    "tender_id": tender_id,
+                    "name": f"Позиция {index + 1}",
+                    "quantity": quantity,
+                    "unit": rng.choice(["шт", "компл", "м"]),
+                    "nomenclature_id": card_id,
+                    "status": rng.choice(statuses).value,
+                    "price_per_unit": price,
+                    "total_price": price * quantity,
+                    "currency": "RUB",
+                    "last_used_at": self._at(rng, 365),
+                }
+                index += 1
+
+    def file_rows(
+        self,
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """Tender files, each with its blob row when the blob is new."""
+        rng = self._rng("files")
+        # A few documents (templates, standard forms) recur across tenders
+        shared = [f"{rng.getrandbits(256):064x}" for _ in range(20)]
+        seen = set()
+        index = 0
+        for t in range(self.scale.tenders):
+            tender_id = self._id("tenders", t)
+            for _ in range(rng.randint(0, 2 * self.scale.files_per_tender)):
+                if rng.random() < 0.15:
+                    sha256 = rng.choice(shared)
+                else:
+                    sha256 = f"{rng.getrandbits(256):064x}"
+                size = 20_000 + int(sha256[:8], 16) % 30_000_000
+                blob = None
+                if sha256 not in seen:
+                    seen.add(sha256)
+                    blob = {
+                        "sha256": sha256,
+                        "object_name": FileService.blob_object_name(sha256),
+                        "size": size,
+                        "content_type": "application/pdf",
+                        "ref_count": 0,
+                    }
+                yield {
+                    "id": self._id("tender_files", index),
+                    "tender_id": tender_id,
+                    "filename": f"документ_{index + 1}.pdf",
+                    "file_path": FileService.blob_object_name(sha256),
+                    "category": rng.choice(list(FileCategory)).value,
+                    "size": size,
+                    "sha256": sha256,
+                    "uploaded_by_id": self.user_id,
+                    "uploaded_at": self._at(rng, 730),
+                    "is_archived": False,
+                }, blob
+                index += 1
+
+    def audit_rows(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("audit")
+        actions = ["stage_changed", "file_uploaded", "position_added", "updated"]
+        for t in range(self.scale.tenders):
+            tender_id = self._id("tenders", t)
+            for _ in range(rng.randint(1, 2 * self.scale.audit_per_tender - 1)):
+                action = rng.choice(actions)
+                yield {
+                    "tender_id": tender_id,
+                    "entity_type": "tender",
+                    "entity_id": tender_id,
+                    "user_id": self.user_id,
+                    "action": action,
+                    "details": {"source": MARKER, "action": action},
+                    "created_at": self._at(rng, 730),
+                }
+
+
+def _batches(rows: Iterable[Any], size: int = BATCH_SIZE) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+SEQUENCE_TABLES = (
+    "nomenclature_nodes",
+    "nomenclature_attribute_presets",
+    "nomenclature_class_schema",
+    "nomenclatures",
+    "tenders",
+    "positions",
+    "tender_files",
+)
+
+
+class SyntheticDataWriter:
+    def __init__(self, conn: AsyncConnection) -> None:
+        self.conn = conn
+
+    async def insert(self, table, rows: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        started = time.perf_counter()
+        for batch in _batches(rows):
+            await self.conn.execute(table.__table__.insert(), batch)
+            await self.conn.commit()
+            count += len(batch)
+        logger.info(
+            "{}: {} rows in {:.1f}s",
+            table.__tablename__,
+            count,
+            time.perf_counter() - started,
+        )
+        return count
+
+    async def write(self, dataset: SyntheticDataset, stage_ids: Dict[str, int]) -> None:
+        await self.insert(NomenclatureNode, dataset.node_rows())
+        await self.insert(NomenclatureAttributePreset, dataset.preset_rows())
+        await self.insert(NomenclatureClassSchema, dataset.schema_rows())
+        await self.insert(ClassSchemaPreset, dataset.schema_preset_rows())
+        await self.insert(Nomenclature, dataset.card_rows())
+        await self.insert(NomenclatureCardSynonym, dataset.synonym_rows())
+        await self.insert(Tender, dataset.tender_rows(stage_ids))
+        await self._write_positions(dataset)
+        await self._write_files(dataset)
+        await self.insert(AuditLog, dataset.audit_rows())
+        await self._finish()
+
+    async def _write_positions(self, dataset: SyntheticDataset) -> None:
+        def positions():
+            for row in dataset.position_rows():
+                yield {k: v for k, v in row.items() if k != "last_used_at"}
+
+        def usage():
+            # Same stream again: the generator is deterministic
+            for row in dataset.position_rows():
+                if row["nomenclature_id"] is not None:
+                    yield {
+                        "card_id": row["nomenclature_id"],
+                        "position_id": row["id"],
+                        "usage_count": 1,
+                        "average_price": row["price_per_unit"],
+                        "last_used_at": row["last_used_at"],
+                    }
+
+        await self.insert(Position, positions())
+        await self.insert(NomenclatureCardUsage, usage())
+
+    async def _write_files(self, dataset: SyntheticDataset) -> None:
+        await self.insert(
+            FileBlob, (blob for _, blob in dataset.file_rows() if blob is not None)
+        )
+        await self.insert(TenderFile, (row for row, _ in dataset.file_rows()))
+
+    async def _finish(self) -> None:
+        started = time.perf_counter()
+        await self.conn.execute(
+            text(
+                """
+                UPDATE file_blobs b SET ref_count = f.refs
+                FROM (
+                    SELECT sha256, count(*) AS refs FROM tender_files
+                    WHERE sha256 IS NOT NULL GROUP BY sha256
+                ) f
+                WHERE b.sha256 = f.sha256
+                """
+            )
+        )
+        await self.conn.execute(
+            text(
+                f"""
+                UPDATE nomenclatures n
+                SET usage_count = u.uses, average_price = u.avg_price
+                FROM (
+                    SELECT card_id, count(*) AS uses,
+                           round(avg(average_price), 2) AS avg_price
+                    FROM nomenclature_card_usage GROUP BY card_id
+                ) u
+                WHERE n.id = u.card_id AND n.code LIKE '{MARKER}-%'
+                """
+            )
+        )
+        # Explicit ids were inserted: move sequences past them
+        for table in SEQUENCE_TABLES:
+            await self.conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT coalesce(max(id), 1) FROM {table}))"
+                )
+            )
+        await self.conn.commit()
+        for table in SEQUENCE_TABLES + ("nomenclature_card_usage", "audit_logs"):
+            await self.conn.execute(text(f"ANALYZE {table}"))
+        await self.conn.commit()
+        logger.info(
+            "Aggregates and statistics in {:.1f}s", time.perf_counter() - started
+        )
+
+
+async def _offsets(conn: AsyncConnection) -> Dict[str, int]:
+    offsets = {}
+    for table in SEQUENCE_TABLES:
+        result = await conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}"))
+        offsets[table] = result.scalar_one()
+    return offsets
+
+
+async def generate(scale: Scale, seed: int) -> None:
+    async with AsyncSessionLocal() as db:
+        stages = await init_stages(db)
+        await init_transitions(db, stages)
+        await init_users(db)
+        admin_id = (
+            await db.execute(select(User.id).where(User.email == "admin@example.com"))
+        ).scalar_one()
+        stage_ids = {code: stage.id for code, stage in stages.items()}
+
+    async with engine.connect() as conn:
+        existing = await conn.execute(
+            select(func.count())
+            .select_from(Tender)
+            .where(Tender.number.like(f"{MARKER}-%"))
+        )
+        if existing.scalar_one():
+            raise SystemExit("Synthetic data is already present in this database")
+
+        dataset = SyntheticDataset(
+            scale, seed=seed, offsets=await _offsets(conn), user_id=admin_id
+        )
+        logger.info(
+            "Generating seed={} nodes={} cards={} tenders={}",
+            seed,
+            len(dataset.nodes),
+            scale.cards,
+            scale.tenders,
+        )
+        started = time.perf_counter()
+        await SyntheticDataWriter(conn).write(dataset, stage_ids)
+        logger.info(
+            "Synthetic dataset written in {:.0f}s", time.perf_counter() - started
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cards", type=int, help="override the scale's card count")
+    parser.add_argument("--tenders", type=int, help="override the tender count")
+    parser.add_argument(
+        "--embedding-share",
+        type=float,
+        help="share of cards that get an embedding (0..1)",
+    )
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]
+    overrides = {
+        "cards": args.cards,
+        "tenders": args.tenders,
+        "embedding_share": args.embedding_share,
+    }
+    scale = replace(scale, **{k: v for k, v in overrides.items() if v is not None})
+    asyncio.run(generate(scale, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,82 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from loguru import logger
 
+from app.api import deps
 from app.api.v1.api import api_router
+from app.core import metrics, sql_profiler, tracing
 from app.core.config import settings
+from app.core.executor import ExecutorSaturatedError
+from app.core.redis import breaker as redis_breaker
+from app.core.redis import close_redis
+from app.core.security import password_executor
+from app.core.storage import storage, storage_executor
+from app.db.session import AsyncReadSessionLocal, pool_stats, prefill_pools, read_engine
+from app.modules.pricing_kb_ai.services.schema_registry import SchemaRegistry
+from app.modules.tender_management.services.audit_writer import audit_writer
+
+
+async def _warm_schema_cache() -> int:
+    async with AsyncReadSessionLocal() as db:
+        return await SchemaRegistry.warm(db, settings.STARTUP_SCHEMA_WARM_LIMIT)
+
+
+async def warm_up() -> None:
+    """
+    Gets the worker ready before it takes traffic: storage check, pool
+    prefill and schema cache run side by side, each bounded by the timeout.
+    A failed or slow step is logged and skipped, never fatal.
+    """
+    started = time.perf_counter()
+    steps = {
+        "storage": storage.check_health(),
+        "db_pool": prefill_pools(settings.STARTUP_DB_POOL_PREFILL),
+        "schemas": _warm_schema_cache(),
+    }
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(step, settings.STARTUP_WARMUP_TIMEOUT_SECONDS)
+            for step in steps.values()
+        ),
+        return_exceptions=True,
+    )
+    outcome = dict(zip(steps, results))
+    for name, result in outcome.items():
+        if isinstance(result, BaseException):
+            logger.warning("Warm-up step {} failed: {!r}", name, result)
+            outcome[name] = 0
+    if outcome["storage"] is not True:
+        logger.warning("Starting without MinIO, file operations will fail")
+    logger.info(
+        "Warm-up done in {:.0f} ms: {} pool connections, {} schemas",
+        (time.perf_counter() - started) * 1000,
+        outcome["db_pool"],
+        outcome["schemas"],
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.AUDIT_BUFFERED_WRITES:
+        await audit_writer.start()
+    await warm_up()
+    yield
+    await audit_writer.stop()
+    storage_executor.shutdown()
+    password_executor.shutdown()
+    await close_redis()
+    tracing.tracer.exporter.shutdown()
+    metrics.mark_process_dead()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
@@ -21,12 +92,74 @@
         allow_headers=["*"],
     )
 
+if settings.PROMETHEUS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware, pool_stats=pool_stats)
+
+if settings.TRACING_SAMPLE_RATE > 0:
+    app.add_middleware(tracing.TracingMiddleware)
+
+# Outermost, so explain plans fetched after the response are not counted
+# in the request's latency and SQL metrics.
+if settings.SQL_PROFILER_SAMPLE_RATE > 0:
+    app.add_middleware(
+        sql_profiler.SqlProfilerMiddleware,
+        sample_rate=settings.SQL_PROFILER_SAMPLE_RATE,
+        repeat_threshold=settings.SQL_PROFILER_REPEAT_THRESHOLD,
+        slow_statement_ms=settings.SQL_PROFILER_SLOW_STATEMENT_MS,
+        explain=(
+            sql_profiler.make_explainer(read_engine)
+            if settings.SQL_PROFILER_EXPLAIN
+            else None
+        ),
+    )
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
+
+
 @app.get("/health")
 async def health_check():
-    return {"status": "ok", "version": "0.1.0"}
+    return {
+        "status": "ok",
+        "version": "0.1.0",
+        "db_pools": pool_stats(),
+        "redis": redis_breaker.stats(),
+        "executors": {
+            "storage": storage_executor.stats(),
+            "password": password_executor.stats(),
+        },
+    }
+
+
+if settings.PROMETHEUS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        payload, content_type = metrics.render()
+        return Response(content=payload, media_type=content_type)
+
+
+if settings.DEBUG:
+    # SQL text and trace attributes can carry request data, so even in
+    # debug builds only superusers may read them.
+    debug_access = [Depends(deps.get_current_active_superuser)]
+
+    @app.get("/debug/sql-report", include_in_schema=False, dependencies=debug_access)
+    async def sql_report():
+        return sql_profiler.SqlProfilerMiddleware.report()
+
+    @app.get("/debug/traces", include_in_schema=False, dependencies=debug_access)
+    async def recent_traces():
+        exporter = tracing.tracer.exporter
+        if isinstance(exporter, tracing.InMemorySpanExporter):
+            return exporter.traces()
+        return []
 
 
 @app.get("/")
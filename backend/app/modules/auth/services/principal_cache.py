@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.modules.auth.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as seen by request handlers. Carries no password
+    hash and is not bound to a session; load the User row when it has to be
+    modified.
+    """
+
+    id: uuid.UUID
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["id"] = str(self.id)
+        for key in ("created_at", "updated_at"):
+            data[key] = data[key].isoformat() if data[key] else None
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: bytes | str) -> "Principal":
+        data = json.loads(raw)
+        data["id"] = uuid.UUID(data["id"])
+        for key in ("created_at", "updated_at"):
+            data[key] = datetime.fromisoformat(data[key]) if data[key] else None
+        return cls(**data)
+
+
+class PrincipalCache:
+    """
+    Two-level cache of principals keyed by user id: a small per-process LRU
+    in front of Redis, so authenticated requests normally skip the users
+    table.
+
+    Every Redis entry carries the user's generation, a counter that
+    invalidation increments; entries of an older generation are ignored.
+    So a request that loaded the user before an update cannot put the old
+    row back after the invalidation. An invalidation that cannot reach
+    Redis is remembered and replayed by this process on its next Redis
+    call; while Redis is unreachable, no worker reads from it either.
+
+    Staleness after an update is therefore bounded by LOCAL_TTL_SECONDS on
+    other workers, except when the updating process stops before it could
+    replay a failed invalidation: then up to REDIS_TTL_SECONDS.
+    """
+
+    LOCAL_TTL_SECONDS = settings.AUTH_PRINCIPAL_LOCAL_TTL_SECONDS
+    REDIS_TTL_SECONDS = settings.AUTH_PRINCIPAL_REDIS_TTL_SECONDS
+    _local: "OrderedDict[uuid.UUID, Tuple[Principal, float]]" = OrderedDict()
+    _pending_invalidations: Set[uuid.UUID] = set()
+
+    @classmethod
+    async def get(cls, db: AsyncSession, user_id: uuid.UUID) -> Optional[Principal]:
+        principal = cls._get_local(user_id)
+        if principal is not None:
+            return principal
+
+        redis = await get_redis()
+        generation: Optional[int] = None
+        if redis:
+            await cls._replay_invalidations(redis)
+            try:
+                cached, raw_generation = await redis.mget(
+                    cls._cache_key(user_id), cls._generation_key(user_id)
+                )
+                generation = int(raw_generation or 0)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to read principal {}: {}", user_id, exc)
+                cached = None
+            if cached:
+                try:
+                    data = json.loads(cached)
+                    if data["generation"] == generation:
+                        principal = Principal.from_json(data["principal"])
+                except (KeyError, TypeError, ValueError):
+                    logger.warning("Failed to decode cached principal {}", user_id)
+                if principal is not None:
+                    cls._set_local(principal)
+                    return principal
+
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalars().first()
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        cls._set_local(principal)
+        if redis and generation is not None:
+            # Tagged with the generation read before loading the row: if the
+            # user was invalidated meanwhile, this entry is never served
+            entry = json.dumps(
+                {"generation": generation, "principal": principal.to_json()}
+            )
+            try:
+                await redis.setex(cls._cache_key(user_id), cls.REDIS_TTL_SECONDS, entry)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to cache principal {}: {}", user_id, exc)
+        return principal
+
+    @classmethod
+    async def invalidate(cls, user_id: uuid.UUID) -> None:
+        cls._local.pop(user_id, None)
+        cls._pending_invalidations.add(user_id)
+        redis = await get_redis()
+        if redis:
+            await cls._replay_invalidations(redis)
+        if user_id in cls._pending_invalidations:
+            logger.warning(
+                "Principal {} not invalidated in Redis yet, will retry", user_id
+            )
+
+    @classmethod
+    async def _replay_invalidations(cls, redis) -> None:
+        for user_id in list(cls._pending_invalidations):
+            try:
+                async with redis.pipeline(transaction=True) as pipe:
+                    # Outlives every entry of the old generation, so the
+                    # counter cannot expire back to a value still cached
+                    pipe.incr(cls._generation_key(user_id))
+                    pipe.expire(cls._generation_key(user_id), cls.REDIS_TTL_SECONDS)
+                    pipe.delete(cls._cache_key(user_id))
+                    await pipe.execute()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to invalidate principal {}: {}", user_id, exc)
+                return
+            cls._pending_invalidations.discard(user_id)
+
+    @classmethod
+    def _get_local(cls, user_id: uuid.UUID) -> Optional[Principal]:
+        cached = cls._local.get(user_id)
+        if cached is None:
+            return None
+        principal, deadline = cached
+        if deadline <= time.monotonic():
+            cls._local.pop(user_id, None)
+            return None
+        cls._local.move_to_end(user_id)
+        return principal
+
+    @classmethod
+    def _set_local(cls, principal: Principal) -> None:
+        cls._local[principal.id] = (
+            principal,
+            time.monotonic() + cls.LOCAL_TTL_SECONDS,
+        )
+        cls._local.move_to_end(principal.id)
+        while len(cls._local) > settings.AUTH_PRINCIPAL_CACHE_SIZE:
+            cls._local.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(user_id: uuid.UUID) -> str:
+        return f"auth:principal:{user_id}"
+
+    @staticmethod
+    def _generation_key(user_id: uuid.UUID) -> str:
+        return f"auth:principal:{user_id}:generation"
@@ -4,9 +4,10 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.modules.auth.models.user import User
 from app.modules.auth.schemas.user import UserCreate, UserUpdate
+from app.modules.auth.services.principal_cache import PrincipalCache
 
 
 class UserService:
@@ -24,7 +25,7 @@ async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
     async def create(db: AsyncSession, obj_in: UserCreate) -> User:
         db_obj = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await get_password_hash_async(obj_in.password),
             full_name=obj_in.full_name,
             is_superuser=obj_in.is_superuser,
             is_active=obj_in.is_active,
@@ -44,7 +45,7 @@ async def update(
             update_data = obj_in.model_dump(exclude_unset=True)
 
         if "password" in update_data and update_data["password"]:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await get_password_hash_async(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
 
@@ -55,6 +56,7 @@ async def update(
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await PrincipalCache.invalidate(db_obj.id)
         return db_obj
 
     @staticmethod
@@ -64,6 +66,6 @@ async def authenticate(
         user = await UserService.get_by_email(db, email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import functools
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Sequence
+from typing import Any, List, Optional, Sequence
 
+from pydantic import TypeAdapter
 from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import span, traced
 from app.modules.pricing_kb_ai.enums import LifecycleStatus, NodeType, SearchMode
 from app.modules.pricing_kb_ai.models.nomenclature import Nomenclature
 from app.modules.pricing_kb_ai.models.nomenclature_card_metadata import (
@@ -19,10 +22,9 @@
     BulkLifecycleRequest,
     BulkMethodologyRequest,
     BulkOperationResult,
-    CardAuditMeta,
+    CardFileInput,
     CardLifecycleChange,
     CardSynonym,
-    CardUsage,
     NomenclatureCard,
     NomenclatureCardCreate,
     NomenclatureCardUpdate,
@@ -43,6 +45,31 @@
     SemanticSearchService,
 )
 
+_CARD_FILES = TypeAdapter(List[CardFileInput])
+
+
+@functools.cache
+def _loaded_card_attrs() -> frozenset[str]:
+    """
+    What a fully loaded card keeps in __dict__: every column the mapper
+    loads by default plus the two relationships list queries load eagerly.
+    Taken from the mapper on first use, once all models are configured.
+    """
+    mapper = Nomenclature.__mapper__
+    columns = [prop.key for prop in mapper.column_attrs if not prop.deferred]
+    relationships = [Nomenclature.synonym_records.key, Nomenclature.usage_records.key]
+    return frozenset(columns + relationships)
+
+
+class _AttributeView:
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self.obj, key)
+
 
 def _generate_card_code(prefix: str) -> str:
     suffix = uuid.uuid4().hex[:6].upper()
@@ -87,6 +114,7 @@ async def _collect_classification_codes(
         return codes
 
     @staticmethod
+    @traced()
     async def list_cards(
         db: AsyncSession,
         *,
@@ -198,7 +226,8 @@ async def list_cards(
         sort_expr = sort_column.desc() if sort_order == "desc" else sort_column.asc()
 
         total_stmt = select(func.count()).select_from(base_stmt.subquery())
-        total = await db.scalar(total_stmt)
+        with span("NomenclatureCardService.list_cards.count"):
+            total = await db.scalar(total_stmt)
 
         order_by_expressions = []
         if confidence_expr is not None:
@@ -211,7 +240,10 @@ async def list_cards(
             .offset((page - 1) * page_size)
             .limit(page_size)
         )
-        result = await db.execute(stmt)
+        with span(
+            "NomenclatureCardService.list_cards.query", search_mode=search_mode.value
+        ):
+            result = await db.execute(stmt)
         if confidence_expr is not None:
             rows = result.unique().all()
             items = []
@@ -233,10 +265,12 @@ async def list_cards(
         return items, meta
 
     @staticmethod
+    @traced()
     async def get(db: AsyncSession, card_id: int) -> Optional[Nomenclature]:
         return await db.get(Nomenclature, card_id)
 
     @staticmethod
+    @traced()
     async def create(
         db: AsyncSession,
         payload: NomenclatureCardCreate,
@@ -296,6 +330,7 @@ async def create(
         return card
 
     @staticmethod
+    @traced()
     async def update(
         db: AsyncSession,
         card_id: int,
@@ -348,6 +383,7 @@ async def update(
         return card
 
     @staticmethod
+    @traced()
     async def change_lifecycle(
         db: AsyncSession,
         card_id: int,
@@ -368,6 +404,7 @@ async def change_lifecycle(
         return card
 
     @staticmethod
+    @traced()
     async def bulk_change_lifecycle(
         db: AsyncSession,
         request: BulkLifecycleRequest,
@@ -414,6 +451,7 @@ async def bulk_change_lifecycle(
         return results
 
     @staticmethod
+    @traced()
     async def bulk_update_methodologies(
         db: AsyncSession,
         request: BulkMethodologyRequest,
@@ -450,6 +488,7 @@ async def bulk_update_methodologies(
         return results
 
     @staticmethod
+    @traced()
     async def list_versions(
         db: AsyncSession, card_id: int
     ) -> Sequence[NomenclatureCardVersion]:
@@ -482,64 +521,88 @@ async def _replace_synonyms(
             )
 
     @staticmethod
+    @traced()
     def serialize(card: Nomenclature) -> NomenclatureCard:
-        synonyms = [
-            CardSynonym(value=s.value, locale=s.locale) for s in card.synonym_records
-        ]
-        usage = [
-            CardUsage(
-                position_id=entry.position_id,
-                tender_id=None,
-                tender_number=None,
-                usage_count=entry.usage_count,
-                average_price=entry.average_price,
-                last_used_at=entry.last_used_at,
+        return NomenclatureCard.model_validate(NomenclatureCardService.to_payload(card))
+
+    @staticmethod
+    def to_payload(card: Nomenclature) -> dict[str, Any]:
+        """
+        The card as plain data in the shape of `NomenclatureCard`, for list
+        endpoints that encode it directly instead of building a model per
+        row. Keys follow the schema's field order.
+        """
+        # Loaded rows keep every column in __dict__; reading it directly
+        # skips the ORM attribute descriptors, which are most of the cost
+        # of a 100-card page. Partially loaded instances go through getattr.
+        row = card.__dict__
+        if not _loaded_card_attrs() <= row.keys():
+            row = _AttributeView(card)
+        files = row["files"] or []
+        if files:
+            # Stored file entries are free-form JSON; validate them so the
+            # output matches CardFileInput (defaults filled, extras dropped).
+            files = _CARD_FILES.dump_python(
+                _CARD_FILES.validate_python(files), mode="json"
             )
-            for entry in card.usage_records
-        ]
-        audit = CardAuditMeta(
-            created_by=str(card.created_by_id) if card.created_by_id else None,
-            created_at=card.created_at,
-            last_editor_id=str(card.last_editor_id) if card.last_editor_id else None,
-            last_reviewed_at=card.last_reviewed_at,
-        )
-        return NomenclatureCard(
-            id=card.id,
-            node_id=card.node_id,
-            node_version=card.node_version,
-            code=card.code,
-            canonical_name=card.canonical_name,
-            type=card.type,
-            category=card.category,
-            subclass=card.subclass,
-            lifecycle_status=card.lifecycle_status,
-            lifecycle_reason=card.lifecycle_reason,
-            effective_from=card.effective_from,
-            effective_to=card.effective_to,
-            attributes_payload=card.attributes_payload or {},
-            files=card.files or [],
-            methodology_ids=card.methodology_ids or [],
-            synonyms=synonyms,
-            manufacturer=card.manufacturer,
-            standard_document=card.standard_document,
-            article=card.article,
-            base_price=card.base_price,
-            cost_price=card.cost_price,
-            price_currency=card.price_currency,
-            price_source=card.price_source,
-            price_valid_until=card.price_valid_until,
-            price_confidence=card.price_confidence,
-            usage_count=card.usage_count,
-            average_price=card.average_price,
-            version=card.version,
-            audit=audit,
-            position_usage=usage,
-            tags=card.tags or {},
-            segment_code=card.segment_code,
-            family_code=card.family_code,
-            class_code=card.class_code,
-            category_code=card.category_code,
-            related_nomenclature_ids=card.related_nomenclature_ids or [],
-            audit_log_id=card.audit_log_id,
-            search_confidence=getattr(card, "search_confidence", None),
-        )
+        return {
+            "node_id": row["node_id"],
+            "canonical_name": row["canonical_name"],
+            "node_version": row["node_version"],
+            "code": row["code"],
+            "type": row["type"],
+            "category": row["category"],
+            "subclass": row["subclass"],
+            "attributes_payload": row["attributes_payload"] or {},
+            "files": files,
+            "methodology_ids": row["methodology_ids"] or [],
+            "synonyms": [
+                {"value": s.value, "locale": s.locale} for s in row["synonym_records"]
+            ],
+            "manufacturer": row["manufacturer"],
+            "standard_document": row["standard_document"],
+            "article": row["article"],
+            "base_price": row["base_price"],
+            "cost_price": row["cost_price"],
+            "price_currency": row["price_currency"],
+            "price_source": row["price_source"],
+            "price_valid_until": row["price_valid_until"],
+            "price_confidence": row["price_confidence"],
+            "tags": row["tags"] or {},
+            "related_nomenclature_ids": row["related_nomenclature_ids"] or [],
+            "id": row["id"],
+            "segment_code": row["segment_code"],
+            "family_code": row["family_code"],
+            "class_code": row["class_code"],
+            "category_code": row["category_code"],
+            "lifecycle_status": row["lifecycle_status"],
+            "lifecycle_reason": row["lifecycle_reason"],
+            "effective_from": row["effective_from"],
+            "effective_to": row["effective_to"],
+            "usage_count": row["usage_count"],
+            "average_price": row["average_price"],
+            "version": row["version"],
+            "audit": {
+                "created_by": (
+                    str(row["created_by_id"]) if row["created_by_id"] else None
+                ),
+                "created_at": row["created_at"],
+                "last_editor_id": (
+                    str(row["last_editor_id"]) if row["last_editor_id"] else None
+                ),
+                "last_reviewed_at": row["last_reviewed_at"],
+            },
+            "position_usage": [
+                {
+                    "position_id": entry.position_id,
+                    "tender_id": None,
+                    "tender_number": None,
+                    "usage_count": entry.usage_count,
+                    "average_price": entry.average_price,
+                    "last_used_at": entry.last_used_at,
+                }
+                for entry in row["usage_records"]
+            ],
+            "audit_log_id": row["audit_log_id"],
+            "search_confidence": getattr(card, "search_confidence", None),
+        }
@@ -1,26 +1,32 @@
 from __future__ import annotations
 
 import json
+import time
+from collections import OrderedDict
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Annotated, Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Annotated, Any, Dict, List, Optional, Tuple
 
-from jsonschema import Draft202012Validator
-from jsonschema.exceptions import ValidationError as JsonSchemaValidationError
 from loguru import logger
 from pydantic import AfterValidator, TypeAdapter
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.core.redis import get_redis
+from app.core.tracing import traced
 from app.modules.pricing_kb_ai.enums import PresetMode, SchemaStatus
+from app.modules.pricing_kb_ai.models.nomenclature import Nomenclature
 from app.modules.pricing_kb_ai.models.nomenclature_node import NomenclatureNode
 from app.modules.pricing_kb_ai.models.nomenclature_schema import (
     ClassSchemaPreset,
     NomenclatureClassSchema,
 )
 
+if TYPE_CHECKING:
+    from jsonschema.exceptions import ValidationError as JsonSchemaValidationError
+
 
 @dataclass
 class SchemaRegistryEntry:
@@ -40,8 +46,17 @@ def __init__(self, errors: List[str]) -> None:
 
 
 class SchemaRegistry:
+    """
+    Merged class schemas per node: a short-lived per-process cache in front
+    of Redis in front of the database. Invalidation clears the local entry
+    and Redis; other workers can serve the previous schema for at most
+    LOCAL_TTL_SECONDS.
+    """
+
     CACHE_TTL_SECONDS = 3600
+    LOCAL_TTL_SECONDS = settings.SCHEMA_REGISTRY_LOCAL_TTL_SECONDS
     _adapter_cache: dict[Tuple[int, int], TypeAdapter[dict[str, Any]]] = {}
+    _local: "OrderedDict[int, Tuple[SchemaRegistryEntry, float]]" = OrderedDict()
 
     @classmethod
     async def validate_payload(
@@ -52,16 +67,25 @@ async def validate_payload(
         return entry
 
     @classmethod
+    @traced()
     async def get_entry(cls, db: AsyncSession, node_id: int) -> SchemaRegistryEntry:
+        entry = cls._get_local(node_id)
+        if entry is not None:
+            return entry
+
         redis = await get_redis()
         cache_key = cls._cache_key(node_id)
 
         if redis:
-            cached = await redis.get(cache_key)
+            try:
+                cached = await redis.get(cache_key)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to read cached schema {}: {}", node_id, exc)
+                cached = None
             if cached:
                 try:
                     data = json.loads(cached)
-                    return SchemaRegistryEntry(
+                    entry = SchemaRegistryEntry(
                         node_id=node_id,
                         version=data["version"],
                         schema=data["schema"],
@@ -70,12 +94,16 @@ async def get_entry(cls, db: AsyncSession, node_id: int) -> SchemaRegistryEntry:
                     logger.warning(
                         "Failed to decode cached schema for node {}", node_id
                     )
+                else:
+                    cls._set_local(entry)
+                    return entry
 
         entry = await cls._fetch_from_db(db, node_id)
         if entry is None:
             raise SchemaRegistryError(
                 f"Не найдена опубликованная схема для узла {node_id}"
             )
+        cls._set_local(entry)
         if redis and entry:
             payload = json.dumps(
                 {
@@ -94,6 +122,33 @@ async def get_entry(cls, db: AsyncSession, node_id: int) -> SchemaRegistryEntry:
             )
         return entry
 
+    @classmethod
+    async def warm(cls, db: AsyncSession, limit: int) -> int:
+        """
+        Loads the schemas of the `limit` nodes whose cards are used most and
+        compiles their validators. The compiled validators stay for the
+        life of the process; the merged schemas also land in Redis for the
+        other workers. Returns how many schemas were warmed.
+        """
+        if limit <= 0:
+            return 0
+        result = await db.execute(
+            select(Nomenclature.node_id)
+            .where(Nomenclature.node_id.is_not(None))
+            .group_by(Nomenclature.node_id)
+            .order_by(func.sum(Nomenclature.usage_count).desc())
+            .limit(limit)
+        )
+        warmed = 0
+        for node_id in result.scalars().all():
+            try:
+                entry = await cls.get_entry(db, node_id)
+            except SchemaRegistryError:
+                continue
+            cls._get_adapter(entry)
+            warmed += 1
+        return warmed
+
     @classmethod
     async def invalidate_cache(cls, node_id: int) -> None:
         cls._adapter_cache = {
@@ -101,6 +156,7 @@ async def invalidate_cache(cls, node_id: int) -> None:
             for key, adapter in cls._adapter_cache.items()
             if key[0] != node_id
         }
+        cls._local.pop(node_id, None)
         redis = await get_redis()
         if redis:
             try:
@@ -108,8 +164,29 @@ async def invalidate_cache(cls, node_id: int) -> None:
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Failed to invalidate schema cache {}: {}", node_id, exc)
 
+    @classmethod
+    def _get_local(cls, node_id: int) -> Optional[SchemaRegistryEntry]:
+        cached = cls._local.get(node_id)
+        if cached is None:
+            return None
+        entry, deadline = cached
+        if deadline <= time.monotonic():
+            cls._local.pop(node_id, None)
+            return None
+        cls._local.move_to_end(node_id)
+        return entry
+
+    @classmethod
+    def _set_local(cls, entry: SchemaRegistryEntry) -> None:
+        cls._local[entry.node_id] = (entry, time.monotonic() + cls.LOCAL_TTL_SECONDS)
+        cls._local.move_to_end(entry.node_id)
+        while len(cls._local) > settings.SCHEMA_REGISTRY_CACHE_SIZE:
+            cls._local.popitem(last=False)
+
     @classmethod
     def _run_validation(cls, entry: SchemaRegistryEntry, payload: dict) -> None:
+        from jsonschema.exceptions import ValidationError as JsonSchemaValidationError
+
         adapter = cls._get_adapter(entry)
         try:
             adapter.validate_python(payload)
@@ -123,6 +200,9 @@ def _get_adapter(cls, entry: SchemaRegistryEntry) -> TypeAdapter[dict[str, Any]]
         if adapter is not None:
             return adapter
 
+        # Imported on first validation rather than with the app
+        from jsonschema import Draft202012Validator
+
         validator = Draft202012Validator(entry.schema)
 
         def _validate(value: dict[str, Any]) -> dict[str, Any]:
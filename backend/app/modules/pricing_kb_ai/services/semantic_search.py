@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Optional
-
-from openai import AsyncOpenAI
-from openai.types import Embedding
+import time
+from typing import TYPE_CHECKING, List, Optional
 
 from app.core.config import settings
+from app.core.metrics import EMBEDDING_REQUEST_DURATION
+from app.core.tracing import traced
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from openai.types import Embedding
 
 
 class SemanticSearchError(Exception):
@@ -23,22 +27,34 @@ def _get_client(cls) -> AsyncOpenAI:
                 raise SemanticSearchError(
                     "Semantic search недоступен: не сконфигурирован OPENAI_API_KEY"
                 )
+            # The SDK takes over half a second to import; only pay for it
+            # when semantic search is actually used.
+            from openai import AsyncOpenAI
+
             cls._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         return cls._client
 
     @classmethod
+    @traced()
     async def build_query_embedding(cls, query: str) -> List[float]:
         if not query or not query.strip():
             raise SemanticSearchError("Для semantic поиска необходимо передать запрос")
 
         client = cls._get_client()
+        started = time.perf_counter()
         try:
             response = await client.embeddings.create(
                 model=cls.MODEL,
                 input=query,
             )
         except Exception as exc:  # pragma: no cover - network failures
+            EMBEDDING_REQUEST_DURATION.labels(model=cls.MODEL, outcome="error").observe(
+                time.perf_counter() - started
+            )
             raise SemanticSearchError(f"Не удалось получить embedding: {exc}") from exc
+        EMBEDDING_REQUEST_DURATION.labels(model=cls.MODEL, outcome="ok").observe(
+            time.perf_counter() - started
+        )
 
         embedding: Optional[Embedding] = response.data[0] if response.data else None
         if not embedding or not embedding.embedding:
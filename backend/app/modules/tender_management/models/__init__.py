@@ -1,4 +1,4 @@
 from app.modules.tender_management.models.audit import AuditLog
 from app.modules.tender_management.models.position import Position
 from app.modules.tender_management.models.stage import Stage, StageTransition
-from app.modules.tender_management.models.tender import Tender, TenderFile
+from app.modules.tender_management.models.tender import FileBlob, Tender, TenderFile
@@ -1,7 +1,9 @@
+import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -19,15 +21,24 @@ class AuditLog(Base):
         String(50), nullable=False, default="tender"
     )
     entity_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
 
     action: Mapped[str] = mapped_column(
         String
     )  # e.g. "stage_changed", "file_uploaded", "position_added"
-    details: Mapped[dict] = mapped_column(JSON, default=dict)
+    details: Mapped[dict] = mapped_column(JSONB, default=dict)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
 
     tender = relationship("Tender", back_populates="audit_logs")
+
+    __table_args__ = (
+        Index("ix_audit_logs_tender_created", "tender_id", "created_at", "id"),
+        Index("ix_audit_logs_entity_created", "entity_type", "entity_id", "created_at"),
+        Index("ix_audit_logs_action_created", "action", "created_at"),
+        Index("ix_audit_logs_created_brin", "created_at", postgresql_using="brin"),
+    )
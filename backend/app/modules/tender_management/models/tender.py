@@ -1,8 +1,19 @@
+import uuid
 from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -76,6 +87,36 @@ class Tender(Base):
     # tasks = relationship("Task", back_populates="tender")
     audit_logs = relationship("AuditLog", back_populates="tender")
 
+    # Composite indexes backing TenderService.search filters and keyset order.
+    # Trigram indexes on number/title/customer live in the migration only.
+    __table_args__ = (
+        Index("ix_tenders_created_at_id", "created_at", "id"),
+        Index("ix_tenders_deadline_at_id", "deadline_at", "id"),
+        Index("ix_tenders_stage_deadline", "stage_id", "deadline_at"),
+        Index("ix_tenders_responsible_deadline", "responsible_id", "deadline_at"),
+        Index("ix_tenders_engineer_deadline", "engineer_id", "deadline_at"),
+        Index("ix_tenders_archived_created", "is_archived", "created_at"),
+        Index("ix_tenders_source_created", "source", "created_at"),
+    )
+
+
+class FileBlob(Base):
+    """
+    Content-addressed object in MinIO shared by every TenderFile with the
+    same SHA-256. ref_count == 0 means the object has been removed.
+    """
+
+    __tablename__ = "file_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    object_name: Mapped[str] = mapped_column(String)
+    size: Mapped[int] = mapped_column(BigInteger)
+    content_type: Mapped[str] = mapped_column(String)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
 
 class TenderFile(Base):
     __tablename__ = "tender_files"
@@ -86,8 +127,14 @@ class TenderFile(Base):
     filename: Mapped[str] = mapped_column(String)
     file_path: Mapped[str] = mapped_column(String)  # Path in MinIO
     category: Mapped[str] = mapped_column(String)  # FileCategory enum
+    size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    sha256: Mapped[Optional[str]] = mapped_column(
+        String(64), ForeignKey("file_blobs.sha256"), nullable=True, index=True
+    )
 
-    uploaded_by_id: Mapped[int] = mapped_column(Integer)
+    uploaded_by_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
     uploaded_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -1,10 +1,11 @@
+import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 
-from app.modules.tender_management.enums import TenderSource
+from app.modules.tender_management.enums import StageCode, TenderSource
 from app.modules.tender_management.schemas.position import PositionResponse
 from app.modules.tender_management.schemas.stage import StageResponse
 
@@ -13,7 +14,9 @@ class TenderFileResponse(BaseModel):
     id: int
     filename: str
     category: str
-    uploaded_by_id: int
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    uploaded_by_id: Optional[uuid.UUID] = None
     uploaded_at: datetime
     is_archived: bool
     archived_at: Optional[datetime] = None
@@ -21,6 +24,16 @@ class TenderFileResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TenderFileUrl(BaseModel):
+    id: int
+    url: str
+
+
+class TenderFileAttach(BaseModel):
+    filename: str
+    category: str
+
+
 class TenderBase(BaseModel):
     number: str
     title: str
@@ -42,6 +55,7 @@ class TenderCreate(TenderBase):
 
 
 class TenderUpdate(BaseModel):
+    number: Optional[str] = None
     title: Optional[str] = None
     customer: Optional[str] = None
     description: Optional[str] = None
@@ -56,7 +70,7 @@ class TenderUpdate(BaseModel):
 
 class AuditLogResponse(BaseModel):
     id: int
-    user_id: Optional[int] = None
+    user_id: Optional[uuid.UUID] = None
     action: str
     details: dict
     created_at: datetime
@@ -64,6 +78,11 @@ class AuditLogResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PaginatedAuditLogs(BaseModel):
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str] = None
+
+
 class TenderResponse(TenderBase):
     id: int
     stage_id: int
@@ -76,3 +95,49 @@ class TenderResponse(TenderBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TenderListItem(TenderBase):
+    id: int
+    stage_id: int
+    stage: Optional[StageResponse] = None
+    is_archived: bool
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PaginatedTenders(BaseModel):
+    items: List[TenderListItem]
+    next_cursor: Optional[str] = None
+
+
+class BulkStageChangeRequest(BaseModel):
+    tender_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    target_stage_code: StageCode
+
+
+class BulkStageChangeResult(BaseModel):
+    tender_id: int
+    status: Literal["updated", "not_found", "error"]
+    message: Optional[str] = None
+
+
+class TenderImportRequest(BaseModel):
+    # Overrides `source` of every tender in the batch
+    source: TenderSource
+    tenders: List[TenderCreate] = Field(..., min_length=1, max_length=10_000)
+
+    @field_validator("source")
+    @classmethod
+    def source_is_marketplace(cls, value: TenderSource) -> TenderSource:
+        if value == TenderSource.MANUAL:
+            raise ValueError("Импорт возможен только с торговых площадок")
+        return value
+
+
+class TenderImportResult(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
@@ -1,8 +1,17 @@
-from typing import Any, Dict, Optional
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
 
+from sqlalchemy import func, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.core.pagination import decode_cursor, encode_cursor, is_row_id
 from app.modules.tender_management.models.audit import AuditLog
+from app.modules.tender_management.services.audit_writer import (
+    DEFERRED_AUDIT_KEY,
+    audit_writer,
+)
 
 
 class AuditService:
@@ -12,7 +21,7 @@ async def log(
         action: str,
         *,
         tender_id: Optional[int] = None,
-        user_id: Optional[int] = None,
+        user_id: Optional[uuid.UUID] = None,
         entity_type: Optional[str] = None,
         entity_id: Optional[int] = None,
         details: Optional[Dict[str, Any]] = None,
@@ -28,9 +37,116 @@ async def log(
             user_id=user_id,
             action=action,
             details=details or {},
+            created_at=datetime.now(timezone.utc),
         )
-        db.add(log_entry)
-        # We don't commit here usually if it's part of a larger transaction,
-        # but if we want to ensure log is written even if main tx fails (complex), we might.
-        # Here we assume it's part of the same unit of work.
+        AuditService._persist(db, [log_entry])
         return log_entry
+
+    @staticmethod
+    async def log_many(db: AsyncSession, entries: List[AuditLog]) -> List[AuditLog]:
+        """
+        Records a batch of prepared entries (bulk operations) in one go.
+        """
+        now = datetime.now(timezone.utc)
+        for entry in entries:
+            entry.entity_type = entry.entity_type or (
+                "tender" if entry.tender_id is not None else "unknown"
+            )
+            entry.entity_id = entry.entity_id or entry.tender_id
+            entry.details = entry.details or {}
+            entry.created_at = entry.created_at or now
+        AuditService._persist(db, entries)
+        return entries
+
+    @staticmethod
+    def _persist(db: AsyncSession, entries: List[AuditLog]) -> None:
+        if audit_writer.is_running:
+            # Written by the background writer once the request transaction
+            # commits; dropped if it rolls back.
+            db.info.setdefault(DEFERRED_AUDIT_KEY, []).extend(
+                {
+                    "tender_id": entry.tender_id,
+                    "entity_type": entry.entity_type,
+                    "entity_id": entry.entity_id,
+                    "user_id": entry.user_id,
+                    "action": entry.action,
+                    "details": entry.details,
+                    "created_at": entry.created_at,
+                }
+                for entry in entries
+            )
+            return
+        db.add_all(entries)
+
+    @staticmethod
+    async def list_for_tender(
+        db: AsyncSession,
+        tender_id: int,
+        *,
+        actions: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> tuple[List[AuditLog], Optional[str]]:
+        """
+        Newest-first audit history of a tender, keyset-paginated over
+        (created_at, id) so it is served by ix_audit_logs_tender_created.
+        """
+        limit = max(1, min(limit, 200))
+        stmt = select(AuditLog).where(AuditLog.tender_id == tender_id)
+        if actions:
+            stmt = stmt.where(AuditLog.action.in_(actions))
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor, 2)
+            if not isinstance(last_created_at, str) or not is_row_id(last_id):
+                raise ValueError("Некорректный курсор пагинации")
+            try:
+                last_created_at = datetime.fromisoformat(last_created_at)
+            except ValueError as exc:
+                raise ValueError("Некорректный курсор пагинации") from exc
+            stmt = stmt.where(
+                tuple_(AuditLog.created_at, AuditLog.id)
+                < tuple_(literal(last_created_at), literal(last_id))
+            )
+        stmt = stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+
+        result = await db.execute(stmt.limit(limit + 1))
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return items, next_cursor
+
+    @staticmethod
+    async def recent_for_tenders(
+        db: AsyncSession, tender_ids: Sequence[int], limit: int
+    ) -> Dict[int, List[AuditLog]]:
+        """
+        Last `limit` entries per tender in a single windowed query.
+        """
+        if not tender_ids:
+            return {}
+        ranked = (
+            select(
+                AuditLog,
+                func.row_number()
+                .over(
+                    partition_by=AuditLog.tender_id,
+                    order_by=(AuditLog.created_at.desc(), AuditLog.id.desc()),
+                )
+                .label("rank"),
+            )
+            .where(AuditLog.tender_id.in_(tender_ids))
+            .subquery()
+        )
+        recent = aliased(AuditLog, ranked)
+        result = await db.execute(
+            select(recent)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.tender_id, ranked.c.rank)
+        )
+        grouped: Dict[int, List[AuditLog]] = {tender_id: [] for tender_id in tender_ids}
+        for entry in result.scalars().all():
+            grouped[entry.tender_id].append(entry)
+        return grouped
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.modules.tender_management.models.audit import AuditLog
+
+DEFERRED_AUDIT_KEY = "deferred_audit_rows"
+
+
+class AuditLogWriter:
+    """
+    Buffers committed audit rows and writes them with multi-row INSERTs
+    from a background task, off the request latency path.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = settings.AUDIT_MAX_PENDING,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def submit(self, rows: List[Dict[str, Any]]) -> None:
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(AuditLog), batch)
+                    await session.commit()
+            except Exception as exc:  # noqa: BLE001
+                if len(self._pending) + len(batch) > self.max_pending:
+                    logger.error(
+                        "Dropping {} audit rows, writer backlog is full: {}",
+                        len(batch),
+                        exc,
+                    )
+                else:
+                    logger.warning("Audit batch write failed, will retry: {}", exc)
+                    self._pending[:0] = batch
+                return
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._stopping:
+                if self._pending:
+                    logger.error(
+                        "Audit writer stopped with {} unwritten rows",
+                        len(self._pending),
+                    )
+                return
+
+
+audit_writer = AuditLogWriter()
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_deferred_audit(session: Session) -> None:
+    rows = session.info.pop(DEFERRED_AUDIT_KEY, None)
+    if rows:
+        audit_writer.submit(rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_deferred_audit(session: Session) -> None:
+    session.info.pop(DEFERRED_AUDIT_KEY, None)
@@ -1,54 +1,199 @@
 import uuid
 from datetime import datetime, timezone
+from typing import Any, AsyncIterator, List, Optional, Tuple
 
 from fastapi import UploadFile
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.storage import storage
-from app.modules.tender_management.models.tender import TenderFile
+from app.core.config import settings
+from app.core.storage import hash_file, storage, storage_executor
+from app.core.streaming import ZipEntry, stream_zip, unique_names
+from app.modules.tender_management.models.tender import FileBlob, TenderFile
 from app.modules.tender_management.services.audit_service import AuditService
 
 
 class FileService:
+    @staticmethod
+    def blob_object_name(sha256: str) -> str:
+        return f"blobs/{sha256[:2]}/{sha256}"
+
     @staticmethod
     async def upload(
-        db: AsyncSession, tender_id: int, file: UploadFile, category: str, user_id: int
+        db: AsyncSession,
+        tender_id: int,
+        file: UploadFile,
+        category: str,
+        user_id: uuid.UUID,
     ) -> TenderFile:
 
-        # 1. Generate unique filename
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else ""
-        unique_filename = f"{tender_id}/{uuid.uuid4()}.{file_ext}"
+        # 1. Hash the spooled upload to get its content address. Reading
+        # it back is storage I/O, so it is admitted like the MinIO calls
+        size, sha256 = await storage_executor.run(hash_file, file.file)
+        content_type = file.content_type or "application/octet-stream"
+
+        # 2. Take a reference on the blob. The upsert locks the row until
+        # commit, so concurrent uploads of the same content wait here
+        blob, ref_count = await FileService._acquire_blob(
+            db, sha256=sha256, size=size, content_type=content_type
+        )
+
+        # 3. Only the first reference writes the object to MinIO
+        if ref_count == 1:
+            stored = await storage.upload_stream(
+                stream=file.file,
+                object_name=blob.object_name,
+                content_type=content_type,
+                length=size,
+            )
+            if stored.sha256 != sha256:
+                raise ValueError("File content changed during upload")
+
+        return await FileService._create_record(
+            db,
+            tender_id=tender_id,
+            blob=blob,
+            filename=file.filename,
+            category=category,
+            user_id=user_id,
+            deduplicated=ref_count > 1,
+        )
+
+    @staticmethod
+    def _blob_visible(sha256: str, tender_id: int, user_id: Optional[uuid.UUID]) -> Any:
+        """
+        A hash only proves knowledge of the hash, not of the content, so a
+        blob may be reused only by someone who has seen it: its uploader or
+        a tender that already holds it. user_id None lifts the restriction.
+        """
+        if user_id is None:
+            return FileBlob.sha256 == sha256
+        return exists().where(
+            TenderFile.sha256 == sha256,
+            or_(
+                TenderFile.uploaded_by_id == user_id, TenderFile.tender_id == tender_id
+            ),
+        )
+
+    @staticmethod
+    async def blob_exists(
+        db: AsyncSession,
+        sha256: str,
+        tender_id: int,
+        user_id: uuid.UUID,
+        restrict_to_user: bool = True,
+    ) -> bool:
+        result = await db.execute(
+            select(FileBlob.sha256).where(
+                FileBlob.sha256 == sha256,
+                FileBlob.ref_count > 0,
+                FileService._blob_visible(
+                    sha256, tender_id, user_id if restrict_to_user else None
+                ),
+            )
+        )
+        return result.scalar_one_or_none() is not None
+
+    @staticmethod
+    async def attach_blob(
+        db: AsyncSession,
+        tender_id: int,
+        sha256: str,
+        filename: str,
+        category: str,
+        user_id: uuid.UUID,
+        restrict_to_user: bool = True,
+    ) -> Optional[TenderFile]:
+        """
+        Attaches already stored content to a tender without re-sending bytes.
+        Returns None if no live blob with this hash is visible to the user.
+        """
+        result = await db.execute(
+            update(FileBlob)
+            .where(
+                FileBlob.sha256 == sha256,
+                FileBlob.ref_count > 0,
+                FileService._blob_visible(
+                    sha256, tender_id, user_id if restrict_to_user else None
+                ),
+            )
+            .values(ref_count=FileBlob.ref_count + 1)
+            .returning(FileBlob)
+            .execution_options(synchronize_session=False)
+        )
+        blob = result.scalar_one_or_none()
+        if blob is None:
+            return None
 
-        # 2. Read content
-        content = await file.read()
+        return await FileService._create_record(
+            db,
+            tender_id=tender_id,
+            blob=blob,
+            filename=filename,
+            category=category,
+            user_id=user_id,
+            deduplicated=True,
+        )
 
-        # 3. Upload to MinIO
-        await storage.upload_file(
-            file_data=content,
-            filename=unique_filename,
-            content_type=file.content_type or "application/octet-stream",
+    @staticmethod
+    async def _acquire_blob(
+        db: AsyncSession, sha256: str, size: int, content_type: str
+    ) -> Tuple[FileBlob, int]:
+        stmt = (
+            insert(FileBlob)
+            .values(
+                sha256=sha256,
+                object_name=FileService.blob_object_name(sha256),
+                size=size,
+                content_type=content_type,
+                ref_count=1,
+            )
+            .on_conflict_do_update(
+                index_elements=[FileBlob.sha256],
+                set_={"ref_count": FileBlob.ref_count + 1},
+            )
+            .returning(FileBlob)
+            .execution_options(populate_existing=True)
         )
+        blob = (await db.execute(stmt)).scalar_one()
+        return blob, blob.ref_count
 
-        # 4. Create DB Record
+    @staticmethod
+    async def _create_record(
+        db: AsyncSession,
+        tender_id: int,
+        blob: FileBlob,
+        filename: str,
+        category: str,
+        user_id: uuid.UUID,
+        deduplicated: bool,
+    ) -> TenderFile:
         db_file = TenderFile(
             tender_id=tender_id,
-            filename=file.filename,
-            file_path=unique_filename,
+            filename=filename,
+            file_path=blob.object_name,
             category=category,
+            size=blob.size,
+            sha256=blob.sha256,
             uploaded_by_id=user_id,
         )
 
         db.add(db_file)
 
-        # 5. Log Audit
         await AuditService.log(
             db=db,
             tender_id=tender_id,
             user_id=user_id,
             action="file_uploaded",
-            details={"filename": file.filename, "category": category},
+            details={
+                "filename": filename,
+                "category": category,
+                "size": blob.size,
+                "sha256": blob.sha256,
+                "deduplicated": deduplicated,
+            },
         )
 
         await db.commit()
@@ -57,7 +202,7 @@ async def upload(
         return db_file
 
     @staticmethod
-    async def delete(db: AsyncSession, file_id: int) -> bool:
+    async def delete(db: AsyncSession, file_id: int, user_id: uuid.UUID) -> bool:
         result = await db.execute(select(TenderFile).where(TenderFile.id == file_id))
         file_record = result.scalar_one_or_none()
 
@@ -67,13 +212,9 @@ async def delete(db: AsyncSession, file_id: int) -> bool:
         if file_record.is_archived:
             return True
 
-        # Delete from MinIO storage but keep DB record (soft delete)
-        try:
-            await storage.delete_file(file_record.file_path)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning(
-                "Failed to delete file {} from storage: {}", file_record.id, exc
-            )
+        # Soft delete: the record stays, the stored object goes once the
+        # last reference is committed away
+        unused = await FileService._release_blob(db, file_record)
 
         file_record.is_archived = True
         file_record.archived_at = datetime.now(timezone.utc)
@@ -81,7 +222,7 @@ async def delete(db: AsyncSession, file_id: int) -> bool:
         await AuditService.log(
             db=db,
             tender_id=file_record.tender_id,
-            user_id=file_record.uploaded_by_id,
+            user_id=user_id,
             action="file_deleted",
             details={
                 "filename": file_record.filename,
@@ -91,9 +232,116 @@ async def delete(db: AsyncSession, file_id: int) -> bool:
 
         db.add(file_record)
         await db.commit()
+        if unused:
+            await FileService._delete_unused_object(db, file_record)
         await db.refresh(file_record)
         return True
 
+    @staticmethod
+    async def _release_blob(db: AsyncSession, file_record: TenderFile) -> bool:
+        """
+        Drops one blob reference; True if the stored object is now unused.
+        Files uploaded before content addressing own their object outright.
+        """
+        if file_record.sha256 is None:
+            return True
+        result = await db.execute(
+            update(FileBlob)
+            .where(FileBlob.sha256 == file_record.sha256, FileBlob.ref_count > 0)
+            .values(ref_count=FileBlob.ref_count - 1)
+            .returning(FileBlob.ref_count)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() == 0
+
+    @staticmethod
+    async def _delete_unused_object(db: AsyncSession, file_record: TenderFile) -> None:
+        """
+        Removes the stored object of a released file. Runs after the release
+        is committed, so a failed delete request never leaves references to
+        a missing object. For a shared blob the row is locked and rechecked:
+        an upload of the same content that took a new reference meanwhile
+        keeps the object, one arriving now waits for the lock.
+        """
+        if file_record.sha256 is not None:
+            unused = await db.scalar(
+                select(FileBlob.sha256)
+                .where(FileBlob.sha256 == file_record.sha256, FileBlob.ref_count == 0)
+                .with_for_update()
+            )
+            if unused is None:
+                await db.commit()
+                return
+        try:
+            await storage.delete_file(file_record.file_path)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Failed to delete file {} from storage: {}", file_record.id, exc
+            )
+        await db.commit()
+
+    @staticmethod
+    async def get_for_tender(
+        db: AsyncSession, tender_id: int, file_id: int
+    ) -> Optional[TenderFile]:
+        result = await db.execute(
+            select(TenderFile).where(
+                TenderFile.id == file_id,
+                TenderFile.tender_id == tender_id,
+                TenderFile.is_archived.is_(False),
+            )
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def list_active(db: AsyncSession, tender_id: int) -> List[TenderFile]:
+        result = await db.execute(
+            select(TenderFile)
+            .where(
+                TenderFile.tender_id == tender_id,
+                TenderFile.is_archived.is_(False),
+            )
+            .order_by(TenderFile.uploaded_at, TenderFile.id)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    def stream_archive(files: List[TenderFile]) -> AsyncIterator[bytes]:
+        """
+        Streams a ZIP of the given files straight from MinIO; nothing is
+        buffered beyond a few chunks per file being read.
+        """
+        entries = [
+            ZipEntry(
+                name=name,
+                open=lambda path=file_record.file_path: storage.stream_object(path),
+                size=file_record.size,
+                modified_at=file_record.uploaded_at,
+            )
+            for file_record, name in zip(files, unique_names(f.filename for f in files))
+        ]
+        return stream_zip(entries, prefetch=settings.MINIO_ARCHIVE_PREFETCH)
+
+    @staticmethod
+    async def get_urls(
+        db: AsyncSession, tender_id: int, file_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        Presigned URLs for many files of a tender (all active ones when
+        file_ids is omitted) with a single query.
+        """
+        query = select(TenderFile.id, TenderFile.file_path).where(
+            TenderFile.tender_id == tender_id,
+            TenderFile.is_archived.is_(False),
+        )
+        if file_ids:
+            query = query.where(TenderFile.id.in_(file_ids))
+        result = await db.execute(query.order_by(TenderFile.id))
+        return [
+            (file_id, storage.presigned_url(file_path))
+            for file_id, file_path in result.all()
+        ]
+
     @staticmethod
     async def get_url(db: AsyncSession, file_id: int) -> str:
         result = await db.execute(select(TenderFile).where(TenderFile.id == file_id))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import FrozenSet, Iterable, Mapping, Optional, Tuple
+
+from app.modules.tender_management.models.stage import Stage, StageTransition
+
+
+@dataclass(frozen=True)
+class StageNode:
+    id: int
+    code: str
+    name: str
+    order: int
+    requires_all_positions_calculated: bool = False
+    requires_commercial_proposal: bool = False
+
+
+@dataclass(frozen=True)
+class StageGraph:
+    """
+    Immutable snapshot of stages and allowed transitions. Lookups are plain
+    dict/set operations, so it is safe to share between requests.
+    """
+
+    by_id: Mapping[int, StageNode] = field(default_factory=lambda: MappingProxyType({}))
+    by_code: Mapping[str, StageNode] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    transitions: FrozenSet[Tuple[int, int]] = frozenset()
+
+    def __post_init__(self) -> None:
+        # Copy into read-only views, so the caller's dicts can't change us
+        object.__setattr__(self, "by_id", MappingProxyType(dict(self.by_id)))
+        object.__setattr__(self, "by_code", MappingProxyType(dict(self.by_code)))
+        object.__setattr__(self, "transitions", frozenset(self.transitions))
+
+    @classmethod
+    def build(
+        cls, stages: Iterable[Stage], transitions: Iterable[StageTransition]
+    ) -> "StageGraph":
+        nodes = [
+            StageNode(
+                id=stage.id,
+                code=stage.code,
+                name=stage.name,
+                order=stage.order or 0,
+                requires_all_positions_calculated=bool(
+                    stage.requires_all_positions_calculated
+                ),
+                requires_commercial_proposal=bool(stage.requires_commercial_proposal),
+            )
+            for stage in stages
+        ]
+        return cls(
+            by_id={node.id: node for node in nodes},
+            by_code={node.code: node for node in nodes},
+            transitions=frozenset(
+                (transition.from_stage_id, transition.to_stage_id)
+                for transition in transitions
+            ),
+        )
+
+    def knows(self, stage_id: int, target_code: str) -> bool:
+        return stage_id in self.by_id and target_code in self.by_code
+
+    def transition_target(
+        self, from_stage_id: int, target_code: str
+    ) -> Optional[StageNode]:
+        target = self.by_code.get(target_code)
+        if target is None or (from_stage_id, target.id) not in self.transitions:
+            return None
+        return target
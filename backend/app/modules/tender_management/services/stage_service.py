@@ -1,15 +1,59 @@
-from typing import Optional
+import asyncio
+import time
+from typing import Dict, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.tender_management.enums import StageCode
+from app.modules.tender_management.enums import PositionStatus, StageCode
+from app.modules.tender_management.models.position import Position
 from app.modules.tender_management.models.stage import Stage, StageTransition
 from app.modules.tender_management.models.tender import Tender
 from app.modules.tender_management.schemas.stage import StageCreate
+from app.modules.tender_management.services.stage_graph import StageGraph, StageNode
 
 
 class StageService:
+    # Stages and transitions are seeded once and practically never change,
+    # so each worker keeps a snapshot. Local writes invalidate it; the TTL
+    # bounds staleness after changes made by other workers or init_db.
+    GRAPH_TTL_SECONDS = 300
+    _graph: Optional[StageGraph] = None
+    _graph_loaded_at: float = 0.0
+    _graph_lock = asyncio.Lock()
+    CALCULATED_POSITION_STATUSES = (
+        PositionStatus.CALCULATED,
+        PositionStatus.VERIFIED,
+        PositionStatus.TRANSFERRED,
+        PositionStatus.IN_PROPOSAL,
+    )
+
+    @classmethod
+    async def get_graph(
+        cls, db: AsyncSession, force_reload: bool = False
+    ) -> StageGraph:
+        if not force_reload and cls._graph_is_fresh():
+            return cls._graph
+        async with cls._graph_lock:
+            if not force_reload and cls._graph_is_fresh():
+                return cls._graph
+            stages = (await db.execute(select(Stage))).scalars().all()
+            transitions = (await db.execute(select(StageTransition))).scalars().all()
+            cls._graph = StageGraph.build(stages, transitions)
+            cls._graph_loaded_at = time.monotonic()
+            return cls._graph
+
+    @classmethod
+    def invalidate_graph(cls) -> None:
+        cls._graph = None
+
+    @classmethod
+    def _graph_is_fresh(cls) -> bool:
+        return (
+            cls._graph is not None
+            and time.monotonic() - cls._graph_loaded_at < cls.GRAPH_TTL_SECONDS
+        )
+
     @staticmethod
     async def get_by_id(db: AsyncSession, stage_id: int) -> Optional[Stage]:
         result = await db.execute(select(Stage).where(Stage.id == stage_id))
@@ -31,6 +75,7 @@ async def create(db: AsyncSession, schema: StageCreate) -> Stage:
         db.add(stage)
         await db.commit()
         await db.refresh(stage)
+        StageService.invalidate_graph()
         return stage
 
     @staticmethod
@@ -52,26 +97,54 @@ async def can_transition(
         Check if transition is allowed based on graph and conditions.
         Note: Logic moved here from pseudo-code in docs.
         """
-        current_stage = await StageService.get_by_id(db, tender.stage_id)
-        target_stage = await StageService.get_by_code(db, target_stage_code)
-
-        if not current_stage or not target_stage:
-            return False
-
         # 1. Check graph existence
-        transition = await StageService.get_transition(
-            db, current_stage.id, target_stage.id
-        )
-        if not transition:
-            # Allow transition to Cancelled from anywhere? Or strict graph?
-            # For MVP let's strict graph, except maybe admin override.
-            # Assuming graph is populated.
+        graph = await StageService.get_graph(db)
+        if not graph.knows(tender.stage_id, target_stage_code):
+            graph = await StageService.get_graph(db, force_reload=True)
+        target_stage = graph.transition_target(tender.stage_id, target_stage_code)
+        if not target_stage:
             return False
 
         # 2. Check conditions (Business Logic)
+        failures = await StageService.unmet_conditions(db, target_stage, [tender.id])
+        return not failures
+
+    @staticmethod
+    async def unmet_conditions(
+        db: AsyncSession, target_stage: StageNode, tender_ids: Sequence[int]
+    ) -> Dict[int, str]:
+        """
+        Evaluates the target stage conditions for a set of tenders at once.
+        Returns tender_id -> reason for every tender that does not qualify.
+        """
+        failures: Dict[int, str] = {}
+        if not tender_ids:
+            return failures
+
         if target_stage.requires_all_positions_calculated:
-            # Check positions (would need to load them or query)
-            # For now, assuming positions are loaded or we do a query
-            pass
+            stmt = (
+                select(
+                    Position.tender_id,
+                    func.count(),
+                    func.count().filter(
+                        Position.status.in_(StageService.CALCULATED_POSITION_STATUSES)
+                    ),
+                )
+                .where(Position.tender_id.in_(tender_ids))
+                .group_by(Position.tender_id)
+            )
+            counts = {
+                tender_id: (total, calculated)
+                for tender_id, total, calculated in (await db.execute(stmt)).all()
+            }
+            for tender_id in tender_ids:
+                total, calculated = counts.get(tender_id, (0, 0))
+                if total == 0:
+                    failures[tender_id] = "Tender has no positions"
+                elif calculated < total:
+                    failures[tender_id] = (
+                        f"{total - calculated} of {total} positions are not calculated"
+                    )
 
-        return True
+        # requires_commercial_proposal: proposals are not modelled yet.
+        return failures
@@ -1,18 +1,60 @@
-from typing import List, Optional
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import func, literal, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, with_loader_criteria
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.modules.tender_management.enums import StageCode
+from app.core.pagination import decode_cursor, encode_cursor, is_row_id
+from app.modules.tender_management.enums import StageCode, TenderSource
+from app.modules.tender_management.models.audit import AuditLog
 from app.modules.tender_management.models.stage import Stage
 from app.modules.tender_management.models.tender import Tender, TenderFile
-from app.modules.tender_management.schemas.tender import TenderCreate, TenderUpdate
+from app.modules.tender_management.schemas.tender import (
+    BulkStageChangeResult,
+    TenderCreate,
+    TenderImportResult,
+    TenderUpdate,
+)
 from app.modules.tender_management.services.audit_service import AuditService
 from app.modules.tender_management.services.stage_service import StageService
 
 
 class TenderService:
+    SEARCH_SORT_COLUMNS = {
+        "created_at": Tender.created_at,
+        "updated_at": Tender.updated_at,
+        "deadline_at": Tender.deadline_at,
+        "number": Tender.number,
+    }
+    # Detail payloads embed only the tail of the audit history;
+    # the full log is served by GET /tenders/{id}/audit.
+    RECENT_AUDIT_LIMIT = 20
+    # Rows per INSERT of a bulk import; keeps bind parameters far below
+    # the 32767 asyncpg allows per statement.
+    IMPORT_BATCH_SIZE = 1000
+    # Columns an import refreshes on a tender that already exists. Stage,
+    # assignees and archiving belong to the team and are never overwritten.
+    IMPORT_UPDATE_COLUMNS = (
+        "title",
+        "description",
+        "customer",
+        "source",
+        "source_url",
+        "deadline_at",
+        "published_at",
+        "initial_max_price",
+        "currency",
+        "terms",
+    )
+    DUPLICATE_NUMBER_MESSAGE = "Тендер с таким номером уже существует"
+    NUMBER_INDEX = "ix_tenders_number"
+
     @staticmethod
     async def get(db: AsyncSession, id: int) -> Optional[Tender]:
         result = await db.execute(
@@ -21,14 +63,35 @@ async def get(db: AsyncSession, id: int) -> Optional[Tender]:
                 selectinload(Tender.positions),
                 selectinload(Tender.stage),
                 selectinload(Tender.files),
-                selectinload(Tender.audit_logs),
                 with_loader_criteria(
                     TenderFile, TenderFile.is_archived.is_(False), include_aliases=True
                 ),
             )
             .where(Tender.id == id)
         )
-        return result.scalar_one_or_none()
+        tender = result.scalar_one_or_none()
+        if tender:
+            await TenderService._attach_recent_audit_logs(db, [tender])
+        return tender
+
+    @staticmethod
+    async def exists(db: AsyncSession, id: int) -> bool:
+        return await db.scalar(select(Tender.id).where(Tender.id == id)) is not None
+
+    @staticmethod
+    async def get_number(db: AsyncSession, id: int) -> Optional[str]:
+        """Tender number alone, or None when the tender does not exist."""
+        return await db.scalar(select(Tender.number).where(Tender.id == id))
+
+    @staticmethod
+    async def _attach_recent_audit_logs(
+        db: AsyncSession, tenders: List[Tender]
+    ) -> None:
+        recent = await AuditService.recent_for_tenders(
+            db, [tender.id for tender in tenders], TenderService.RECENT_AUDIT_LIMIT
+        )
+        for tender in tenders:
+            set_committed_value(tender, "audit_logs", recent.get(tender.id, []))
 
     @staticmethod
     async def get_all(
@@ -40,7 +103,6 @@ async def get_all(
                 selectinload(Tender.stage),
                 selectinload(Tender.positions),
                 selectinload(Tender.files),
-                selectinload(Tender.audit_logs),
                 with_loader_criteria(
                     TenderFile, TenderFile.is_archived.is_(False), include_aliases=True
                 ),
@@ -49,97 +111,362 @@ async def get_all(
             .limit(limit)
             .order_by(Tender.created_at.desc())
         )
-        return list(result.scalars().all())
+        tenders = list(result.scalars().all())
+        await TenderService._attach_recent_audit_logs(db, tenders)
+        return tenders
 
     @staticmethod
-    async def create(db: AsyncSession, schema: TenderCreate) -> Tender:
-        existing = await db.scalar(select(Tender).where(Tender.number == schema.number))
-        if existing:
-            raise ValueError("Тендер с таким номером уже существует")
-        existing = await db.scalar(select(Tender).where(Tender.number == schema.number))
-        if existing:
-            raise ValueError("Тендер с таким номером уже существует")
-
-        # 1. Get initial stage
-        initial_stage = await StageService.get_by_code(db, StageCode.DISCOVERED)
+    async def search(
+        db: AsyncSession,
+        *,
+        stage_codes: Optional[List[StageCode]] = None,
+        customer: Optional[str] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None,
+        responsible_id: Optional[int] = None,
+        engineer_id: Optional[int] = None,
+        source: Optional[TenderSource] = None,
+        is_archived: Optional[bool] = False,
+        search: Optional[str] = None,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> tuple[List[Tender], Optional[str]]:
+        """
+        Filtered listing with keyset pagination over (sort column, id).
+        Only the stage is loaded eagerly: list views don't need positions,
+        files or audit history.
+        """
+        limit = max(1, min(limit, 100))
+        sort_column = TenderService.SEARCH_SORT_COLUMNS.get(sort_by, Tender.created_at)
+
+        stmt = select(Tender).options(selectinload(Tender.stage))
+        if stage_codes:
+            stmt = stmt.where(
+                Tender.stage_id.in_(select(Stage.id).where(Stage.code.in_(stage_codes)))
+            )
+        if customer:
+            stmt = stmt.where(
+                Tender.customer.icontains(customer.strip(), autoescape=True)
+            )
+        if deadline_from is not None:
+            stmt = stmt.where(Tender.deadline_at >= deadline_from)
+        if deadline_to is not None:
+            stmt = stmt.where(Tender.deadline_at < deadline_to)
+        if responsible_id is not None:
+            stmt = stmt.where(Tender.responsible_id == responsible_id)
+        if engineer_id is not None:
+            stmt = stmt.where(Tender.engineer_id == engineer_id)
+        if source is not None:
+            stmt = stmt.where(Tender.source == source)
+        if is_archived is not None:
+            stmt = stmt.where(Tender.is_archived.is_(is_archived))
+        normalized_search = search.strip() if search else None
+        if normalized_search:
+            # ILIKE on the raw columns is served by the gin_trgm_ops indexes;
+            # autoescape keeps % and _ typed by the user literal.
+            stmt = stmt.where(
+                or_(
+                    Tender.number.icontains(normalized_search, autoescape=True),
+                    Tender.title.icontains(normalized_search, autoescape=True),
+                    Tender.customer.icontains(normalized_search, autoescape=True),
+                )
+            )
+
+        if cursor:
+            last_value, last_id = decode_cursor(cursor, 2)
+            # Every sort value travels as a string (dates in ISO format);
+            # anything else was not issued by us and would only fail in SQL.
+            if not isinstance(last_value, str) or not is_row_id(last_id):
+                raise ValueError("Некорректный курсор пагинации")
+            if sort_by in ("created_at", "updated_at", "deadline_at"):
+                try:
+                    last_value = datetime.fromisoformat(last_value)
+                except ValueError as exc:
+                    raise ValueError("Некорректный курсор пагинации") from exc
+            keyset = tuple_(sort_column, Tender.id)
+            boundary = tuple_(literal(last_value), literal(last_id))
+            stmt = stmt.where(
+                keyset < boundary if sort_order == "desc" else keyset > boundary
+            )
+
+        if sort_order == "desc":
+            stmt = stmt.order_by(sort_column.desc(), Tender.id.desc())
+        else:
+            stmt = stmt.order_by(sort_column.asc(), Tender.id.asc())
+
+        result = await db.execute(stmt.limit(limit + 1))
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+        return items, next_cursor
+
+    @staticmethod
+    async def _initial_stage_id(db: AsyncSession) -> int:
+        graph = await StageService.get_graph(db)
+        initial_stage = graph.by_code.get(StageCode.DISCOVERED)
         if not initial_stage:
             # Fallback if DB not seeded
             raise ValueError("Initial stage 'discovered' not found in DB")
+        return initial_stage.id
 
-        # 2. Create tender
-        tender_data = schema.model_dump()
-        tender = Tender(**tender_data, stage_id=initial_stage.id)
+    @staticmethod
+    async def create(db: AsyncSession, schema: TenderCreate) -> Tender:
+        stage_id = await TenderService._initial_stage_id(db)
+
+        # The unique index on number decides; no pre-check that a
+        # concurrent insert could slip past anyway
+        tender_id = await db.scalar(
+            insert(Tender)
+            .values(**schema.model_dump(), stage_id=stage_id)
+            .on_conflict_do_nothing(index_elements=[Tender.number])
+            .returning(Tender.id)
+        )
+        if tender_id is None:
+            await db.rollback()
+            raise ValueError(TenderService.DUPLICATE_NUMBER_MESSAGE)
 
-        db.add(tender)
         await db.commit()
-        await db.refresh(tender)
-        return tender
+        return await TenderService.get(db, tender_id)
 
     @staticmethod
     async def update(
         db: AsyncSession, id: int, schema: TenderUpdate
     ) -> Optional[Tender]:
-        tender = await TenderService.get(db, id)
-        if not tender:
-            return None
-
-        if schema.number is not None:
-            existing = await db.scalar(
-                select(Tender).where(
-                    Tender.number == schema.number,
-                    Tender.id != id,
+        update_data = schema.model_dump(exclude_unset=True)
+        if update_data:
+            try:
+                updated_id = await db.scalar(
+                    update(Tender)
+                    .where(Tender.id == id)
+                    .values(**update_data)
+                    .returning(Tender.id)
+                    .execution_options(synchronize_session=False)
                 )
+            except IntegrityError as exc:
+                await db.rollback()
+                if not TenderService._is_duplicate_number(exc):
+                    raise
+                raise ValueError(TenderService.DUPLICATE_NUMBER_MESSAGE) from exc
+            if updated_id is None:
+                return None
+            await db.commit()
+        return await TenderService.get(db, id)
+
+    @staticmethod
+    def _is_duplicate_number(exc: IntegrityError) -> bool:
+        """True only for a unique violation (SQLSTATE 23505) on the number."""
+        error = exc.orig
+        if getattr(error, "sqlstate", None) != "23505":
+            return False
+        # asyncpg names the constraint on the original exception
+        constraint = getattr(error.__cause__, "constraint_name", None)
+        if constraint is not None:
+            return constraint == TenderService.NUMBER_INDEX
+        return TenderService.NUMBER_INDEX in str(error)
+
+    @staticmethod
+    async def import_many(
+        db: AsyncSession, source: TenderSource, tenders: List[TenderCreate]
+    ) -> TenderImportResult:
+        """
+        Upserts tenders from a marketplace by number with multi-row
+        INSERT ... ON CONFLICT statements. New tenders start at the initial
+        stage; existing ones get the imported columns refreshed, and rows
+        whose data did not change are left untouched. A number repeated in
+        one call is imported once, the last occurrence wins.
+        """
+        stage_id = await TenderService._initial_stage_id(db)
+        rows: Dict[str, Dict[str, Any]] = {}
+        for tender in tenders:
+            row = tender.model_dump()
+            row.update(source=source, stage_id=stage_id)
+            rows[tender.number] = row
+
+        created = updated = 0
+        values = list(rows.values())
+        for start in range(0, len(values), TenderService.IMPORT_BATCH_SIZE):
+            stmt = insert(Tender).values(
+                values[start : start + TenderService.IMPORT_BATCH_SIZE]
             )
-            if existing:
-                raise ValueError("Тендер с таким номером уже существует")
-
-        if schema.number is not None:
-            existing = await db.scalar(
-                select(Tender).where(
-                    Tender.number == schema.number,
-                    Tender.id != id,
-                )
+            current = [getattr(Tender, c) for c in TenderService.IMPORT_UPDATE_COLUMNS]
+            incoming = [
+                getattr(stmt.excluded, c) for c in TenderService.IMPORT_UPDATE_COLUMNS
+            ]
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Tender.number],
+                set_={
+                    **dict(zip(TenderService.IMPORT_UPDATE_COLUMNS, incoming)),
+                    "updated_at": func.now(),
+                },
+                where=tuple_(*current).is_distinct_from(tuple_(*incoming)),
+            ).returning(
+                Tender.id,
+                # xmax is 0 only on freshly inserted row versions
+                literal_column("xmax = 0").label("inserted"),
             )
-            if existing:
-                raise ValueError("Тендер с таким номером уже существует")
-
-        update_data = schema.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(tender, key, value)
+            for _, inserted in (await db.execute(stmt)).all():
+                if inserted:
+                    created += 1
+                else:
+                    updated += 1
 
-        db.add(tender)
         await db.commit()
-        await db.refresh(tender)
-        return tender
+        return TenderImportResult(
+            created=created,
+            updated=updated,
+            unchanged=len(values) - created - updated,
+        )
 
     @staticmethod
     async def change_stage(
-        db: AsyncSession, id: int, target_stage_code: str, user_id: int
+        db: AsyncSession, id: int, target_stage_code: str, user_id: uuid.UUID
     ) -> Tender:
-        tender = await TenderService.get(db, id)
-        if not tender:
+        current_stage_id = await db.scalar(
+            select(Tender.stage_id).where(Tender.id == id)
+        )
+        if current_stage_id is None:
             raise ValueError("Tender not found")
 
-        # Validate transition
-        can_switch = await StageService.can_transition(db, tender, target_stage_code)
-        if not can_switch:
+        # Validate transition against the cached stage graph
+        graph = await StageService.get_graph(db)
+        if not graph.knows(current_stage_id, target_stage_code):
+            graph = await StageService.get_graph(db, force_reload=True)
+        target_stage = graph.transition_target(current_stage_id, target_stage_code)
+        if not target_stage:
+            current_stage = graph.by_id.get(current_stage_id)
+            current_code = current_stage.code if current_stage else current_stage_id
             raise ValueError(
-                f"Cannot transition from {tender.stage.code} to {target_stage_code}"
+                f"Cannot transition from {current_code} to {target_stage_code}"
             )
+        failures = await StageService.unmet_conditions(db, target_stage, [id])
+        if failures:
+            raise ValueError(failures[id])
 
-        target_stage = await StageService.get_by_code(db, target_stage_code)
-        old_stage_code = tender.stage.code
-        tender.stage_id = target_stage.id
+        # Conditional UPDATE: loses cleanly to a concurrent stage change
+        result = await db.execute(
+            update(Tender)
+            .where(Tender.id == id, Tender.stage_id == current_stage_id)
+            .values(stage_id=target_stage.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            raise ValueError("Tender stage was changed concurrently, retry")
 
         await AuditService.log(
             db=db,
-            tender_id=tender.id,
+            tender_id=id,
             user_id=user_id,
             action="stage_changed",
-            details={"from": old_stage_code, "to": target_stage_code},
+            details={
+                "from": graph.by_id[current_stage_id].code,
+                "to": target_stage_code,
+            },
         )
 
-        db.add(tender)
         await db.commit()
-        await db.refresh(tender)
-        return tender
+        return await TenderService.get(db, id)
+
+    @staticmethod
+    async def bulk_change_stage(
+        db: AsyncSession,
+        tender_ids: List[int],
+        target_stage_code: str,
+        user_id: uuid.UUID,
+    ) -> List[BulkStageChangeResult]:
+        """
+        Moves many tenders to one stage in a single transaction: one query
+        for current stages, one aggregate per stage condition, one UPDATE
+        per source stage and a batch of audit entries.
+        """
+        ids = list(dict.fromkeys(tender_ids))
+        rows = await db.execute(
+            select(Tender.id, Tender.stage_id).where(Tender.id.in_(ids))
+        )
+        current_stages = {tender_id: stage_id for tender_id, stage_id in rows.all()}
+
+        graph = await StageService.get_graph(db)
+        if target_stage_code not in graph.by_code or any(
+            stage_id not in graph.by_id for stage_id in current_stages.values()
+        ):
+            graph = await StageService.get_graph(db, force_reload=True)
+        target_stage = graph.by_code.get(target_stage_code)
+        if not target_stage:
+            raise ValueError(f"Stage {target_stage_code} not found")
+
+        results: dict[int, BulkStageChangeResult] = {}
+        eligible: List[int] = []
+        for tender_id in ids:
+            stage_id = current_stages.get(tender_id)
+            if stage_id is None:
+                results[tender_id] = BulkStageChangeResult(
+                    tender_id=tender_id, status="not_found", message="Tender not found"
+                )
+            elif not graph.transition_target(stage_id, target_stage_code):
+                source = graph.by_id.get(stage_id)
+                results[tender_id] = BulkStageChangeResult(
+                    tender_id=tender_id,
+                    status="error",
+                    message=(
+                        f"Cannot transition from {source.code if source else stage_id}"
+                        f" to {target_stage_code}"
+                    ),
+                )
+            else:
+                eligible.append(tender_id)
+
+        failures = await StageService.unmet_conditions(db, target_stage, eligible)
+        by_source: dict[int, List[int]] = defaultdict(list)
+        for tender_id in eligible:
+            if tender_id in failures:
+                results[tender_id] = BulkStageChangeResult(
+                    tender_id=tender_id, status="error", message=failures[tender_id]
+                )
+            else:
+                by_source[current_stages[tender_id]].append(tender_id)
+
+        audit_entries: List[AuditLog] = []
+        for source_stage_id, group in by_source.items():
+            result = await db.execute(
+                update(Tender)
+                .where(Tender.id.in_(group), Tender.stage_id == source_stage_id)
+                .values(stage_id=target_stage.id)
+                .returning(Tender.id)
+                .execution_options(synchronize_session=False)
+            )
+            moved = set(result.scalars().all())
+            for tender_id in group:
+                if tender_id not in moved:
+                    results[tender_id] = BulkStageChangeResult(
+                        tender_id=tender_id,
+                        status="error",
+                        message="Tender stage was changed concurrently, retry",
+                    )
+                    continue
+                results[tender_id] = BulkStageChangeResult(
+                    tender_id=tender_id, status="updated"
+                )
+                audit_entries.append(
+                    AuditLog(
+                        tender_id=tender_id,
+                        user_id=user_id,
+                        action="stage_changed",
+                        details={
+                            "from": graph.by_id[source_stage_id].code,
+                            "to": target_stage_code,
+                            "bulk": True,
+                        },
+                    )
+                )
+
+        if audit_entries:
+            await AuditService.log_many(db, audit_entries)
+            await db.commit()
+        else:
+            await db.rollback()
+        return [results[tender_id] for tender_id in ids]
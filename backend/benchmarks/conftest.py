@@ -0,0 +1,78 @@
+"""
+Micro-benchmarks for pure-Python hot paths, no database needed.
+
+Run from backend/ (pytest-benchmark is a dev dependency). Save a run on the
+baseline commit, then compare later runs against it; a slowdown beyond the
+threshold in any size fails the run:
+
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare \\
+        --benchmark-compare-fail=median:25%
+
+Results are kept per machine in .benchmarks/; compare runs from the same
+machine only.
+"""
+
+import random
+from typing import Any, Dict
+
+import pytest
+
+import app.db.base  # noqa: F401
+
+
+def _property(rng: random.Random, index: int) -> Dict[str, Any]:
+    kind = index % 5
+    if kind == 0:
+        return {"type": "number", "minimum": 0, "maximum": rng.randint(10, 10_000)}
+    if kind == 1:
+        return {"type": "string", "enum": [f"v{i}" for i in range(rng.randint(2, 8))]}
+    if kind == 2:
+        return {"type": "integer", "minimum": 1}
+    if kind == 3:
+        return {"type": "boolean"}
+    return {
+        "type": "object",
+        "properties": {
+            "value": {"type": "number"},
+            "unit": {"type": "string", "maxLength": 16},
+        },
+    }
+
+
+def _schema(size: int, seed: int = 0, prefix: str = "attr") -> Dict[str, Any]:
+    """Class schema with `size` properties of mixed types, a tenth required."""
+    rng = random.Random(seed)
+    properties = {f"{prefix}_{i}": _property(rng, i) for i in range(size)}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties)[: max(1, size // 10)],
+    }
+
+
+def _payload(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """A payload valid against `schema`, one value per property."""
+    values = {
+        "number": 5,
+        "integer": 7,
+        "boolean": True,
+        "object": {"value": 1.5, "unit": "kW"},
+    }
+    payload = {}
+    for name, prop in schema["properties"].items():
+        if "enum" in prop:
+            payload[name] = prop["enum"][0]
+        else:
+            payload[name] = values[prop["type"]]
+    return payload
+
+
+@pytest.fixture
+def make_schema():
+    return _schema
+
+
+@pytest.fixture
+def make_payload():
+    return _payload
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.core.responses import FastJSONResponse
+from app.modules.pricing_kb_ai.enums import LifecycleStatus
+from app.modules.pricing_kb_ai.models.nomenclature import Nomenclature
+from app.modules.pricing_kb_ai.models.nomenclature_card_metadata import (
+    NomenclatureCardSynonym,
+    NomenclatureCardUsage,
+)
+from app.modules.pricing_kb_ai.services.nomenclature_cards import (
+    NomenclatureCardService,
+)
+
+PAGE_SIZES = [20, 50, 100]
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _card(index: int) -> Nomenclature:
+    """A card with every column set, as rows loaded from the database are."""
+    card = Nomenclature(
+        id=index + 1,
+        code=f"AA-{index:06d}",
+        canonical_name=f"Задвижка клиновая DN{50 + index}",
+        node_id=7,
+        node_version=3,
+        segment_code="AA",
+        family_code="AA.BB",
+        class_code="AA.BB.CC",
+        category_code="AA.BB.CC.DD",
+        type="valve",
+        category="pipeline",
+        subclass=None,
+        lifecycle_status=LifecycleStatus.ACTIVE,
+        lifecycle_reason=None,
+        effective_from=NOW - timedelta(days=30),
+        effective_to=None,
+        attributes_payload={"dn": 50 + index, "pn": 16, "material": "сталь 20"},
+        files=[{"type": "datasheet", "storage_key": f"cards/{index}/ds.pdf"}],
+        methodology_ids=[1, 2, 3],
+        manufacturer="ACME",
+        standard_document="ГОСТ 5762-2002",
+        article=f"X-{index}",
+        base_price=Decimal("15250.00"),
+        cost_price=Decimal("12100.50"),
+        price_currency="RUB",
+        price_source="manual",
+        price_valid_until=NOW + timedelta(days=90),
+        price_confidence=Decimal("0.85"),
+        usage_count=12,
+        average_price=Decimal("14990.10"),
+        version=4,
+        tags={"group": "valves"},
+        related_nomenclature_ids=[10, 20],
+        created_by_id=uuid.UUID(int=index),
+        last_editor_id=None,
+        last_reviewed_at=None,
+        audit_log_id=None,
+        created_at=NOW - timedelta(days=60),
+    )
+    card.synonym_records = [
+        NomenclatureCardSynonym(value=f"Задвижка {index}", locale="ru-RU"),
+        NomenclatureCardSynonym(value=f"Gate valve {index}", locale="en-US"),
+    ]
+    card.usage_records = [
+        NomenclatureCardUsage(
+            position_id=p,
+            usage_count=3,
+            average_price=Decimal("15000.00"),
+            last_used_at=NOW - timedelta(days=p),
+        )
+        for p in range(3)
+    ]
+    return card
+
+
+@pytest.fixture
+def page(request):
+    return [_card(i) for i in range(request.param)]
+
+
+@pytest.mark.parametrize("page", PAGE_SIZES, indirect=True)
+def test_serialize(benchmark, page):
+    cards = benchmark(lambda: [NomenclatureCardService.serialize(c) for c in page])
+
+    assert len(cards) == len(page)
+
+
+@pytest.mark.parametrize("page", PAGE_SIZES, indirect=True)
+def test_list_page_encoding(benchmark, page):
+    """What GET /nomenclature/cards does per page: payloads, then JSON."""
+
+    def encode():
+        items = [NomenclatureCardService.to_payload(card) for card in page]
+        return FastJSONResponse({"items": items}).body
+
+    body = benchmark(encode)
+
+    assert body.startswith(b'{"items":[')
@@ -0,0 +1,116 @@
+import pytest
+
+from app.modules.pricing_kb_ai.enums import PresetMode
+from app.modules.pricing_kb_ai.models.nomenclature_schema import (
+    ClassSchemaPreset,
+    NomenclatureAttributePreset,
+    NomenclatureClassSchema,
+)
+from app.modules.pricing_kb_ai.services.nomenclature_nodes import (
+    NomenclatureSchemaService,
+)
+from app.modules.pricing_kb_ai.services.schema_registry import (
+    SchemaRegistry,
+    SchemaRegistryEntry,
+)
+
+SIZES = [10, 100, 500, 2000]
+
+
+def _overlapping(make_schema, size):
+    """Half of the properties shared with make_schema(size), half new."""
+    override = make_schema(size // 2 or 1, seed=1)
+    override["properties"].update(
+        make_schema(size // 2 or 1, seed=2, prefix="extra")["properties"]
+    )
+    override["required"] += ["extra_0"]
+    return override
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_deep_merge(benchmark, make_schema, size):
+    base = make_schema(size)
+    override = _overlapping(make_schema, size)
+
+    merged = benchmark(SchemaRegistry._deep_merge, base, override)
+
+    assert len(merged["properties"]) == size + (size // 2 or 1)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_exclude_properties(benchmark, make_schema, size):
+    schema = make_schema(size)
+    # Drop every fourth property, required ones included
+    removed = {name: {} for name in list(schema["properties"])[::4]}
+
+    result = benchmark(
+        SchemaRegistry._exclude_properties, schema, {"properties": removed}
+    )
+
+    assert len(result["properties"]) == size - len(removed)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_apply_presets(benchmark, make_schema, size):
+    schema = NomenclatureClassSchema(json_schema=make_schema(size), version=1)
+    schema.presets = [
+        ClassSchemaPreset(
+            mode=mode,
+            preset=NomenclatureAttributePreset(
+                code=f"preset-{index}",
+                json_schema=make_schema(
+                    max(1, size // 10), seed=index, prefix=f"p{index}"
+                ),
+            ),
+        )
+        for index, mode in enumerate(
+            [PresetMode.INCLUDE, PresetMode.INCLUDE, PresetMode.EXCLUDE]
+        )
+    ]
+
+    payload = benchmark(SchemaRegistry._apply_presets, schema)
+
+    assert len(payload["properties"]) > size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_run_validation(benchmark, make_schema, make_payload, size):
+    schema = make_schema(size)
+    entry = SchemaRegistryEntry(node_id=size, version=1, schema=schema)
+    payload = make_payload(schema)
+    SchemaRegistry._run_validation(entry, payload)  # builds the cached adapter
+
+    benchmark(SchemaRegistry._run_validation, entry, payload)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_build_validator(benchmark, make_schema, make_payload, size):
+    """First validation after a publish: compiles the adapter."""
+    entry = SchemaRegistryEntry(node_id=size, version=2, schema=make_schema(size))
+    payload = make_payload(entry.schema)
+
+    def cold():
+        SchemaRegistry._adapter_cache.pop((entry.node_id, entry.version), None)
+        SchemaRegistry._run_validation(entry, payload)
+
+    benchmark(cold)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_calculate_schema_diff(benchmark, make_schema, size):
+    previous = make_schema(size)
+    current = make_schema(size)
+    names = list(current["properties"])
+    for name in names[::10]:
+        del current["properties"][name]
+    for name in names[1::10]:
+        current["properties"][name] = {"type": "string"}
+    current["properties"].update(
+        make_schema(max(1, size // 10), seed=3, prefix="new")["properties"]
+    )
+
+    diff = benchmark(
+        NomenclatureSchemaService._calculate_schema_diff, previous, current
+    )
+
+    assert len(diff["removed"]) == len(names[::10])
@@ -0,0 +1,51 @@
+"""add tender search indexes
+
+Revision ID: 5e1f0a9c3b72
+Revises: 707fc7c74066
+Create Date: 2025-12-01 10:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e1f0a9c3b72"
+down_revision: Union[str, None] = "707fc7c74066"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COMPOSITE_INDEXES = {
+    "ix_tenders_created_at_id": ["created_at", "id"],
+    "ix_tenders_deadline_at_id": ["deadline_at", "id"],
+    "ix_tenders_stage_deadline": ["stage_id", "deadline_at"],
+    "ix_tenders_responsible_deadline": ["responsible_id", "deadline_at"],
+    "ix_tenders_engineer_deadline": ["engineer_id", "deadline_at"],
+    "ix_tenders_archived_created": ["is_archived", "created_at"],
+    "ix_tenders_source_created": ["source", "created_at"],
+}
+TRGM_COLUMNS = ["number", "title", "customer"]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, columns in COMPOSITE_INDEXES.items():
+        op.create_index(name, "tenders", columns)
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f"ix_tenders_{column}_trgm",
+            "tenders",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for column in TRGM_COLUMNS:
+        op.drop_index(f"ix_tenders_{column}_trgm", table_name="tenders")
+    for name in COMPOSITE_INDEXES:
+        op.drop_index(name, table_name="tenders")
@@ -0,0 +1,30 @@
+"""add audit logs tender/created_at index
+
+Revision ID: 8d4c2b7e91f0
+Revises: 5e1f0a9c3b72
+Create Date: 2025-12-01 12:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4c2b7e91f0"
+down_revision: Union[str, None] = "5e1f0a9c3b72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_logs_tender_created",
+        "audit_logs",
+        ["tender_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_tender_created", table_name="audit_logs")
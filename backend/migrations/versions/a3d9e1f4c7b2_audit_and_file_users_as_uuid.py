@@ -0,0 +1,55 @@
+"""audit and file actors reference users by uuid
+
+Revision ID: a3d9e1f4c7b2
+Revises: b61e3f0d2a47
+Create Date: 2025-12-02 15:40:00.000000
+
+audit_logs.user_id and tender_files.uploaded_by_id were integers while
+users are keyed by uuid, so endpoints recorded a placeholder id 1. They
+now reference users.id. The placeholder values identify nobody and are
+cleared rather than mapped.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d9e1f4c7b2"
+down_revision: Union[str, None] = "b61e3f0d2a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    ("audit_logs", "user_id", "fk_audit_logs_user_id_users"),
+    ("tender_files", "uploaded_by_id", "fk_tender_files_uploaded_by_id_users"),
+)
+
+
+def upgrade() -> None:
+    for table, column, constraint in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Integer(),
+            type_=postgresql.UUID(as_uuid=True),
+            nullable=True,
+            postgresql_using="NULL::uuid",
+        )
+        op.create_foreign_key(
+            constraint, table, "users", [column], ["id"], ondelete="SET NULL"
+        )
+
+
+def downgrade() -> None:
+    for table, column, constraint in COLUMNS:
+        op.drop_constraint(constraint, table, type_="foreignkey")
+        op.alter_column(
+            table,
+            column,
+            existing_type=postgresql.UUID(as_uuid=True),
+            type_=sa.Integer(),
+            postgresql_using="NULL::integer",
+        )
@@ -0,0 +1,69 @@
+"""audit logs: jsonb details and lookup indexes
+
+Revision ID: b61e3f0d2a47
+Revises: 8d4c2b7e91f0
+Create Date: 2025-12-02 09:20:00.000000
+
+Declarative partitioning of audit_logs is not possible while
+nomenclatures.audit_log_id references audit_logs.id: a partitioned table
+requires the partition key in every unique constraint. A BRIN index on
+created_at gives time-range scans most of the pruning benefit on this
+append-only table instead.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b61e3f0d2a47"
+down_revision: Union[str, None] = "8d4c2b7e91f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "audit_logs",
+        "details",
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        postgresql_using="details::jsonb",
+    )
+    op.drop_index("ix_audit_logs_entity", table_name="audit_logs")
+    op.create_index(
+        "ix_audit_logs_entity_created",
+        "audit_logs",
+        ["entity_type", "entity_id", "created_at"],
+    )
+    op.create_index(
+        "ix_audit_logs_action_created",
+        "audit_logs",
+        ["action", "created_at"],
+    )
+    op.create_index(
+        "ix_audit_logs_created_brin",
+        "audit_logs",
+        ["created_at"],
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_created_brin", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_action_created", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_entity_created", table_name="audit_logs")
+    op.create_index(
+        "ix_audit_logs_entity",
+        "audit_logs",
+        ["entity_type", "entity_id"],
+    )
+    op.alter_column(
+        "audit_logs",
+        "details",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=sa.JSON(),
+        postgresql_using="details::json",
+    )
@@ -0,0 +1,30 @@
+"""tender files: size and sha256
+
+Revision ID: c3a91d5e7f28
+Revises: a3d9e1f4c7b2
+Create Date: 2025-12-03 10:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a91d5e7f28"
+down_revision: Union[str, None] = "a3d9e1f4c7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tender_files", sa.Column("size", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "tender_files", sa.Column("sha256", sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tender_files", "sha256")
+    op.drop_column("tender_files", "size")
@@ -0,0 +1,56 @@
+"""file blobs: content-addressed tender file storage
+
+Revision ID: e4b7c0a1d9f3
+Revises: c3a91d5e7f28
+Create Date: 2025-12-04 11:30:00.000000
+
+Existing tender_files rows keep their per-upload object paths and a NULL
+sha256; they are deleted from storage directly, as before.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7c0a1d9f3"
+down_revision: Union[str, None] = "c3a91d5e7f28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "file_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("object_name", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.String(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    # Files uploaded before content addressing have no blob row
+    op.execute("UPDATE tender_files SET sha256 = NULL")
+    op.create_foreign_key(
+        "fk_tender_files_sha256_file_blobs",
+        "tender_files",
+        "file_blobs",
+        ["sha256"],
+        ["sha256"],
+    )
+    op.create_index("ix_tender_files_sha256", "tender_files", ["sha256"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tender_files_sha256", table_name="tender_files")
+    op.drop_constraint(
+        "fk_tender_files_sha256_file_blobs", "tender_files", type_="foreignkey"
+    )
+    op.drop_table("file_blobs")
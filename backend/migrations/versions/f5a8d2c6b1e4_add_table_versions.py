@@ -0,0 +1,76 @@
+"""table versions: change counters for conditional GET
+
+Revision ID: f5a8d2c6b1e4
+Revises: e4b7c0a1d9f3
+Create Date: 2025-12-08 10:15:00.000000
+
+A statement-level trigger bumps table_versions for every write to the
+tracked read-mostly tables, so ETags can be derived from one primary key
+lookup without reading the rows, and no write path can forget to bump.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f5a8d2c6b1e4"
+down_revision: Union[str, None] = "e4b7c0a1d9f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = (
+    "stages",
+    "nomenclature_nodes",
+    "nomenclature_class_schema",
+    "class_schema_presets",
+    "nomenclature_attribute_presets",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    op.execute(
+        """
+        CREATE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version, updated_at)
+            VALUES (TG_TABLE_NAME, 1, clock_timestamp())
+            ON CONFLICT (table_name) DO UPDATE
+            SET version = table_versions.version + 1,
+                updated_at = clock_timestamp();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TRACKED_TABLES:
+        op.execute(
+            f"INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)"
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table("table_versions")
@@ -0,0 +1,255 @@
+"""
+Serialization time of a 100-card page of GET /nomenclature/cards.
+
+"before" is the previous implementation, kept here as the baseline: a
+NomenclatureCard model (with nested synonym/usage/audit models) per row,
+returned as PaginatedCards through response_model, so FastAPI validates and
+encodes it again. "after" builds plain data once with
+NomenclatureCardService.to_payload and encodes it with orjson.
+Runs in-process through ASGI on synthetic cards, no database needed:
+
+    python -m scripts.bench_card_serialization --cards 100 --rounds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, List
+
+import httpx
+from fastapi import FastAPI
+
+import app.db.base  # noqa: F401
+from app.core.responses import FastJSONResponse
+from app.modules.pricing_kb_ai.enums import LifecycleStatus
+from app.modules.pricing_kb_ai.models.nomenclature import Nomenclature
+from app.modules.pricing_kb_ai.models.nomenclature_card_metadata import (
+    NomenclatureCardSynonym,
+    NomenclatureCardUsage,
+)
+from app.modules.pricing_kb_ai.schemas.nomenclature_cards import (
+    CardAuditMeta,
+    CardSynonym,
+    CardUsage,
+    NomenclatureCard,
+    PaginatedCards,
+    PaginationMeta,
+)
+from app.modules.pricing_kb_ai.services.nomenclature_cards import (
+    NomenclatureCardService,
+)
+
+
+def build_cards(count: int) -> List[Nomenclature]:
+    now = datetime.now(timezone.utc)
+    cards = []
+    for i in range(count):
+        card = Nomenclature(
+            id=i + 1,
+            code=f"AA-{i:06d}",
+            canonical_name=f"Задвижка клиновая DN{50 + i}",
+            node_id=7,
+            node_version=3,
+            segment_code="AA",
+            family_code="AA.BB",
+            class_code="AA.BB.CC",
+            category_code="AA.BB.CC.DD",
+            lifecycle_status=LifecycleStatus.ACTIVE,
+            effective_from=now - timedelta(days=30),
+            attributes_payload={"dn": 50 + i, "pn": 16, "material": "сталь 20"},
+            files=[{"type": "datasheet", "storage_key": f"cards/{i}/ds.pdf"}],
+            methodology_ids=[1, 2, 3],
+            manufacturer="ACME",
+            standard_document="ГОСТ 5762-2002",
+            article=f"X-{i}",
+            base_price=Decimal("15250.00"),
+            cost_price=Decimal("12100.50"),
+            price_currency="RUB",
+            price_source="manual",
+            price_valid_until=now + timedelta(days=90),
+            price_confidence=Decimal("0.85"),
+            usage_count=12,
+            average_price=Decimal("14990.10"),
+            version=4,
+            tags={"group": "valves"},
+            related_nomenclature_ids=[10, 20],
+            created_by_id=uuid.uuid4(),
+            created_at=now - timedelta(days=60),
+            # Rows loaded from the database carry every column
+            type="valve",
+            category="pipeline",
+            subclass=None,
+            lifecycle_reason=None,
+            effective_to=None,
+            last_editor_id=None,
+            last_reviewed_at=None,
+            audit_log_id=None,
+        )
+        card.synonym_records = [
+            NomenclatureCardSynonym(value=f"Задвижка {i}", locale="ru-RU"),
+            NomenclatureCardSynonym(value=f"Gate valve {i}", locale="en-US"),
+        ]
+        card.usage_records = [
+            NomenclatureCardUsage(
+                position_id=p,
+                usage_count=3,
+                average_price=Decimal("15000.00"),
+                last_used_at=now - timedelta(days=p),
+            )
+            for p in range(3)
+        ]
+        cards.append(card)
+    return cards
+
+
+def legacy_serialize(card: Nomenclature) -> NomenclatureCard:
+    return NomenclatureCard(
+        id=card.id,
+        node_id=card.node_id,
+        node_version=card.node_version,
+        code=card.code,
+        canonical_name=card.canonical_name,
+        type=card.type,
+        category=card.category,
+        subclass=card.subclass,
+        lifecycle_status=card.lifecycle_status,
+        lifecycle_reason=card.lifecycle_reason,
+        effective_from=card.effective_from,
+        effective_to=card.effective_to,
+        attributes_payload=card.attributes_payload or {},
+        files=card.files or [],
+        methodology_ids=card.methodology_ids or [],
+        synonyms=[
+            CardSynonym(value=s.value, locale=s.locale) for s in card.synonym_records
+        ],
+        manufacturer=card.manufacturer,
+        standard_document=card.standard_document,
+        article=card.article,
+        base_price=card.base_price,
+        cost_price=card.cost_price,
+        price_currency=card.price_currency,
+        price_source=card.price_source,
+        price_valid_until=card.price_valid_until,
+        price_confidence=card.price_confidence,
+        usage_count=card.usage_count,
+        average_price=card.average_price,
+        version=card.version,
+        audit=CardAuditMeta(
+            created_by=str(card.created_by_id) if card.created_by_id else None,
+            created_at=card.created_at,
+            last_editor_id=str(card.last_editor_id) if card.last_editor_id else None,
+            last_reviewed_at=card.last_reviewed_at,
+        ),
+        position_usage=[
+            CardUsage(
+                position_id=entry.position_id,
+                tender_id=None,
+                tender_number=None,
+                usage_count=entry.usage_count,
+                average_price=entry.average_price,
+                last_used_at=entry.last_used_at,
+            )
+            for entry in card.usage_records
+        ],
+        tags=card.tags or {},
+        segment_code=card.segment_code,
+        family_code=card.family_code,
+        class_code=card.class_code,
+        category_code=card.category_code,
+        related_nomenclature_ids=card.related_nomenclature_ids or [],
+        audit_log_id=card.audit_log_id,
+        search_confidence=getattr(card, "search_confidence", None),
+    )
+
+
+def build_app(cards: List[Nomenclature]) -> FastAPI:
+    app = FastAPI()
+    meta = PaginationMeta(page=1, page_size=len(cards), total=len(cards), pages=1)
+
+    @app.get("/before", response_model=PaginatedCards)
+    async def before():
+        serialized = [legacy_serialize(card) for card in cards]
+        return PaginatedCards(items=serialized, meta=meta)
+
+    @app.get("/after", response_model=PaginatedCards)
+    async def after():
+        return FastJSONResponse(
+            {
+                "items": [NomenclatureCardService.to_payload(card) for card in cards],
+                "meta": meta.model_dump(),
+            }
+        )
+
+    return app
+
+
+def measure(func: Callable[[], object], rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def measure_http(app: FastAPI, path: str, rounds: int) -> List[float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        await c.get(path)
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            response = await c.get(path)
+            samples.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    cards = build_cards(args.cards)
+    app = build_app(cards)
+    meta = PaginationMeta(page=1, page_size=len(cards), total=len(cards), pages=1)
+
+    def encode_before() -> bytes:
+        page = PaginatedCards(
+            items=[legacy_serialize(card) for card in cards],
+            meta=meta,
+        )
+        # What FastAPI does with the returned model: validate, dump, encode
+        return PaginatedCards.model_validate(page).model_dump_json().encode()
+
+    def encode_after() -> bytes:
+        return FastJSONResponse(
+            {
+                "items": [NomenclatureCardService.to_payload(card) for card in cards],
+                "meta": meta.model_dump(),
+            }
+        ).body
+
+    print(f"{args.cards} cards per page, {args.rounds} rounds")
+    print(f"{'path':<22} {'p50 ms':>8} {'p95 ms':>8}")
+    rows = [
+        ("encode before", measure(encode_before, args.rounds)),
+        ("encode after", measure(encode_after, args.rounds)),
+        ("http before", asyncio.run(measure_http(app, "/before", args.rounds))),
+        ("http after", asyncio.run(measure_http(app, "/after", args.rounds))),
+    ]
+    for name, samples in rows:
+        ordered = sorted(samples)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        print(f"{name:<22} {statistics.median(samples):8.2f} {p95:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
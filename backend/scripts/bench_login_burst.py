@@ -0,0 +1,97 @@
+"""
+Latency of an unrelated endpoint while a burst of logins hashes passwords.
+
+Compares bcrypt run inline on the event loop with bcrypt offloaded to the
+password executor. Runs in-process through ASGI, no database needed:
+
+    python -m scripts.bench_login_burst --logins 40 --pings 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.security import get_password_hash, verify_password, verify_password_async
+
+PASSWORD = "correct horse battery staple"
+PING_INTERVAL = 0.01
+
+
+def build_app(hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/login/inline")
+    async def login_inline():
+        return {"ok": verify_password(PASSWORD, hashed)}
+
+    @app.post("/login/offloaded")
+    async def login_offloaded():
+        return {"ok": await verify_password_async(PASSWORD, hashed)}
+
+    return app
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(mode: str, hashed: str, logins: int, pings: int) -> List[float]:
+    transport = httpx.ASGITransport(app=build_app(hashed))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def login() -> None:
+            await client.post(f"/login/{mode}")
+
+        # Pings follow a fixed arrival schedule; latency is measured from
+        # the intended send time, so time spent with the event loop
+        # blocked counts against the ping (no coordinated omission).
+        await client.get("/ping")
+        burst = []
+        samples = []
+        started = time.perf_counter()
+        for i in range(pings):
+            due = started + i * PING_INTERVAL
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            if i < logins:
+                burst.append(asyncio.create_task(login()))
+            await client.get("/ping")
+            samples.append(time.perf_counter() - due)
+        await asyncio.gather(*burst)
+        return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--pings", type=int, default=200)
+    args = parser.parse_args()
+
+    hashed = get_password_hash(PASSWORD)
+    print(f"{args.logins} concurrent logins, {args.pings} pings to /ping")
+    print(f"{'mode':<10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for mode in ("inline", "offloaded"):
+        samples = asyncio.run(run(mode, hashed, args.logins, args.pings))
+        ms = [s * 1000 for s in samples]
+        print(
+            f"{mode:<10} {statistics.median(ms):8.1f} "
+            f"{percentile(ms, 99):8.1f} {max(ms):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Load suite for the main read endpoints of a running backend.
+
+Meant for a database filled by app.db.synthetic_data. Virtual users log in
+once, then pick weighted scenarios (tender search and detail, card lists
+with text search, classifier and reference data) in a closed loop for the
+given duration. With --rate, requests instead follow a fixed arrival
+schedule and latency is measured from the intended send time, so a
+saturated server cannot hide its queueing (no coordinated omission).
+
+Per-scenario latency percentiles are written to a JSON file; passing a
+previous file as --baseline compares against it and exits with status 1
+when a p50/p95 regressed beyond the tolerance:
+
+    python -m scripts.load_suite --base-url http://localhost:8000 \\
+        --users 20 --duration 60 --output load-baseline.json
+    python -m scripts.load_suite --users 20 --duration 60 \\
+        --baseline load-baseline.json --output load-current.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+API = "/api/v1"
+SEARCH_TERMS = ["редуктор", "задвижка", "насос", "IP55", "клапан", "сталь 20"]
+CARD_SORTS = ["updated_at", "code", "base_price", "usage_count"]
+
+
+@dataclass
+class Context:
+    """Ids discovered before the run, shared by all virtual users."""
+
+    tender_ids: Sequence[int] = range(0)
+    card_ids: Sequence[int] = range(0)
+    node_ids: List[int] = field(default_factory=list)
+    class_node_ids: List[int] = field(default_factory=list)
+    stage_codes: List[str] = field(default_factory=list)
+
+
+Scenario = Callable[
+    [httpx.AsyncClient, Context, random.Random], Awaitable[httpx.Response]
+]
+
+
+async def tender_search(client, ctx, rng):
+    params = {"limit": 50}
+    if rng.random() < 0.5 and ctx.stage_codes:
+        params["stage"] = rng.choice(ctx.stage_codes)
+    if rng.random() < 0.3:
+        params["search"] = rng.choice(["Поставка", "Завод", "Нефтегаз"])
+    return await client.get(f"{API}/tenders/search", params=params)
+
+
+async def tender_detail(client, ctx, rng):
+    return await client.get(f"{API}/tenders/{rng.choice(ctx.tender_ids)}")
+
+
+async def tender_audit(client, ctx, rng):
+    return await client.get(f"{API}/tenders/{rng.choice(ctx.tender_ids)}/audit")
+
+
+async def stages(client, ctx, rng):
+    return await client.get(f"{API}/tenders/stages")
+
+
+async def card_list(client, ctx, rng):
+    params = {
+        "page": rng.randint(1, 20),
+        "page_size": 50,
+        "sort_by": rng.choice(CARD_SORTS),
+    }
+    if rng.random() < 0.4 and ctx.node_ids:
+        params["node_id"] = rng.choice(ctx.node_ids)
+    return await client.get(f"{API}/nomenclature/cards", params=params)
+
+
+async def card_search(client, ctx, rng):
+    params = {"search": rng.choice(SEARCH_TERMS), "page_size": 20}
+    return await client.get(f"{API}/nomenclature/cards", params=params)
+
+
+async def card_detail(client, ctx, rng):
+    return await client.get(f"{API}/nomenclature/cards/{rng.choice(ctx.card_ids)}")
+
+
+async def node_list(client, ctx, rng):
+    return await client.get(f"{API}/nomenclature/nodes", params={"depth": 1})
+
+
+async def node_schemas(client, ctx, rng):
+    node_id = rng.choice(ctx.class_node_ids or ctx.node_ids)
+    return await client.get(f"{API}/nomenclature/nodes/{node_id}/schemas")
+
+
+async def presets(client, ctx, rng):
+    return await client.get(f"{API}/nomenclature/presets")
+
+
+# Scenario and relative weight, roughly the mix of a working day
+SCENARIOS: Dict[str, tuple[Scenario, int]] = {
+    "tender_search": (tender_search, 20),
+    "tender_detail": (tender_detail, 15),
+    "tender_audit": (tender_audit, 5),
+    "stages": (stages, 10),
+    "card_list": (card_list, 20),
+    "card_search": (card_search, 10),
+    "card_detail": (card_detail, 10),
+    "node_list": (node_list, 4),
+    "node_schemas": (node_schemas, 3),
+    "presets": (presets, 3),
+}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Recorder:
+    """Keeps requests started after the warmup."""
+
+    def __init__(self, record_from: float) -> None:
+        self.record_from = record_from
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, started: float, ok: bool) -> None:
+        if started < self.record_from:
+            return
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        if not ok:
+            self.errors[name] += 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies[name]
+            if not samples:
+                continue
+            result[name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "rps": round(len(samples) / duration, 2),
+                "mean_ms": round(sum(samples) / len(samples), 2),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p90_ms": round(percentile(samples, 90), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+                "max_ms": round(max(samples), 2),
+            }
+        return result
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> None:
+    response = await client.post(
+        f"{API}/auth/login", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def _id_range(client: httpx.AsyncClient, path: str, params: dict) -> range:
+    """Ids between the first and last row by code; synthetic ids are dense."""
+    ids = []
+    for order in ("asc", "desc"):
+        response = await client.get(path, params={**params, "sort_order": order})
+        response.raise_for_status()
+        ids += [item["id"] for item in response.json()["items"]]
+    if not ids:
+        return range(0)
+    return range(min(ids), max(ids) + 1)
+
+
+async def discover(client: httpx.AsyncClient) -> Context:
+    ctx = Context()
+    ctx.tender_ids = await _id_range(
+        client, f"{API}/tenders/search", {"limit": 100, "sort_by": "number"}
+    )
+    ctx.card_ids = await _id_range(
+        client, f"{API}/nomenclature/cards", {"page_size": 100, "sort_by": "code"}
+    )
+    nodes = await client.get(f"{API}/nomenclature/nodes")
+    nodes.raise_for_status()
+    ctx.node_ids = [item["id"] for item in nodes.json()]
+    ctx.class_node_ids = [
+        item["id"] for item in nodes.json() if item["node_type"] == "class"
+    ]
+    stage_list = await client.get(f"{API}/tenders/stages")
+    stage_list.raise_for_status()
+    ctx.stage_codes = [item["code"] for item in stage_list.json()]
+    if not (ctx.tender_ids and ctx.card_ids and ctx.node_ids):
+        raise SystemExit("No tenders, cards or nodes found: seed the database first")
+    return ctx
+
+
+async def run_scenario(
+    name: str,
+    client: httpx.AsyncClient,
+    ctx: Context,
+    rng: random.Random,
+    recorder: Recorder,
+    intended: Optional[float] = None,
+) -> None:
+    scenario, _ = SCENARIOS[name]
+    started = time.perf_counter() if intended is None else intended
+    try:
+        response = await scenario(client, ctx, rng)
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    recorder.record(name, started, ok)
+
+
+async def closed_loop(args, client, ctx, recorder, names, weights) -> None:
+    deadline = time.perf_counter() + args.warmup + args.duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(f"{args.seed}:{index}")
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=weights, k=1)[0]
+            await run_scenario(name, client, ctx, rng, recorder)
+
+    await asyncio.gather(*(user(i) for i in range(args.users)))
+
+
+async def open_loop(args, client, ctx, recorder, names, weights) -> None:
+    rng = random.Random(args.seed)
+    interval = 1 / args.rate
+    started = time.perf_counter()
+    total = int((args.warmup + args.duration) * args.rate)
+    tasks = []
+    for i in range(total):
+        due = started + i * interval
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        name = rng.choices(names, weights=weights, k=1)[0]
+        task_rng = random.Random(f"{args.seed}:{i}")
+        tasks.append(
+            asyncio.create_task(
+                run_scenario(name, client, ctx, task_rng, recorder, intended=due)
+            )
+        )
+    await asyncio.gather(*tasks)
+
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    names = [n for n in SCENARIOS if not args.only or n in args.only]
+    weights = [SCENARIOS[n][1] for n in names]
+    limits = httpx.Limits(
+        max_connections=args.users, max_keepalive_connections=args.users
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        await login(client, args.email, args.password)
+        ctx = await discover(client)
+        recorder = Recorder(record_from=time.perf_counter() + args.warmup)
+        driver = open_loop if args.rate else closed_loop
+        await driver(args, client, ctx, recorder, names, weights)
+    return recorder.summary(args.duration)
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """Scenarios whose p50 or p95 grew by more than `tolerance` (0.2 = 20%)."""
+    regressions = []
+    for name, stats in current.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if previous[metric] and stats[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {previous[metric]:.1f} -> {stats[metric]:.1f}"
+                )
+    return regressions
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--users", type=int, default=10, help="virtual users")
+    parser.add_argument("--rate", type=float, help="requests/s, open loop")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS))
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    scenarios = asyncio.run(run(args))
+
+    print(f"{'scenario':<16} {'reqs':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, stats in scenarios.items():
+        print(
+            f"{name:<16} {stats['requests']:>6} {stats['errors']:>4} "
+            f"{stats['p50_ms']:8.1f} {stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f}"
+        )
+
+    if args.output:
+        report = {
+            "meta": {
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "revision": _git_revision(),
+                "base_url": args.base_url,
+                "users": args.users,
+                "rate": args.rate,
+                "duration": args.duration,
+                "seed": args.seed,
+            },
+            "scenarios": scenarios,
+        }
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)["scenarios"]
+        regressions = compare(scenarios, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
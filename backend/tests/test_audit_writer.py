@@ -0,0 +1,60 @@
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from app.modules.tender_management.services import audit_writer as writer_module
+from app.modules.tender_management.services.audit_writer import (
+    DEFERRED_AUDIT_KEY,
+    AuditLogWriter,
+)
+
+
+class _FakeSession:
+    def __init__(self, sink):
+        self.sink = sink
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, rows):
+        self.sink.append(list(rows))
+
+    async def commit(self):
+        pass
+
+
+def test_writer_flushes_in_batches(monkeypatch):
+    batches = []
+    monkeypatch.setattr(
+        writer_module, "AsyncSessionLocal", lambda: _FakeSession(batches)
+    )
+    writer = AuditLogWriter(batch_size=2, flush_interval=60, max_pending=100)
+
+    async def scenario():
+        await writer.start()
+        writer.submit([{"action": "a"}, {"action": "b"}, {"action": "c"}])
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert writer.pending == 0
+
+
+def test_deferred_rows_follow_session_outcome(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(writer_module.audit_writer, "submit", submitted.extend)
+
+    session = Session()
+    session.info[DEFERRED_AUDIT_KEY] = [{"action": "stage_changed"}]
+    session.commit()
+    assert submitted == [{"action": "stage_changed"}]
+
+    session.info[DEFERRED_AUDIT_KEY] = [{"action": "file_uploaded"}]
+    session.begin()
+    session.rollback()
+    assert submitted == [{"action": "stage_changed"}]
+    assert DEFERRED_AUDIT_KEY not in session.info
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+from fastapi import Depends, FastAPI, Request, Response
+
+from app.core.conditional import check_not_modified
+
+
+class _VersionsSession:
+    """Stands in for AsyncSession: answers the table_versions lookup."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return list(self.rows)
+
+
+def _build_app(db, loads):
+    app = FastAPI()
+
+    @app.get("/stages")
+    async def stages(request: Request, response: Response, session=Depends(lambda: db)):
+        await check_not_modified(request, response, session, "stages")
+        loads.append(True)
+        return [{"code": "new"}]
+
+    return app
+
+
+def _get(app, path, **headers):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get(path, headers=headers)
+
+    return asyncio.run(run())
+
+
+def test_matching_etag_answers_304_without_loading_rows():
+    changed_at = datetime(2025, 12, 1, 9, 30, 15, 250000, tzinfo=timezone.utc)
+    db = _VersionsSession([("stages", 3, changed_at)])
+    loads = []
+    app = _build_app(db, loads)
+
+    first = _get(app, "/stages")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert first.headers["last-modified"] == "Mon, 01 Dec 2025 09:30:15 GMT"
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    second = _get(app, "/stages", **{"If-None-Match": f'"other", {etag}'})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert len(loads) == 1
+
+    by_date = _get(
+        app, "/stages", **{"If-Modified-Since": first.headers["last-modified"]}
+    )
+    assert by_date.status_code == 304
+
+    db.rows = [("stages", 4, changed_at)]
+    third = _get(app, "/stages", **{"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+    assert len(loads) == 2
+
+
+def test_etag_differs_between_query_strings():
+    db = _VersionsSession([("stages", 1, None)])
+    app = _build_app(db, [])
+
+    plain = _get(app, "/stages")
+    filtered = _get(app, "/stages?status=active")
+
+    assert "last-modified" not in plain.headers
+    assert plain.headers["etag"] != filtered.headers["etag"]
@@ -0,0 +1,68 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from app.core.executor import BoundedExecutor, ExecutorSaturatedError
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_run_uses_dedicated_threads_and_context():
+    executor = BoundedExecutor("test", max_workers=2, max_queue=0, acquire_timeout=1)
+
+    async def run():
+        _request_id.set("req-1")
+        return await executor.run(
+            lambda: (threading.current_thread().name, _request_id.get())
+        )
+
+    thread_name, request_id = asyncio.run(run())
+    executor.shutdown()
+
+    assert thread_name.startswith("test")
+    assert request_id == "req-1"
+    assert executor.stats()["completed"] == 1
+
+
+def test_run_rejects_when_saturated():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0, acquire_timeout=0.05)
+    release = threading.Event()
+
+    async def run():
+        busy = asyncio.create_task(executor.run(release.wait, 5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: None)
+        stats = executor.stats()
+        release.set()
+        await busy
+        return stats
+
+    stats = asyncio.run(run())
+    executor.shutdown()
+
+    assert stats["in_flight"] == 1
+    assert stats["rejected"] == 1
+    assert executor.stats()["in_flight"] == 0
+
+
+def test_queued_call_waits_for_free_slot():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1, acquire_timeout=0)
+    release = threading.Event()
+
+    async def run():
+        busy = asyncio.create_task(executor.run(release.wait, 5))
+        queued = asyncio.create_task(executor.run(lambda: "done"))
+        await asyncio.sleep(0.01)
+        stats = executor.stats()
+        release.set()
+        await busy
+        return stats, await queued
+
+    stats, result = asyncio.run(run())
+    executor.shutdown()
+
+    assert stats["queued"] == 1
+    assert result == "done"
@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import io
+import uuid
+
+import pytest
+
+import app.db.base  # noqa: F401
+from app.core.executor import BoundedExecutor, ExecutorSaturatedError
+from app.core.storage import StoredObject, hash_file
+from app.modules.tender_management.models.tender import FileBlob, TenderFile
+from app.modules.tender_management.services import file_service as file_module
+from app.modules.tender_management.services.file_service import FileService
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class _Session:
+    def __init__(self, blob):
+        self.blob = blob
+        self.info = {}
+        self.added = []
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result(self.blob)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+
+class _Upload:
+    def __init__(self, payload: bytes):
+        self.file = io.BytesIO(payload)
+        self.filename = "spec.pdf"
+        self.content_type = "application/pdf"
+
+
+class _Storage:
+    def __init__(self):
+        self.uploads = []
+
+    async def upload_stream(self, stream, object_name, content_type, length=None):
+        data = stream.read()
+        self.uploads.append((object_name, data))
+        return StoredObject(
+            object_name=object_name,
+            size=len(data),
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+
+
+def _blob(payload: bytes, ref_count: int) -> FileBlob:
+    sha256 = hashlib.sha256(payload).hexdigest()
+    return FileBlob(
+        sha256=sha256,
+        object_name=FileService.blob_object_name(sha256),
+        size=len(payload),
+        content_type="application/pdf",
+        ref_count=ref_count,
+    )
+
+
+def test_hash_file_rewinds_stream():
+    stream = io.BytesIO(b"x" * 5000)
+
+    size, sha256 = hash_file(stream, chunk_size=1024)
+
+    assert size == 5000
+    assert sha256 == hashlib.sha256(b"x" * 5000).hexdigest()
+    assert stream.tell() == 0
+
+
+def test_upload_writes_object_for_first_reference(monkeypatch):
+    payload = b"%PDF-1.7 spec"
+    fake_storage = _Storage()
+    monkeypatch.setattr(file_module, "storage", fake_storage)
+    db = _Session(_blob(payload, ref_count=1))
+
+    db_file = asyncio.run(
+        FileService.upload(db, 7, _Upload(payload), category="spec", user_id=USER_ID)
+    )
+
+    assert fake_storage.uploads == [(db_file.file_path, payload)]
+    assert db_file.file_path.startswith("blobs/")
+    assert db_file.sha256 == hashlib.sha256(payload).hexdigest()
+
+
+def test_upload_hashes_through_storage_executor(monkeypatch):
+    payload = b"%PDF-1.7 spec"
+    monkeypatch.setattr(file_module, "storage", _Storage())
+    executor = BoundedExecutor(
+        "test-storage", max_workers=1, max_queue=0, acquire_timeout=0.01
+    )
+    monkeypatch.setattr(file_module, "storage_executor", executor)
+    db = _Session(_blob(payload, ref_count=1))
+
+    async def upload_while_saturated():
+        executor._ensure_started()
+        await executor._slots.acquire()
+        await FileService.upload(
+            db, 7, _Upload(payload), category="spec", user_id=USER_ID
+        )
+
+    with pytest.raises(ExecutorSaturatedError):
+        asyncio.run(upload_while_saturated())
+    assert executor.stats()["rejected"] == 1
+    assert db.statements == []
+    executor.shutdown()
+
+
+def test_upload_skips_storage_for_known_content(monkeypatch):
+    payload = b"%PDF-1.7 spec"
+    fake_storage = _Storage()
+    monkeypatch.setattr(file_module, "storage", fake_storage)
+    db = _Session(_blob(payload, ref_count=3))
+
+    db_file = asyncio.run(
+        FileService.upload(db, 7, _Upload(payload), category="spec", user_id=USER_ID)
+    )
+
+    assert fake_storage.uploads == []
+    assert isinstance(db_file, TenderFile)
+    assert db_file.size == len(payload)
+    audit = [obj for obj in db.added if obj is not db_file][0]
+    assert audit.details["deduplicated"] is True
+
+
+def test_delete_removes_object_only_after_release_is_committed(monkeypatch):
+    payload = b"%PDF-1.7 spec"
+    blob = _blob(payload, ref_count=1)
+    record = TenderFile(
+        id=5,
+        tender_id=7,
+        filename="spec.pdf",
+        file_path=blob.object_name,
+        category="spec",
+        sha256=blob.sha256,
+        uploaded_by_id=USER_ID,
+        is_archived=False,
+    )
+    events = []
+
+    class _DeleteSession(_Session):
+        async def execute(self, statement):
+            self.statements.append(statement)
+            # select of the record, then the ref_count decrement
+            return _Result(record if len(self.statements) == 1 else 0)
+
+        async def scalar(self, statement):
+            events.append("lock")
+            return blob.sha256
+
+        async def commit(self):
+            events.append("commit")
+
+    class _DeletingStorage:
+        async def delete_file(self, object_name):
+            events.append(("delete", object_name))
+
+    monkeypatch.setattr(file_module, "storage", _DeletingStorage())
+
+    assert asyncio.run(FileService.delete(_DeleteSession(blob), 5, USER_ID))
+    assert events == ["commit", "lock", ("delete", blob.object_name), "commit"]
+    assert record.is_archived is True
+
+
+def test_attach_by_hash_is_limited_to_content_the_user_has_seen():
+    blob = _blob(b"%PDF-1.7 spec", ref_count=2)
+
+    db = _Session(blob)
+    asyncio.run(
+        FileService.attach_blob(db, 7, blob.sha256, "spec.pdf", "spec", USER_ID)
+    )
+    restricted = str(db.statements[0].compile())
+
+    db = _Session(blob)
+    asyncio.run(
+        FileService.attach_blob(
+            db, 7, blob.sha256, "spec.pdf", "spec", USER_ID, restrict_to_user=False
+        )
+    )
+    unrestricted = str(db.statements[0].compile())
+
+    assert "EXISTS" in restricted
+    assert "tender_files.uploaded_by_id" in restricted
+    assert "tender_files.tender_id" in restricted
+    assert "EXISTS" not in unrestricted
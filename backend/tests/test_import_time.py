@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Clients that are only needed by some requests; each costs from tens of
+# milliseconds (jsonschema) to over half a second (openai) per worker start.
+LAZY_MODULES = ("openai", "minio", "jsonschema")
+
+
+def _import_report(module: str):
+    """
+    Imports `module` in a fresh interpreter under -X importtime and returns
+    {module name: cumulative microseconds}.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONPATH": str(BACKEND_DIR)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        report[name.strip()] = int(cumulative)
+    return report
+
+
+def test_app_import_leaves_heavy_clients_for_first_use():
+    report = _import_report("app.main")
+
+    assert "app.main" in report
+    assert [name for name in LAZY_MODULES if name in report] == []
+
+    slowest = sorted(
+        (item for item in report.items() if item[0].startswith("app.")),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:10]
+    print("\n".join(f"{us / 1000:8.1f} ms  {name}" for name, us in slowest))
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core import metrics
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _build_app():
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics-test/items/{item_id}")
+    async def read_item(item_id: int):
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    return app
+
+
+def _get(app, path):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get(path)
+
+    return asyncio.run(run())
+
+
+def test_request_is_labelled_by_route_template_and_counts_sql():
+    route = "/metrics-test/items/{item_id}"
+    labels = {"method": "GET", "route": route}
+    before_requests = _sample(
+        "http_request_duration_seconds_count", status="200", **labels
+    )
+    before_statements = _sample("db_statements_per_request_sum", **labels)
+
+    app = _build_app()
+    assert _get(app, "/metrics-test/items/1").status_code == 200
+    assert _get(app, "/metrics-test/items/2").status_code == 200
+
+    assert (
+        _sample("http_request_duration_seconds_count", status="200", **labels)
+        == before_requests + 2
+    )
+    assert _sample("db_statements_per_request_sum", **labels) == before_statements + 6
+
+
+def test_unmatched_paths_share_one_series():
+    before = _sample(
+        "http_request_duration_seconds_count",
+        method="GET",
+        route="unmatched",
+        status="404",
+    )
+    app = _build_app()
+    _get(app, "/no/such/path/1")
+    _get(app, "/no/such/path/2")
+
+    assert (
+        _sample(
+            "http_request_duration_seconds_count",
+            method="GET",
+            route="unmatched",
+            status="404",
+        )
+        == before + 2
+    )
+
+
+def test_statements_outside_requests_are_not_attributed():
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    with metrics.track_db_usage() as usage:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert usage.statements == 1
+    assert usage.seconds > 0
+
+
+def test_render_exposes_registered_metrics():
+    payload, content_type = metrics.render()
+
+    assert content_type.startswith("text/plain")
+    assert b"http_request_duration_seconds" in payload
+    assert b"storage_operation_duration_seconds" in payload
+
+
+def test_failed_statement_does_not_leave_its_start_time_behind():
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    with metrics.track_db_usage() as usage:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.rollback()
+            conn.execute(text("SELECT 1"))
+            assert conn.info["query_started_at"] == []
+
+    assert usage.statements == 2
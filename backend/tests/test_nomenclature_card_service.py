@@ -1,12 +1,17 @@
-from datetime import UTC, datetime
+import json
+import uuid
+from datetime import UTC, datetime, timedelta, timezone
 from decimal import Decimal
 
 import app.db.base  # noqa: F401
+from app.core.responses import FastJSONResponse
 from app.modules.pricing_kb_ai.enums import LifecycleStatus
 from app.modules.pricing_kb_ai.models.nomenclature import Nomenclature
 from app.modules.pricing_kb_ai.models.nomenclature_card_metadata import (
     NomenclatureCardSynonym,
+    NomenclatureCardUsage,
 )
+from app.modules.pricing_kb_ai.schemas.nomenclature_cards import NomenclatureCard
 from app.modules.pricing_kb_ai.services.nomenclature_cards import (
     NomenclatureCardService,
 )
@@ -60,3 +65,100 @@ def test_serialize_card_returns_expected_schema():
     assert serialized.related_nomenclature_ids == [10, 20]
     assert serialized.price_confidence == card.price_confidence
     assert serialized.search_confidence == 0.73
+
+
+def _loaded_card() -> Nomenclature:
+    """A card with every column set, as rows loaded from the database are."""
+    now = datetime(2025, 3, 1, 12, 30, 15, 250000, tzinfo=UTC)
+    card = Nomenclature(
+        id=7,
+        code="AA-000007",
+        canonical_name="Задвижка DN50",
+        node_id=3,
+        node_version=2,
+        segment_code="AA",
+        family_code="AA.BB",
+        class_code="AA.BB.CC",
+        category_code="AA.BB.CC.DD",
+        type="valve",
+        category=None,
+        subclass=None,
+        lifecycle_status=LifecycleStatus.ACTIVE,
+        lifecycle_reason=None,
+        effective_from=now,
+        effective_to=now.astimezone(timezone(timedelta(hours=3))),
+        attributes_payload={"dn": 50, "nested": {"pn": [16, 25]}},
+        files=[
+            {
+                "type": "datasheet",
+                "storage_key": "s3://file",
+                "uploaded_at": "2025-01-01T00:00:00+00:00",
+                "unexpected": True,
+            }
+        ],
+        methodology_ids=[],
+        manufacturer="ACME",
+        standard_document=None,
+        article=None,
+        base_price=Decimal("15250.00"),
+        cost_price=None,
+        price_currency="RUB",
+        price_source=None,
+        price_valid_until=None,
+        price_confidence=Decimal("0.85"),
+        usage_count=3,
+        average_price=Decimal("1E+2"),
+        version=4,
+        tags=None,
+        related_nomenclature_ids=[1],
+        created_by_id=uuid.uuid4(),
+        last_editor_id=None,
+        last_reviewed_at=None,
+        audit_log_id=None,
+        created_at=now,
+    )
+    card.synonym_records = [NomenclatureCardSynonym(value="Alias", locale="en-US")]
+    card.usage_records = [
+        NomenclatureCardUsage(
+            position_id=5,
+            usage_count=2,
+            average_price=Decimal("99.90"),
+            last_used_at=now,
+        )
+    ]
+    return card
+
+
+def test_fast_payload_encodes_exactly_like_the_response_model():
+    card = _loaded_card()
+
+    fast = FastJSONResponse(NomenclatureCardService.to_payload(card)).body
+    model = NomenclatureCard.model_validate(
+        NomenclatureCardService.to_payload(card)
+    ).model_dump_json()
+
+    assert fast == model.encode()
+    assert json.loads(fast)["files"][0] == {
+        "type": "datasheet",
+        "storage_key": "s3://file",
+        "hash": None,
+        "source": None,
+        "uploaded_at": "2025-01-01T00:00:00Z",
+        "file_token": None,
+    }
+
+
+def test_fully_loaded_card_skips_attribute_access(monkeypatch):
+    from app.modules.pricing_kb_ai.services import nomenclature_cards
+
+    card = _loaded_card()
+    for prop in Nomenclature.__mapper__.column_attrs:
+        if prop.key not in card.__dict__:
+            setattr(card, prop.key, None)
+
+    def _fail(obj):
+        raise AssertionError("fell back to attribute access")
+
+    monkeypatch.setattr(nomenclature_cards, "_AttributeView", _fail)
+
+    assert NomenclatureCardService.to_payload(card)["code"] == card.code
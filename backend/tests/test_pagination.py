@@ -0,0 +1,65 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.modules.tender_management.services.audit_service import AuditService
+from app.modules.tender_management.services.tender_service import TenderService
+
+
+def test_cursor_round_trip_keeps_values():
+    created_at = datetime(2025, 12, 1, 10, 15, tzinfo=UTC)
+
+    cursor = encode_cursor(created_at, 42)
+    value, last_id = decode_cursor(cursor, 2)
+
+    assert datetime.fromisoformat(value) == created_at
+    assert last_id == 42
+
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!", 2)
+
+
+def test_cursor_rejects_wrong_arity():
+    cursor = encode_cursor("T-2024-001")
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+class _UnusedSession:
+    async def execute(self, statement):
+        raise AssertionError("a bad cursor must be rejected before querying")
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ("2025-12-01T10:15:00+00:00", "42"),
+        ("2025-12-01T10:15:00+00:00", True),
+        ({"a": 1}, 42),
+        (1733048100, 42),
+        ("yesterday", 42),
+    ],
+)
+def test_services_reject_tampered_cursor_values(values):
+    cursor = encode_cursor(*values)
+
+    with pytest.raises(ValueError):
+        asyncio.run(TenderService.search(_UnusedSession(), cursor=cursor))
+    with pytest.raises(ValueError):
+        asyncio.run(
+            AuditService.list_for_tender(_UnusedSession(), tender_id=1, cursor=cursor)
+        )
+
+
+def test_number_sort_rejects_non_string_value():
+    cursor = encode_cursor(7, 42)
+
+    with pytest.raises(ValueError):
+        asyncio.run(
+            TenderService.search(_UnusedSession(), sort_by="number", cursor=cursor)
+        )
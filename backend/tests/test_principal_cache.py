@@ -0,0 +1,225 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+import app.db.base  # noqa: F401
+from app.modules.auth.models.user import User
+from app.modules.auth.services import principal_cache as cache_module
+from app.modules.auth.services.principal_cache import Principal, PrincipalCache
+
+
+class _Scalars:
+    def __init__(self, user):
+        self.user = user
+
+    def first(self):
+        return self.user
+
+
+class _Result:
+    def __init__(self, user):
+        self.user = user
+
+    def scalars(self):
+        return _Scalars(self.user)
+
+
+class _UsersSession:
+    def __init__(self, user):
+        self.user = user
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return _Result(self.user)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value.encode()
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, key):
+        self.commands.append(("delete", key))
+
+    async def execute(self):
+        if self.redis.down:
+            raise ConnectionError("redis is down")
+        for command, key in self.commands:
+            if command == "incr":
+                self.redis.data[key] = str(int(self.redis.data.get(key, 0)) + 1)
+            else:
+                self.redis.data.pop(key, None)
+
+
+def _user() -> User:
+    return User(
+        id=uuid.uuid4(),
+        email="engineer@example.com",
+        full_name="Инженер",
+        hashed_password="x",
+        is_active=True,
+        is_superuser=False,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache(monkeypatch):
+    PrincipalCache._local.clear()
+    PrincipalCache._pending_invalidations.clear()
+    yield
+    PrincipalCache._local.clear()
+    PrincipalCache._pending_invalidations.clear()
+
+
+def _use_redis(monkeypatch, redis):
+    async def get_redis():
+        return redis
+
+    monkeypatch.setattr(cache_module, "get_redis", get_redis)
+
+
+def test_principal_is_loaded_once_and_served_from_memory(monkeypatch):
+    _use_redis(monkeypatch, None)
+    user = _user()
+    db = _UsersSession(user)
+
+    async def run():
+        first = await PrincipalCache.get(db, user.id)
+        second = await PrincipalCache.get(db, user.id)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert db.queries == 1
+    assert first is second
+    assert first.email == user.email
+    assert not hasattr(first, "hashed_password")
+
+
+def test_redis_entry_is_used_by_other_workers(monkeypatch):
+    redis = _FakeRedis()
+    _use_redis(monkeypatch, redis)
+    user = _user()
+    db = _UsersSession(user)
+
+    async def run():
+        await PrincipalCache.get(db, user.id)
+        PrincipalCache._local.clear()  # another worker: cold local cache
+        return await PrincipalCache.get(db, user.id)
+
+    principal = asyncio.run(run())
+
+    assert db.queries == 1
+    assert principal == Principal.from_user(user)
+
+
+def test_invalidate_forces_reload(monkeypatch):
+    redis = _FakeRedis()
+    _use_redis(monkeypatch, redis)
+    user = _user()
+    db = _UsersSession(user)
+
+    async def run():
+        await PrincipalCache.get(db, user.id)
+        user.is_active = False
+        await PrincipalCache.invalidate(user.id)
+        return await PrincipalCache.get(db, user.id)
+
+    principal = asyncio.run(run())
+
+    assert db.queries == 2
+    assert principal.is_active is False
+
+
+def test_reader_cannot_cache_a_row_loaded_before_invalidation(monkeypatch):
+    redis = _FakeRedis()
+    _use_redis(monkeypatch, redis)
+    user = _user()
+
+    class _SlowSession(_UsersSession):
+        async def execute(self, statement):
+            result = await super().execute(statement)
+            if self.queries == 1:
+                # The update commits and invalidates while this read is
+                # still on its way back with the old row
+                stale = Principal.from_user(user)
+                user.is_active = False
+                await PrincipalCache.invalidate(user.id)
+                return _Result(_user_from(stale))
+            return result
+
+    db = _SlowSession(user)
+
+    async def run():
+        await PrincipalCache.get(db, user.id)
+        PrincipalCache._local.clear()  # another worker
+        return await PrincipalCache.get(db, user.id)
+
+    principal = asyncio.run(run())
+
+    assert db.queries == 2
+    assert principal.is_active is False
+
+
+def test_invalidation_missed_by_redis_is_replayed(monkeypatch):
+    redis = _FakeRedis()
+    _use_redis(monkeypatch, redis)
+    user = _user()
+    db = _UsersSession(user)
+
+    async def run():
+        await PrincipalCache.get(db, user.id)
+        user.is_active = False
+        redis.down = True
+        await PrincipalCache.invalidate(user.id)
+        redis.down = False
+        PrincipalCache._local.clear()  # another worker, Redis is back
+        return await PrincipalCache.get(db, user.id)
+
+    principal = asyncio.run(run())
+
+    assert principal.is_active is False
+    assert PrincipalCache._pending_invalidations == set()
+
+
+def _user_from(principal: Principal) -> User:
+    return User(
+        id=principal.id,
+        email=principal.email,
+        full_name=principal.full_name,
+        hashed_password="x",
+        is_active=principal.is_active,
+        is_superuser=principal.is_superuser,
+        created_at=principal.created_at,
+    )
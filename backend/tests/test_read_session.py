@@ -0,0 +1,29 @@
+from app.api.v1.api import api_router
+from app.db.session import AsyncReadSessionLocal, get_db
+
+
+def test_read_sessions_use_autocommit():
+    bind = AsyncReadSessionLocal.kw["bind"]
+
+    assert bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+
+
+def test_get_endpoints_do_not_open_write_sessions():
+    offenders = []
+    for route in api_router.routes:
+        if "GET" not in getattr(route, "methods", ()):
+            continue
+        direct = {dep.call for dep in route.dependant.dependencies}
+        if get_db in direct:
+            offenders.append(route.path)
+
+    assert offenders == []
+
+
+def test_engine_uses_pool_settings():
+    from app.core.config import settings
+    from app.db.session import engine, pool_stats
+
+    assert engine.echo is False
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert pool_stats()["primary"]["checked_out"] == 0
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import redis as redis_module
+from app.core.redis import CircuitBreaker
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock):
+    return CircuitBreaker(
+        failure_threshold=3, backoff=1.0, max_backoff=4.0, clock=clock
+    )
+
+
+def test_opens_after_threshold_and_backs_off_exponentially():
+    clock = _Clock()
+    breaker = _breaker(clock)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    backoffs = []
+    for _ in range(4):
+        clock.now = breaker.retry_at
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()  # one probe at a time
+        breaker.record_failure()
+        backoffs.append(breaker.retry_at - clock.now)
+    assert backoffs == [2.0, 4.0, 4.0, 4.0]
+
+    clock.now = breaker.retry_at
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.backoff == 1.0
+
+
+class _DownRedis:
+    def __init__(self):
+        self.pings = 0
+
+    async def ping(self):
+        self.pings += 1
+        breaker = redis_module.breaker
+        breaker.record_failure()
+        raise RedisConnectionError("Connection refused")
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    clock = _Clock()
+    breaker = _breaker(clock)
+    monkeypatch.setattr(redis_module, "breaker", breaker)
+    monkeypatch.setattr(redis_module, "_redis", None)
+    return breaker
+
+
+def test_get_redis_skips_redis_while_open_and_probes_once(monkeypatch, breaker):
+    client = _DownRedis()
+    monkeypatch.setattr(redis_module, "_create_client", lambda: client)
+    for _ in range(3):
+        breaker.record_failure()
+
+    async def run():
+        return [await redis_module.get_redis() for _ in range(50)]
+
+    assert asyncio.run(run()) == [None] * 50
+    assert client.pings == 0
+
+    breaker._clock.now = breaker.retry_at
+    assert asyncio.run(run()) == [None] * 50
+    assert client.pings == 1
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.backoff == 2.0
+
+
+def test_pool_wait_timeout_does_not_count_as_redis_failure(breaker):
+    pool = redis_module.BoundedConnectionPool(max_connections=1, timeout=0.01)
+    client = redis_module.InstrumentedRedis(connection_pool=pool)
+    # The only connection is taken by someone else
+    pool._in_use_connections.add(pool.make_connection())
+
+    async def run():
+        for _ in range(5):
+            with pytest.raises(redis_module.RedisPoolExhaustedError):
+                await client.get("key")
+
+    asyncio.run(run())
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
@@ -1,5 +1,8 @@
+import asyncio
+
 import pytest
 
+from app.modules.pricing_kb_ai.services import schema_registry
 from app.modules.pricing_kb_ai.services.schema_registry import (
     SchemaRegistry,
     SchemaRegistryEntry,
@@ -62,3 +65,60 @@ def test_exclude_properties_removes_required():
 
     assert "model" not in result["properties"]
     assert result["required"] == ["power"]
+
+
+def test_entries_are_served_from_memory_without_redis(monkeypatch):
+    fetched = []
+
+    async def no_redis():
+        return None
+
+    async def fetch(db, node_id):
+        fetched.append(node_id)
+        return _make_entry()
+
+    monkeypatch.setattr(schema_registry, "get_redis", no_redis)
+    monkeypatch.setattr(SchemaRegistry, "_fetch_from_db", fetch)
+    SchemaRegistry._local.clear()
+
+    async def run():
+        for _ in range(3):
+            await SchemaRegistry.get_entry(None, 1)
+        await SchemaRegistry.invalidate_cache(1)
+        return await SchemaRegistry.get_entry(None, 1)
+
+    entry = asyncio.run(run())
+    SchemaRegistry._local.clear()
+
+    assert entry.version == 1
+    assert fetched == [1, 1]
+
+
+def test_warm_compiles_validators_and_skips_nodes_without_schema(monkeypatch):
+    class _NodeIds:
+        async def execute(self, statement):
+            class _Result:
+                def scalars(self):
+                    return self
+
+                def all(self):
+                    return [1, 2]
+
+            return _Result()
+
+    async def no_redis():
+        return None
+
+    async def fetch(db, node_id):
+        return _make_entry() if node_id == 1 else None
+
+    monkeypatch.setattr(schema_registry, "get_redis", no_redis)
+    monkeypatch.setattr(SchemaRegistry, "_fetch_from_db", fetch)
+    SchemaRegistry._local.clear()
+    SchemaRegistry._adapter_cache.clear()
+
+    warmed = asyncio.run(SchemaRegistry.warm(_NodeIds(), 10))
+    SchemaRegistry._local.clear()
+
+    assert warmed == 1
+    assert list(SchemaRegistry._adapter_cache) == [(1, 1)]
@@ -0,0 +1,29 @@
+import asyncio
+import threading
+
+from app.core import security
+
+
+def test_password_helpers_run_on_password_executor(monkeypatch):
+    threads = []
+
+    def fake_hash(password):
+        threads.append(threading.current_thread().name)
+        return f"hashed:{password}"
+
+    def fake_verify(plain, hashed):
+        threads.append(threading.current_thread().name)
+        return hashed == f"hashed:{plain}"
+
+    monkeypatch.setattr(security, "get_password_hash", fake_hash)
+    monkeypatch.setattr(security, "verify_password", fake_verify)
+
+    async def run():
+        hashed = await security.get_password_hash_async("secret")
+        return (
+            await security.verify_password_async("secret", hashed),
+            await security.verify_password_async("wrong", hashed),
+        )
+
+    assert asyncio.run(run()) == (True, False)
+    assert all(name.startswith("password") for name in threads)
@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core import sql_profiler
+from app.core.sql_profiler import SqlProfilerMiddleware, statement_shape
+
+
+@pytest.fixture(autouse=True)
+def _reset_report():
+    SqlProfilerMiddleware.reset()
+    yield
+    SqlProfilerMiddleware.reset()
+
+
+def _build_app(explained, **options):
+    engine = create_engine("sqlite://")
+    sql_profiler.instrument_engine(engine)
+
+    async def explain(statement):
+        explained.append(statement)
+        return "Result  (cost=0.00..0.01 rows=1 width=4)"
+
+    app = FastAPI()
+    app.add_middleware(
+        SqlProfilerMiddleware,
+        sample_rate=1.0,
+        repeat_threshold=options.get("repeat_threshold", 5),
+        slow_statement_ms=options.get("slow_statement_ms", 10_000),
+        explain=explain,
+    )
+
+    @app.get("/nodes/{node_id}/chain")
+    async def chain(node_id: int):
+        # Walks parents one query at a time, the classic N+1 shape
+        with engine.connect() as conn:
+            for parent in range(node_id):
+                conn.execute(text("SELECT :id AS id"), {"id": parent})
+        return {"depth": node_id}
+
+    return app
+
+
+def _get(app, path):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.get(path)
+
+    return asyncio.run(run())
+
+
+def test_statement_shape_collapses_placeholders_and_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN ($1, $2, $3)") == (
+        "SELECT * FROM t WHERE id IN (?)"
+    )
+    assert statement_shape("INSERT INTO t (a) VALUES (?), (?), (?)") == (
+        "INSERT INTO t (a) VALUES (?)"
+    )
+    assert statement_shape("SELECT  a::text\n FROM t WHERE b = $7") == (
+        "SELECT a::text FROM t WHERE b = ?"
+    )
+
+
+def test_repeated_statements_are_flagged_in_report():
+    app = _build_app([], repeat_threshold=5)
+
+    _get(app, "/nodes/12/chain")
+    _get(app, "/nodes/2/chain")
+
+    report = SqlProfilerMiddleware.report()["GET /nodes/{node_id}/chain"]
+    assert report["requests"] == 2
+    assert report["max_statements"] == 12
+    assert report["avg_statements"] == 7.0
+    assert report["max_repeats"] == 12
+    assert report["worst_shape"] == "SELECT ? AS id"
+
+
+def test_slow_statements_are_explained_once_per_shape():
+    explained = []
+    app = _build_app(explained, slow_statement_ms=0)
+
+    _get(app, "/nodes/3/chain")
+    _get(app, "/nodes/3/chain")
+
+    assert explained == ["SELECT ? AS id"]
+
+
+def test_failed_statement_is_profiled_and_unwound():
+    engine = create_engine("sqlite://")
+    sql_profiler.instrument_engine(engine)
+    profile = sql_profiler.QueryProfile(slow_threshold_seconds=10)
+    token = sql_profiler._profile.set(profile)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.rollback()
+            conn.execute(text("SELECT 1"))
+            assert conn.info["profiler_started_at"] == []
+    finally:
+        sql_profiler._profile.reset(token)
+
+    assert profile.statements == 2
@@ -0,0 +1,108 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+import app.db.base  # noqa: F401
+from app.modules.tender_management.enums import StageCode
+from app.modules.tender_management.models.stage import Stage, StageTransition
+from app.modules.tender_management.services.stage_graph import StageGraph
+from app.modules.tender_management.services.stage_service import StageService
+
+
+def _make_graph() -> StageGraph:
+    stages = [
+        Stage(id=1, name="Обнаружен", code=StageCode.DISCOVERED, order=1),
+        Stage(id=2, name="На рассмотрении", code=StageCode.REVIEWING, order=2),
+        Stage(
+            id=3,
+            name="Подготовка документов",
+            code=StageCode.PREPARING_DOCS,
+            order=5,
+            requires_all_positions_calculated=True,
+        ),
+    ]
+    transitions = [
+        StageTransition(from_stage_id=1, to_stage_id=2),
+        StageTransition(from_stage_id=2, to_stage_id=3),
+    ]
+    return StageGraph.build(stages, transitions)
+
+
+def test_transition_target_follows_graph():
+    graph = _make_graph()
+
+    target = graph.transition_target(1, StageCode.REVIEWING)
+
+    assert target is not None
+    assert target.id == 2
+    assert graph.transition_target(1, StageCode.PREPARING_DOCS) is None
+
+
+def test_transition_target_unknown_code():
+    graph = _make_graph()
+
+    assert graph.transition_target(1, "nonexistent") is None
+    assert not graph.knows(1, "nonexistent")
+    assert not graph.knows(99, StageCode.REVIEWING)
+
+
+def test_build_keeps_stage_conditions():
+    graph = _make_graph()
+
+    assert graph.by_code[StageCode.PREPARING_DOCS].requires_all_positions_calculated
+    assert not graph.by_id[1].requires_all_positions_calculated
+
+
+class _CountsResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _CountsSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        return _CountsResult(self.rows)
+
+
+def test_unmet_conditions_checks_positions_in_one_query():
+    graph = _make_graph()
+    target = graph.by_code[StageCode.PREPARING_DOCS]
+    # tender 10: all calculated, 11: partially, 12: no positions
+    db = _CountsSession([(10, 3, 3), (11, 4, 1)])
+
+    failures = asyncio.run(StageService.unmet_conditions(db, target, [10, 11, 12]))
+
+    assert db.queries == 1
+    assert 10 not in failures
+    assert "3 of 4" in failures[11]
+    assert 12 in failures
+
+
+def test_unmet_conditions_skips_query_without_conditions():
+    graph = _make_graph()
+    db = _CountsSession([])
+
+    failures = asyncio.run(
+        StageService.unmet_conditions(db, graph.by_code[StageCode.REVIEWING], [10])
+    )
+
+    assert failures == {}
+    assert db.queries == 0
+
+
+def test_graph_cannot_be_changed_after_build():
+    graph = _make_graph()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        graph.by_id = {}
+    with pytest.raises(TypeError):
+        graph.by_code[StageCode.DISCOVERED] = graph.by_id[2]
+    assert isinstance(graph.transitions, frozenset)
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from app.core.executor import BoundedExecutor, ExecutorSaturatedError
+from app.core.storage import HashingReader, StorageClient
+
+
+class _FakeMinio:
+    def __init__(self, part_size: int) -> None:
+        self.part_size = part_size
+        self.calls = []
+        self.received = b""
+
+    def put_object(self, bucket_name, object_name, data, length, **kwargs):
+        self.calls.append((bucket_name, object_name, length, kwargs))
+        while True:
+            chunk = data.read(self.part_size)
+            if not chunk:
+                break
+            self.received += chunk
+
+
+def test_hashing_reader_hashes_and_counts_chunked_reads():
+    payload = b"drawing" * 1000
+    reader = HashingReader(io.BytesIO(payload))
+
+    while reader.read(333):
+        pass
+
+    assert reader.size == len(payload)
+    assert reader.hexdigest() == hashlib.sha256(payload).hexdigest()
+
+
+def test_upload_stream_uses_multipart_settings(monkeypatch):
+    from app.core import storage as storage_module
+
+    monkeypatch.setattr(storage_module.settings, "MINIO_UPLOAD_PART_SIZE", 1024)
+    monkeypatch.setattr(storage_module.settings, "MINIO_UPLOAD_PARALLELISM", 2)
+    client = StorageClient()
+    client._client = _FakeMinio(part_size=1024)
+    client.bucket_name = "bucket"
+    payload = bytes(range(256)) * 20
+
+    stored = client._upload_stream_sync(
+        io.BytesIO(payload), "1/file.pdf", "application/pdf", None
+    )
+
+    assert client.client.received == payload
+    bucket, name, length, kwargs = client.client.calls[0]
+    assert (bucket, name, length) == ("bucket", "1/file.pdf", -1)
+    assert kwargs["part_size"] == 1024
+    assert kwargs["num_parallel_uploads"] == 2
+    assert stored.size == len(payload)
+    assert stored.sha256 == hashlib.sha256(payload).hexdigest()
+
+
+class _SigningMinio:
+    def __init__(self):
+        self.calls = 0
+
+    def presigned_get_object(self, bucket_name, object_name, expires):
+        self.calls += 1
+        return f"https://minio/{bucket_name}/{object_name}?sig={self.calls}"
+
+
+def _signing_client() -> StorageClient:
+    client = StorageClient()
+    client._client = _SigningMinio()
+    client.bucket_name = "bucket"
+    return client
+
+
+def test_presigned_url_is_reused_for_half_its_lifetime(monkeypatch):
+    from app.core import storage as storage_module
+
+    client = _signing_client()
+    now = [1000.0]
+    monkeypatch.setattr(storage_module.time, "monotonic", lambda: now[0])
+
+    first = client.presigned_url("blobs/ab/abc", expires_hours=1)
+    now[0] += 1799
+    assert client.presigned_url("blobs/ab/abc", expires_hours=1) == first
+    now[0] += 2
+    assert client.presigned_url("blobs/ab/abc", expires_hours=1) != first
+    assert client.client.calls == 2
+
+
+def test_presigned_url_cache_is_bounded(monkeypatch):
+    from app.core import storage as storage_module
+
+    monkeypatch.setattr(storage_module.settings, "MINIO_PRESIGN_CACHE_SIZE", 2)
+    client = _signing_client()
+
+    for name in ("a", "b", "c"):
+        client.presigned_url(name)
+
+    assert list(key for key, _ in client._url_cache) == ["b", "c"]
+
+
+def test_storage_client_does_not_connect_until_used():
+    client = StorageClient()
+
+    assert client._client is None
+
+
+def test_check_health_reports_unreachable_storage():
+    class _DownMinio:
+        def bucket_exists(self, bucket_name):
+            raise ConnectionError("connection refused")
+
+    client = StorageClient()
+    client._client = _DownMinio()
+
+    assert asyncio.run(client.check_health()) is False
+
+
+def test_open_object_admits_once_and_streams_while_executor_is_full(monkeypatch):
+    from app.core import storage as storage_module
+
+    class _Response:
+        closed = False
+
+        def stream(self, chunk_size):
+            yield from (b"a" * chunk_size, b"b" * chunk_size, b"c")
+
+        def close(self):
+            self.closed = True
+
+        def release_conn(self):
+            pass
+
+    response = _Response()
+
+    class _ReadingMinio:
+        def get_object(self, bucket_name, object_name, offset, length):
+            return response
+
+    executor = BoundedExecutor("test", max_workers=2, max_queue=0, acquire_timeout=0)
+    monkeypatch.setattr(storage_module, "storage_executor", executor)
+    monkeypatch.setattr(storage_module.settings, "MINIO_DOWNLOAD_CHUNK_SIZE", 4)
+    client = StorageClient()
+    client._client = _ReadingMinio()
+
+    async def run():
+        chunks = await client.open_object("blobs/ab/abc")
+        # Every slot admitted elsewhere: new work is rejected, chunk reads
+        # of the opened stream go on
+        for _ in range(2):
+            await executor._slots.acquire()
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: None)
+        return b"".join([chunk async for chunk in chunks])
+
+    body = asyncio.run(run())
+    executor.shutdown()
+
+    assert body == b"aaaabbbbc"
+    assert response.closed
+    assert executor.stats()["rejected"] == 1
@@ -0,0 +1,103 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+from app.core.streaming import (
+    ZipEntry,
+    content_disposition,
+    parse_byte_range,
+    stream_zip,
+    unique_names,
+)
+
+
+def test_parse_byte_range_variants():
+    assert parse_byte_range(None, 100) is None
+    assert parse_byte_range("bytes=0-9", 100) == (0, 9)
+    assert parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert parse_byte_range("bytes=-10", 100) == (90, 99)
+    assert parse_byte_range("bytes=50-500", 100) == (50, 99)
+    # Ignored: whole object is served
+    assert parse_byte_range("bytes=0-1,5-6", 100) is None
+    assert parse_byte_range("items=0-1", 100) is None
+    assert parse_byte_range("bytes=a-b", 100) is None
+
+
+def test_parse_byte_range_unsatisfiable():
+    with pytest.raises(ValueError):
+        parse_byte_range("bytes=100-", 100)
+
+
+def test_content_disposition_keeps_unicode_name():
+    header = content_disposition("ТЗ.pdf")
+
+    assert 'filename="??.pdf"' in header
+    assert "filename*=UTF-8''%D0%A2%D0%97.pdf" in header
+
+
+def test_unique_names_suffixes_repeats():
+    names = list(unique_names(["spec.pdf", "spec.pdf", "README", "README"]))
+
+    assert names == ["spec.pdf", "spec (2).pdf", "README", "README (2)"]
+
+
+def _source(payload: bytes, chunk: int = 7):
+    async def generate():
+        for i in range(0, len(payload), chunk):
+            await asyncio.sleep(0)
+            yield payload[i : i + chunk]
+
+    return generate
+
+
+async def _collect(iterator) -> bytes:
+    return b"".join([chunk async for chunk in iterator])
+
+
+def test_stream_zip_builds_readable_archive():
+    files = {"a.pdf": b"A" * 100, "b.dwg": b"", "c.txt": bytes(range(256))}
+    entries = [
+        ZipEntry(
+            name=name,
+            open=_source(data),
+            size=len(data) if name != "c.txt" else None,
+        )
+        for name, data in files.items()
+    ]
+
+    data = asyncio.run(_collect(stream_zip(entries, prefetch=1, depth=2)))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == list(files)
+        for name, payload in files.items():
+            assert archive.read(name) == payload
+
+
+def test_stream_zip_cancels_readers_when_closed():
+    started = []
+
+    def endless(name):
+        async def generate():
+            started.append(name)
+            while True:
+                await asyncio.sleep(0)
+                yield b"x" * 10
+
+        return generate
+
+    async def run():
+        entries = [ZipEntry(name=str(i), open=endless(str(i))) for i in range(5)]
+        iterator = stream_zip(entries, prefetch=1, depth=2)
+        await iterator.__anext__()
+        await iterator.aclose()
+        await asyncio.sleep(0)
+        return [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+
+    leftover = asyncio.run(run())
+
+    assert started == ["0", "1"]
+    assert all(task.cancelled() or task.done() for task in leftover)
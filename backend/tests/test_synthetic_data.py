@@ -0,0 +1,62 @@
+from itertools import islice
+
+from jsonschema import Draft202012Validator
+
+from app.db.synthetic_data import PRESETS, FakeEmbedder, Scale, SyntheticDataset
+from app.modules.pricing_kb_ai.services.schema_registry import SchemaRegistry
+
+SCALE = Scale(2, 2, 2, 2, cards=200, tenders=20, embedding_share=0.0)
+
+
+def test_same_seed_gives_same_rows():
+    first = SyntheticDataset(SCALE, seed=7)
+    second = SyntheticDataset(SCALE, seed=7)
+    other = SyntheticDataset(SCALE, seed=8)
+
+    assert list(first.card_rows()) == list(second.card_rows())
+    assert list(first.position_rows()) == list(second.position_rows())
+    assert list(first.card_rows())[0] != list(other.card_rows())[0]
+
+
+def test_tree_shape_and_id_offsets():
+    dataset = SyntheticDataset(SCALE, offsets={"nomenclature_nodes": 100})
+
+    assert len(dataset.nodes) == 2 + 4 + 8 + 16
+    assert len(dataset.categories) == 16
+    assert dataset.nodes[0].id == 101
+    ids = {node.id for node in dataset.nodes}
+    assert all(node.parent_id in ids for node in dataset.nodes if node.depth)
+
+
+def test_card_attributes_satisfy_the_merged_class_schema():
+    dataset = SyntheticDataset(SCALE)
+    presets = {row["id"]: row for row in dataset.preset_rows()}
+    links = list(dataset.schema_preset_rows())
+    merged = {}
+    for schema in dataset.schema_rows():
+        payload = schema["json_schema"]
+        for link in links:
+            if link["class_schema_id"] == schema["id"]:
+                preset = presets[link["preset_id"]]["json_schema"]
+                payload = SchemaRegistry._deep_merge(payload, preset)
+        merged[schema["node_id"]] = payload
+    parents = {node.id: node.parent_id for node in dataset.nodes}
+
+    for card in islice(dataset.card_rows(), 50):
+        schema = merged[parents[card["node_id"]]]
+        Draft202012Validator(schema).validate(card["attributes_payload"])
+    assert len(presets) == len(PRESETS)
+
+
+def test_fake_embeddings_are_normalized_and_similar_for_similar_names():
+    embedder = FakeEmbedder(dimensions=256)
+
+    def cosine(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    valve = embedder.embed("Задвижка клиновая DN50")
+    same_kind = embedder.embed("Задвижка клиновая DN80")
+    unrelated = embedder.embed("Кабель силовой")
+
+    assert abs(cosine(valve, valve) - 1.0) < 1e-3
+    assert cosine(valve, same_kind) > cosine(valve, unrelated)
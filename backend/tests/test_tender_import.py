@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+import app.db.base  # noqa: F401
+from app.modules.tender_management.enums import TenderSource
+from app.modules.tender_management.schemas.tender import (
+    TenderCreate,
+    TenderImportRequest,
+    TenderUpdate,
+)
+from app.modules.tender_management.services.tender_service import TenderService
+
+
+class _UpsertSession:
+    """Records statements and reports the first row of each batch as new."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        rows = statement.compile(dialect=postgresql.dialect()).params
+        count = sum(1 for key in rows if key.startswith("number_m"))
+
+        class _Result:
+            def all(self):
+                return [(index, index == 0) for index in range(count)]
+
+        return _Result()
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _tender(number: str, title: str = "Поставка насосов") -> TenderCreate:
+    return TenderCreate(
+        number=number,
+        title=title,
+        customer="АО Заказчик",
+        deadline_at=datetime(2026, 11, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_import_upserts_in_batches_and_dedupes_numbers(monkeypatch):
+    async def initial_stage(db):
+        return 1
+
+    monkeypatch.setattr(TenderService, "_initial_stage_id", initial_stage)
+    monkeypatch.setattr(TenderService, "IMPORT_BATCH_SIZE", 2)
+    db = _UpsertSession()
+    tenders = [_tender("1"), _tender("2"), _tender("3"), _tender("1", "Новое")]
+
+    result = asyncio.run(TenderService.import_many(db, TenderSource.EIS, tenders))
+
+    assert len(db.statements) == 2
+    assert db.commits == 1
+    assert (result.created, result.updated, result.unchanged) == (2, 1, 0)
+
+    compiled = db.statements[0].compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ON CONFLICT (number) DO UPDATE" in sql
+    assert "IS DISTINCT FROM" in sql
+    assert "stage_id" not in sql.split("DO UPDATE")[1]
+    assert compiled.params["title_m0"] == "Новое"
+    assert compiled.params["source_m0"] == TenderSource.EIS
+
+
+def test_import_rejects_manual_source():
+    with pytest.raises(ValidationError):
+        TenderImportRequest(source=TenderSource.MANUAL, tenders=[_tender("1")])
+
+
+class _DbError(Exception):
+    def __init__(self, sqlstate, constraint_name=None):
+        super().__init__(f"violates constraint {constraint_name}")
+        self.sqlstate = sqlstate
+        if constraint_name:
+            self.__cause__ = type("Cause", (Exception,), {})()
+            self.__cause__.constraint_name = constraint_name
+
+
+class _FailingUpdateSession:
+    def __init__(self, error):
+        self.error = error
+        self.rolled_back = False
+
+    async def scalar(self, statement):
+        raise IntegrityError(str(statement), {}, self.error)
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def test_update_maps_only_number_unique_violation_to_duplicate():
+    def update(error, **changes):
+        db = _FailingUpdateSession(error)
+        asyncio.run(TenderService.update(db, 5, TenderUpdate(**changes)))
+
+    with pytest.raises(ValueError, match="номером"):
+        update(_DbError("23505", "ix_tenders_number"), number="A-1")
+
+    # NOT NULL violation in the same payload is not a duplicate number
+    with pytest.raises(IntegrityError):
+        update(_DbError("23502"), number="A-1", title=None)
+    with pytest.raises(IntegrityError):
+        update(_DbError("23505", "uq_other"), number="A-1")
@@ -0,0 +1,35 @@
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+import app.db.base  # noqa: F401
+from app.modules.tender_management.services.tender_service import TenderService
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+        class _Result:
+            def scalars(self):
+                return self
+
+            def all(self):
+                return []
+
+        return _Result()
+
+
+def test_search_treats_like_wildcards_in_input_literally():
+    db = _RecordingSession()
+
+    asyncio.run(TenderService.search(db, customer="100%", search="A_1\\"))
+
+    compiled = db.statements[0].compile(dialect=postgresql.dialect())
+    assert str(compiled).count("ESCAPE '/'") == 4
+    values = set(compiled.params.values())
+    assert "100/%" in values
+    assert "A/_1\\" in values
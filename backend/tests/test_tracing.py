@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core import tracing
+from app.core.tracing import InMemorySpanExporter, JsonFileSpanExporter, span, traced
+
+
+class _Service:
+    @staticmethod
+    @traced()
+    async def load(value):
+        await asyncio.sleep(0)
+        with span("_Service.load.query", rows=value):
+            return value
+
+    @staticmethod
+    @traced()
+    def serialize(value):
+        return str(value)
+
+    @staticmethod
+    @traced()
+    async def chunks():
+        for chunk in (b"a", b"b"):
+            yield chunk
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracing.tracer, "exporter", exporter)
+    monkeypatch.setattr(tracing.tracer, "sample_rate", 1.0)
+    return exporter
+
+
+def test_spans_nest_under_the_root_of_their_trace(exporter):
+    async def handle():
+        with span("GET /cards"):
+            value = await _Service.load(3)
+            _Service.serialize(value)
+            return [chunk async for chunk in _Service.chunks()]
+
+    assert asyncio.run(handle()) == [b"a", b"b"]
+
+    (trace,) = exporter.traces()
+    by_name = {item["name"]: item for item in trace}
+    root = by_name["GET /cards"]
+    assert trace[-1] is root and root["parent_id"] is None
+    assert by_name["_Service.load"]["parent_id"] == root["span_id"]
+    assert by_name["_Service.load.query"]["parent_id"] == (
+        by_name["_Service.load"]["span_id"]
+    )
+    assert by_name["_Service.load.query"]["attributes"] == {"rows": 3}
+    assert by_name["_Service.chunks"]["parent_id"] == root["span_id"]
+    assert {item["trace_id"] for item in trace} == {root["trace_id"]}
+
+
+def test_errors_are_recorded_and_reraised(exporter):
+    @traced("failing")
+    async def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(failing())
+
+    (trace,) = exporter.traces()
+    assert trace[0]["name"] == "failing"
+    assert trace[0]["error"] == "ValueError"
+
+
+def test_nothing_is_recorded_when_sampling_is_off(exporter, monkeypatch):
+    monkeypatch.setattr(tracing.tracer, "sample_rate", 0.0)
+
+    asyncio.run(_Service.load(1))
+
+    assert exporter.traces() == []
+
+
+def test_unsampled_root_suppresses_nested_traces(exporter, monkeypatch):
+    monkeypatch.setattr(tracing.tracer, "sample_rate", 0.5)
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.9)
+
+    async def handle():
+        with span("GET /cards"):
+            monkeypatch.setattr(tracing.random, "random", lambda: 0.0)
+            await _Service.load(1)
+
+    asyncio.run(handle())
+
+    assert exporter.traces() == []
+
+
+def test_json_file_exporter_writes_one_line_per_trace(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    file_exporter = JsonFileSpanExporter(str(path))
+    monkeypatch.setattr(tracing.tracer, "exporter", file_exporter)
+    monkeypatch.setattr(tracing.tracer, "sample_rate", 1.0)
+
+    asyncio.run(_Service.load(1))
+    asyncio.run(_Service.load(2))
+    file_exporter.shutdown()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert [item["name"] for item in json.loads(lines[0])] == [
+        "_Service.load.query",
+        "_Service.load",
+    ]
+
+
+def test_closing_a_traced_generator_closes_the_wrapped_one(exporter):
+    closed = []
+
+    @traced("stream")
+    async def stream():
+        try:
+            for chunk in (b"a", b"b", b"c"):
+                yield chunk
+        finally:
+            closed.append(True)
+
+    async def handle():
+        with span("GET /download"):
+            chunks = stream()
+            first = await chunks.__anext__()
+            await chunks.aclose()
+            return first
+
+    assert asyncio.run(handle()) == b"a"
+    assert closed == [True]
+    (trace,) = exporter.traces()
+    assert [item["name"] for item in trace] == ["stream", "GET /download"]
+
+
+def test_file_exporter_drops_traces_beyond_its_backlog(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    file_exporter = JsonFileSpanExporter(str(path), max_pending=1)
+    # Hold the writer back so the second trace finds the queue full
+    monkeypatch.setattr(file_exporter, "_start", lambda: None)
+    monkeypatch.setattr(tracing.tracer, "exporter", file_exporter)
+    monkeypatch.setattr(tracing.tracer, "sample_rate", 1.0)
+
+    asyncio.run(_Service.load(1))
+    asyncio.run(_Service.load(2))
+
+    assert file_exporter.dropped == 1
+    assert not path.exists()
@@ -16,7 +16,7 @@
 
 export interface AuditLogResponse {
     'id': number;
-    'user_id'?: number | null;
+    'user_id'?: string | null;
     'action': string;
     'details': { [key: string]: any; };
     'created_at': string;
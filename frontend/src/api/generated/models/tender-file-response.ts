@@ -18,7 +18,7 @@ export interface TenderFileResponse {
     'id': number;
     'filename': string;
     'category': string;
-    'uploaded_by_id': number;
+    'uploaded_by_id'?: string | null;
     'uploaded_at': string;
     'is_archived': boolean;
     'archived_at'?: string | null;
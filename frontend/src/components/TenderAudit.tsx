@@ -59,7 +59,7 @@ export function TenderAudit({ auditLogs }: TenderAuditProps) {
                             <div className="flex items-start space-x-3">
                                 <div className="shrink-0">
                                     <div className="h-8 w-8 rounded-full bg-blue-100 flex items-center justify-center text-blue-600 text-xs font-bold">
-                                        ID{log.user_id || '?'}
+                                        {log.user_id ? log.user_id.slice(0, 2).toUpperCase() : '?'}
                                     </div>
                                 </div>
                                 <div className="min-w-0 flex-1">
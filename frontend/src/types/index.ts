@@ -176,14 +176,14 @@ export type TenderFile = {
   id: number;
   filename: string;
   category: string;
-  uploaded_by_id: number;
+  uploaded_by_id: string | null;
   uploaded_at: string;
 };
 
 export type AuditLog = {
   id: number;
   tender_id: number;
-  user_id: number;
+  user_id: string | null;
   action: string;
   details: Record<string, unknown>;
   created_at: string;